@@ -0,0 +1,157 @@
+"""On-disk, memory-mapped store for parsed frames and derived artifacts.
+
+Artifacts are Arrow IPC (Feather v2, uncompressed) files under
+``TITANIC_ARTIFACT_DIR``, grouped by dataset version: the source checksum
+for the parsed dataset, ``<checksum>:cleaned-v<pipeline version>...`` for
+the cleaned one. Above that sits :func:`code_version`, a digest of the
+modules that produce the artifacts (``CODE_FILES``), so changing how
+frames, sketches, codes or matrices are built never serves artifacts
+written by the old code. They are read with memory mapping, so a restarted or
+newly started worker loads them in milliseconds and all workers on a host
+share the same page-cache pages; numeric columns without missing values and
+Arrow strings are used in place without copying.
+
+Besides frames the store holds flat numeric arrays (``save_array``) and
+small Python objects such as column sketches (``save_object``, pickled;
+the directory is a local cache and must not be shared with untrusted
+writers). Writes are atomic (temporary file + rename), and a failed write
+only means the artifact is recomputed next time. Without pyarrow, or with
+``TITANIC_ARTIFACTS=0``, every load misses and saves are skipped.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = feather = None
+
+ARTIFACT_DIR = Path(os.environ.get("TITANIC_ARTIFACT_DIR", Path(__file__).resolve().parent / ".cache" / "artifacts"))
+
+ENABLED = pa is not None and os.environ.get("TITANIC_ARTIFACTS", "1") != "0"
+
+# Source files whose changes invalidate stored artifacts: this module's layout,
+# parsing and compaction, sketches, cleaning, cube codes and the feature matrix,
+# and charts.is_categorical / encode_column, which decide how columns are encoded
+CODE_FILES = [
+    "artifact_store.py", "titanic_loader.py", "titanic_schema.py", "column_sketch.py", "titanic_cleaning.py",
+    "count_cube.py", "feature_matrix.py", "charts.py",
+]
+
+_code_version = None
+
+
+def code_version():
+    """Digest of ``CODE_FILES`` and of the pandas and pyarrow versions (pickled sketches, Arrow layout)."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for name in CODE_FILES:
+            digest.update((Path(__file__).resolve().parent / name).read_bytes())
+        digest.update(json.dumps([pd.__version__, pa.__version__ if pa is not None else None]).encode())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def _prune(current):
+    # Artifacts written by other code versions are never read again
+    try:
+        siblings = [path for path in ARTIFACT_DIR.iterdir() if path.is_dir() and path != current]
+    except OSError:
+        return
+    for path in siblings:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _path(version, name, suffix=".arrow"):
+    folder = version.replace(":", "_").replace("/", "_")
+    return ARTIFACT_DIR / code_version() / folder / f"{name}{suffix}"
+
+
+def _write(path, write):
+    # Write to a temporary file next to the target, then rename it into place
+    try:
+        current = ARTIFACT_DIR / code_version()
+        if not current.exists():
+            current.mkdir(parents=True)
+            _prune(current)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+    except OSError:
+        # The artifact is a cache: on a read-only or full disk it is simply recomputed
+        pass
+
+
+def _string_type(arrow_type):
+    # Keep Arrow-backed strings as pandas' pyarrow string dtype (see titanic_schema.STRING_DTYPE)
+    if arrow_type in (pa.string(), pa.large_string()):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def save_frame(version, name, df):
+    if not ENABLED:
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    _write(_path(version, name), lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+
+
+def load_frame(version, name):
+    """The stored frame, memory-mapped, or None when it is not stored."""
+    path = _path(version, name)
+    if not ENABLED or not path.exists():
+        return None
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True, types_mapper=_string_type)
+
+
+def save_array(version, name, array, **metadata):
+    """Store a numeric ndarray (flattened, with its shape) plus JSON ``metadata``."""
+    if not ENABLED:
+        return
+    array = np.ascontiguousarray(array)
+    info = {"shape": list(array.shape), **metadata}
+    table = pa.table({"values": pa.array(array.reshape(-1), from_pandas=False)})
+    table = table.replace_schema_metadata({"titanic": json.dumps(info)})
+    _write(_path(version, name), lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+
+
+def load_array(version, name):
+    """``(array, metadata)`` with a read-only array backed by the mapped file, or None."""
+    path = _path(version, name)
+    if not ENABLED or not path.exists():
+        return None
+    table = feather.read_table(path, memory_map=True)
+    info = json.loads(table.schema.metadata[b"titanic"])
+    values = table.column("values").combine_chunks().to_numpy(zero_copy_only=True)
+    return values.reshape(info.pop("shape")), info
+
+
+def save_object(version, name, value):
+    if not ENABLED:
+        return
+    _write(_path(version, name, ".pickle"), lambda tmp: Path(tmp).write_bytes(pickle.dumps(value)))
+
+
+def load_object(version, name):
+    path = _path(version, name, ".pickle")
+    if not ENABLED or not path.exists():
+        return None
+    return pickle.loads(path.read_bytes())
@@ -0,0 +1,221 @@
+"""Headless rerun benchmark for the Streamlit app.
+
+Drives ``titanic_streamlit_app.py`` with Streamlit's ``AppTest`` through
+every chart type of the raw and cleaned sections, on synthetic
+Titanic-schema datasets of several sizes (see ``synthetic_data.py``), without
+network access. For each interaction it records wall time, CPU time and
+the bytes the app emitted (element protos plus images), and writes the
+results as JSON so runs can be compared between commits::
+
+    python benchmark_app.py --sizes 1000 100000 --output bench.json
+    python benchmark_app.py --sizes 1000 100000 --baseline bench.json
+
+Peak allocated memory is measured in a second pass in a fresh process with
+``tracemalloc`` on (``--no-memory`` skips it): tracing every allocation
+makes the app several times slower, so it never runs during the timed pass.
+The first run and every chart type change measure the app's default column
+selections, as a new visitor sees them; the selections in
+``CHART_SELECTIONS`` are then applied as separate interactions.
+
+``AppTest`` always reruns the whole script; it does not run the
+fragment-scoped reruns a browser triggers when a widget inside a section
+changes, so its wall times are an upper bound for those interactions.
+``loadtest.py`` sends real fragment reruns over the websocket.
+
+``--backend vega`` runs the app with the browser-side chart backend (see
+``chart_backend``); comparing it against a Matplotlib run as baseline shows
+the payload and server time of both backends per chart type.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from synthetic_data import synthetic_csv
+
+APP_PATH = Path(__file__).resolve().parent / "titanic_streamlit_app.py"
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+
+# Seconds a single rerun may take before AppTest gives up
+RUN_TIMEOUT = 1800
+
+# Sections of the app; their widget keys are the section name, "_" and the widget name
+SECTIONS = ["raw", "cleaned"]
+
+# Column selections applied after each chart type change (widget name -> value)
+CHART_SELECTIONS = {
+    "Pie Chart": {"category": "Embarked"},
+    "Bar Chart": {"bar_x": "Pclass", "bar_hue": "Sex"},
+    "Histogram": {"category": "Age"},
+    "Scatter Plot (Simple)": {"simple_x": "Age", "simple_y": "Fare"},
+    "Scatter Plot (Complex)": {"complex_x": "Age", "complex_y": "Fare", "complex_hue": "Pclass"},
+}
+
+# Image bytes by media file id, filled by the patched media storage
+_media_sizes = {}
+
+
+def _track_media():
+    # Record the size of every image the app hands to Streamlit's media storage
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    original = MemoryMediaFileStorage.load_and_get_id
+
+    def load_and_get_id(self, path_or_data, mimetype, kind, filename=None):
+        file_id = original(self, path_or_data, mimetype, kind, filename)
+        if isinstance(path_or_data, bytes):
+            _media_sizes[file_id] = len(path_or_data)
+        return file_id
+
+    MemoryMediaFileStorage.load_and_get_id = load_and_get_id
+
+
+def _elements(node):
+    children = getattr(node, "children", None)
+    if children is None:
+        yield node
+        return
+    for child in children.values():
+        yield from _elements(child)
+
+
+def payload_bytes(at):
+    """Bytes of all element protos in the last run, plus the images they reference."""
+    total = 0
+    for element in _elements(at._tree):
+        total += element.proto.ByteSize()
+        if type(element).__name__ == "Image":
+            for image in element.proto.imgs:
+                total += _media_sizes.get(Path(image.url).stem, 0)
+    return total
+
+
+def widget_key(section, name):
+    """Key of widget ``name`` (e.g. ``bar_x``) in ``section`` (``raw`` or ``cleaned``)."""
+    return f"{section}_{name}"
+
+
+def _measure(at, action):
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    action()
+    at.run(timeout=RUN_TIMEOUT)
+    wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    record = {"wall_s": round(wall, 4), "cpu_s": round(cpu, 4), "payload_bytes": payload_bytes(at)}
+    if tracemalloc.is_tracing():
+        record["peak_alloc_bytes"] = tracemalloc.get_traced_memory()[1] - before
+    return record
+
+
+def benchmark_size(rows):
+    """Run every interaction on a dataset of ``rows`` rows and return the records."""
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["TITANIC_DATA_SOURCE"] = str(synthetic_csv(rows))
+    at = AppTest.from_file(str(APP_PATH), default_timeout=RUN_TIMEOUT)
+    records = [{"rows": rows, "section": "app", "chart": None, "interaction": "initial load", **_measure(at, lambda: None)}]
+
+    for section in SECTIONS:
+        chart_key = widget_key(section, "chart_type")
+        for chart in at.selectbox(key=chart_key).options:
+            record = _measure(at, lambda: at.selectbox(key=chart_key).set_value(chart))
+            records.append({"rows": rows, "section": section, "chart": chart, "interaction": "chart type", **record})
+
+            present = {box.key for box in at.selectbox}
+            selection = {widget_key(section, key): value for key, value in CHART_SELECTIONS.get(chart, {}).items()}
+            selection = {key: value for key, value in selection.items() if key in present}
+            if selection:
+                def select():
+                    for key, value in selection.items():
+                        at.selectbox(key=key).set_value(value)
+                record = _measure(at, select)
+                records.append({"rows": rows, "section": section, "chart": chart, "interaction": "columns", **record})
+    return records
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=APP_PATH.parent, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(record):
+    return record["rows"], record["section"], record["chart"], record["interaction"]
+
+
+def memory_pass(sizes, backend):
+    """Peak traced allocation per interaction, keyed like the records, from a fresh process."""
+    with tempfile.TemporaryDirectory() as folder:
+        output = Path(folder) / "memory.json"
+        command = [sys.executable, __file__, "--trace-memory", "--no-memory", "--backend", backend,
+                   "--output", str(output), "--sizes", *map(str, sizes)]
+        subprocess.run(command, check=True)
+        records = json.loads(output.read_text())["results"]
+    return {_key(record): record["peak_alloc_bytes"] for record in records}
+
+
+def compare(results, baseline):
+    """Print the wall time and payload of ``results`` relative to ``baseline``."""
+    previous = {_key(record): record for record in baseline["results"]}
+    print(f"{'rows':>10}  {'section':<8} {'chart':<34} {'interaction':<13} {'wall':>9} {'Δ wall':>8} {'payload':>10} {'Δ payload':>10}")
+    for record in results["results"]:
+        old = previous.get(_key(record))
+        wall_ratio = f"{record['wall_s'] / old['wall_s']:.2f}x" if old and old["wall_s"] else "-"
+        payload_ratio = f"{record['payload_bytes'] / old['payload_bytes']:.2f}x" if old and old["payload_bytes"] else "-"
+        print(f"{record['rows']:>10}  {record['section']:<8} {str(record['chart']):<34} {record['interaction']:<13} "
+              f"{record['wall_s']:>8.3f}s {wall_ratio:>8} {record['payload_bytes']:>10,} {payload_ratio:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-chart rerun latency of the Streamlit app.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="dataset sizes in rows")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--backend", choices=["matplotlib", "vega"], default="matplotlib", help="chart rendering backend")
+    parser.add_argument("--no-memory", action="store_true", help="skip the separate peak-memory pass")
+    parser.add_argument("--trace-memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # Read by chart_backend when the app first imports it
+    os.environ["TITANIC_CHART_BACKEND"] = args.backend
+
+    _track_media()
+    if args.trace_memory:
+        tracemalloc.start()
+    results = {
+        "commit": _git_commit(),
+        "backend": args.backend,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [],
+    }
+    for rows in args.sizes:
+        results["results"].extend(benchmark_size(rows))
+    if not args.no_memory:
+        peaks = memory_pass(args.sizes, args.backend)
+        for record in results["results"]:
+            record["peak_alloc_bytes"] = peaks.get(_key(record))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    elif not args.baseline:
+        print(json.dumps(results, indent=2))
+    if args.baseline:
+        compare(results, json.loads(Path(args.baseline).read_text()))
+
+
+if __name__ == "__main__":
+    main()
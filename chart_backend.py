@@ -0,0 +1,45 @@
+"""Chart rendering backend, selected per deployment.
+
+``TITANIC_CHART_BACKEND`` picks how charts reach the browser:
+
+- ``matplotlib`` (default): drawn on the server and sent as a PNG
+  (``chart_render.render_chart``);
+- ``vega``: only pre-aggregated data is sent, with a Vega-Lite spec that the
+  browser draws (``vega_charts`` via ``chart_render.render_spec``).
+
+``TITANIC_VEGA_CHARTS`` (comma-separated chart types) limits the ``vega``
+backend to some chart types, so each type can use whichever backend is
+cheaper; the others stay on Matplotlib. Both backends record the server
+render time and payload size of every chart they produce.
+"""
+
+import os
+
+import streamlit as st
+
+from chart_render import render_chart, render_spec
+
+BACKENDS = ["matplotlib", "vega"]
+
+BACKEND = os.environ.get("TITANIC_CHART_BACKEND", "matplotlib")
+
+# Chart types drawn by the vega backend (all when empty)
+VEGA_CHARTS = {name.strip() for name in os.environ.get("TITANIC_VEGA_CHARTS", "").split(",") if name.strip()}
+
+
+def backend_for(chart_type):
+    if BACKEND == "vega" and (not VEGA_CHARTS or chart_type in VEGA_CHARTS):
+        return "vega"
+    return "matplotlib"
+
+
+def show_chart(data_version, chart_type, columns, draw, figsize, spec):
+    """Show a chart with the deployment's backend.
+
+    ``draw(ax)`` draws it with Matplotlib, ``spec()`` returns the
+    equivalent Vega-Lite spec; only the one for the active backend is called.
+    """
+    if backend_for(chart_type) == "vega":
+        st.vega_lite_chart(render_spec(data_version, chart_type, columns, spec), width="stretch")
+    else:
+        st.image(render_chart(data_version, chart_type, columns, draw, figsize), width="stretch")
@@ -0,0 +1,66 @@
+"""Insight sentences shown under each chart, shared by the app and ``report.py``.
+
+:func:`chart_insights` builds the markdown sentences of one chart from the
+table or statistic it was drawn from, so the app's raw and cleaned sections
+and the static report always say the same thing about the same data.
+"""
+
+from survival import findings, group_label
+
+
+def chart_insights(chart, columns, result):
+    """Markdown insight sentences for ``chart`` drawn over ``columns``.
+
+    ``result`` is what the chart was drawn from: the value counts (Pie Chart),
+    the crosstab (Bar Chart and the categorical heatmaps), the column's
+    :func:`column_profile.column_profile` entry (Histogram), the correlation
+    of the two columns or None when it cannot be computed (Scatter Plot
+    (Simple)), the correlation matrix (Heatmap (Numerical Correlation)) or
+    the :func:`survival.survival_rates` table (Survival Rates).
+    """
+    if chart == "Pie Chart":
+        category, = columns
+        top_value, top_count = (result.index[0], result.iloc[0]) if len(result) else (None, 0)
+        return [f"The most common category in **{category}** is **{top_value}** with **{top_count} passengers**."]
+
+    if chart == "Bar Chart":
+        bar_x, bar_hue = columns
+        sizes = result.stack()
+        return [f"The largest group is **{group_label(sizes.idxmax(), columns)}** with **{sizes.max()} passengers**.",
+                f"This chart highlights how **{bar_hue}** varies across **{bar_x}**."]
+
+    if chart == "Histogram":
+        category, = columns
+        if result["dtype_class"] == "categorical":
+            return [f"The most frequent category in **{category}** is **{result['mode']}**."]
+        return [f"The average value of **{category}** is **{result['mean']:.2f}**."]
+
+    if chart == "Scatter Plot (Simple)":
+        x_col, y_col = columns
+        if result is None:
+            return ["Not enough data to compute correlation."]
+        return [f"The correlation between **{x_col}** and **{y_col}** is **{result:.2f}**."]
+
+    if chart == "Scatter Plot (Complex)":
+        x_col, y_col, hue_col = columns
+        return [f"This chart shows how **{y_col}** varies with **{x_col}** across different **{hue_col}** groups."]
+
+    if chart in ("Heatmap (Categorical)", "Heatmap (Categorical – Counts)"):
+        return [f"The highest count is **{result.values.max()}**, indicating the strongest category combination."]
+
+    if chart == "Heatmap (Categorical – Percentages)":
+        return [f"The highest percentage in this table is **{result.values.max():.1f}%**, showing the strongest proportional relationship."]
+
+    if chart == "Heatmap (Numerical Correlation)":
+        if "Survived" not in result.columns:
+            return ["Survived is not numeric in this view, so correlation with survival is not shown."]
+        survived = result["Survived"].sort_values(ascending=False)
+        if len(survived) < 2:
+            return []
+        return [f"The strongest positive correlation with survival is **{survived.index[1]} ({survived.iloc[1]:.2f})**.",
+                f"The strongest negative correlation with survival is **{survived.index[-1]} ({survived.iloc[-1]:.2f})**."]
+
+    if chart == "Survival Rates":
+        return findings(result, list(columns))
+
+    raise ValueError(f"Unknown chart: {chart}")
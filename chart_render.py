@@ -0,0 +1,122 @@
+"""Rendered-figure cache for the Streamlit app.
+
+Charts are drawn once, encoded to PNG and kept in a bounded LRU keyed on
+the dataset version, chart type, selected columns and figure size. The
+Matplotlib figure is always closed after encoding, so a long-running server
+does not accumulate open figures, and switching back to a recently viewed
+chart skips Matplotlib entirely. Matplotlib itself is imported on the
+first cache miss, not when the app starts.
+
+The same cache holds the Vega-Lite specs of the browser-side backend
+(``render_spec``), and every cache miss records its render time and payload
+size per backend and chart type (``render_stats``).
+"""
+
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import tracing
+
+# Bounds of the PNG cache (entries and total encoded bytes)
+CACHE_SIZE = 64
+CACHE_BYTES = 64 * 1024 * 1024
+
+# Same savefig options st.pyplot uses by default
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+
+# Cost of cache misses: {(backend, chart type): {"renders", "render_ms", "payload_bytes"}}
+_stats = {}
+
+
+def encode_figure(draw, figsize):
+    # Draw on a fresh figure, encode it and release it even if drawing fails
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=figsize)
+    try:
+        with tracing.span("draw"):
+            draw(ax)
+        with tracing.span("encode png"):
+            buf = io.BytesIO()
+            fig.savefig(buf, **SAVEFIG_OPTIONS)
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def _cached(key, chart_type, backend, produce, size):
+    # Shared LRU lookup; on a miss produce() runs outside the lock and its cost is recorded
+    global _cache_bytes
+    with _lock:
+        value = _cache.get(key)
+        if value is not None:
+            _cache.move_to_end(key)
+            return value
+
+    start = time.perf_counter()
+    value = produce()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with _lock:
+        stats = _stats.setdefault((backend, chart_type), {"renders": 0, "render_ms": 0.0, "payload_bytes": 0})
+        stats["renders"] += 1
+        stats["render_ms"] += elapsed
+        stats["payload_bytes"] += size(value)
+
+        if key not in _cache:
+            _cache[key] = value
+            _cache_bytes += size(value)
+
+        # Evict least recently used charts
+        while len(_cache) > CACHE_SIZE or (_cache_bytes > CACHE_BYTES and len(_cache) > 1):
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= size(evicted)
+    return value
+
+
+def render_chart(data_version, chart_type, columns, draw, figsize):
+    """Return PNG bytes for a chart, drawing it only on a cache miss.
+
+    ``draw`` is called with the Matplotlib axes; ``columns`` must contain
+    every selection that changes the picture.
+    """
+    def produce():
+        with tracing.span("render", chart=chart_type, columns=list(columns)):
+            return encode_figure(draw, figsize)
+
+    return _cached((data_version, chart_type, tuple(columns), tuple(figsize)), chart_type, "matplotlib", produce, len)
+
+
+def render_spec(data_version, chart_type, columns, build):
+    """Return a Vega-Lite spec (see ``vega_charts``) for a chart, building it only on a cache miss.
+
+    The spec is cached as JSON text; its length is the payload sent to the browser.
+    """
+    def produce():
+        with tracing.span("render", chart=chart_type, columns=list(columns), backend="vega"):
+            return json.dumps(build())
+
+    return json.loads(_cached((data_version, chart_type, tuple(columns), "vega"), chart_type, "vega", produce, len))
+
+
+def render_stats():
+    """Renders (cache misses), mean server render time and mean payload per backend and chart type."""
+    with _lock:
+        rows = [{"Backend": backend, "Chart": chart, "Renders": stats["renders"],
+                 "Render ms": stats["render_ms"] / stats["renders"], "Payload bytes": stats["payload_bytes"] // stats["renders"]}
+                for (backend, chart), stats in sorted(_stats.items())]
+    return rows
+
+
+def clear_cache():
+    global _cache_bytes
+    with _lock:
+        _cache.clear()
+        _cache_bytes = 0
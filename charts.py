@@ -0,0 +1,151 @@
+"""Chart drawing functions shared by the Streamlit app.
+
+Each ``draw_*`` function draws onto a Matplotlib ``ax`` and does not touch
+Streamlit, so charts can be rendered and cached by ``chart_render``.
+Seaborn and Matplotlib are imported inside the functions that draw, so
+importing this module (e.g. for ``is_categorical``) stays cheap and the
+plotting stack is only loaded when the first chart is drawn.
+"""
+
+import numpy as np
+
+# Heatmaps with more cells than this are drawn without value annotations
+ANNOTATION_CELLS = 400
+
+
+def is_categorical(series):
+    # Strings (object or pandas str dtype) and category columns are treated as categories
+    return series.dtype == "object" or str(series.dtype) in ("category", "str", "string")
+
+
+def categorical_columns(df):
+    return [col for col in df.columns if is_categorical(df[col])]
+
+
+def encode_column(series):
+    # Integer category codes for categorical columns, the values otherwise
+    if is_categorical(series):
+        return series.astype("category").cat.codes
+    return series
+
+
+def draw_pie(ax, counts, category):
+    counts.plot(
+        kind="pie",
+        autopct="%1.1f%%",
+        ax=ax,
+        startangle=90,
+        textprops={"fontsize": 8}
+    )
+    ax.set_ylabel("")
+    ax.set_title(f"{category} Distribution", fontsize=12)
+
+
+def draw_bar(ax, table, bar_x, bar_hue):
+    # Grouped bars from a crosstab (rows = bar_x, columns = bar_hue)
+    long = table.stack().rename("count")
+    # Level names may be equal when the same column is on both axes
+    long.index.names = ["x", "hue"]
+    # Empty combinations are skipped, as countplot does
+    long = long[long > 0].reset_index()
+    import seaborn as sns
+    sns.barplot(data=long, x="x", y="count", hue="hue", ax=ax)
+    ax.set_xlabel(bar_x)
+    ax.legend(title=bar_hue)
+    ax.set_title(f"{bar_x} by {bar_hue}")
+
+
+def draw_histogram(ax, df, category, counts=None):
+    # Checks if the column is categorical or numerical
+    if is_categorical(df[category]):
+        # Categorical histogram from precomputed value counts
+        counts.plot(kind="bar", ax=ax, color="purple")
+        ax.set_title(f"{category} Frequency")
+    else:
+        # Numerical histogram
+        ax.hist(df[category].dropna(), bins=20, color="skyblue", edgecolor="black")
+        ax.set_title(f"Histogram of {category}")
+    ax.set_xlabel(category)
+    ax.set_ylabel("Count")
+
+
+def draw_simple_scatter(ax, x, y, x_col, y_col):
+    # x and y are encoded columns (see feature_matrix.py)
+    ax.scatter(x, y, alpha=0.6)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+    ax.set_title(f"{x_col} vs {y_col}")
+
+
+def draw_complex_scatter(ax, df, x_col, y_col, hue_col):
+    import seaborn as sns
+    sns.scatterplot(data=df, x=x_col, y=y_col, hue=hue_col, ax=ax)
+    ax.set_title(f"{x_col} vs {y_col} colored by {hue_col}")
+
+
+def draw_density(ax, density, x_col, y_col, hue_col=None):
+    # Draw a binned scatter (see density.py) as an image
+    import seaborn as sns
+    from matplotlib.patches import Patch
+
+    counts = density["counts"]
+    extent = [density["xedges"][0], density["xedges"][-1], density["yedges"][0], density["yedges"][-1]]
+    total = counts.sum(axis=0)
+    intensity = np.log1p(total) / max(np.log1p(total.max()), 1e-12)
+
+    if density["labels"] is None:
+        image = ax.imshow(np.ma.masked_equal(total, 0).T, origin="lower", extent=extent, aspect="auto", cmap="viridis", norm="log")
+        ax.figure.colorbar(image, ax=ax, label="Passengers")
+        ax.set_title(f"{x_col} vs {y_col} (density of {density['rows']:,} rows)")
+    else:
+        # Colour each cell by its dominant hue group, shaded by density
+        palette = np.array(sns.color_palette(n_colors=len(density["labels"])))
+        rgba = np.zeros(total.shape + (4,))
+        rgba[..., :3] = palette[counts.argmax(axis=0)]
+        rgba[..., 3] = intensity
+        ax.imshow(rgba.transpose(1, 0, 2), origin="lower", extent=extent, aspect="auto")
+        handles = [Patch(color=palette[i], label=label) for i, label in enumerate(density["labels"])]
+        ax.legend(handles=handles, title=hue_col, fontsize=7)
+        ax.set_title(f"{x_col} vs {y_col} colored by {hue_col} (density)")
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+
+
+def draw_count_heatmap(ax, table, title, cmap="Blues", fmt="d"):
+    import seaborn as sns
+    sns.heatmap(table, annot=table.size <= ANNOTATION_CELLS, cmap=cmap, fmt=fmt, ax=ax)
+    ax.set_title(title)
+
+
+def draw_correlation_heatmap(ax, corr):
+    import seaborn as sns
+    sns.heatmap(corr, annot=corr.size <= ANNOTATION_CELLS, cmap="coolwarm", linewidths=0.5, ax=ax)
+    ax.set_title("Numerical Correlation Heatmap")
+
+
+def draw_survival_rates(ax, rates, by):
+    # Bars from survival.survival_rates: x = first column, one bar per combination of the others
+    import seaborn as sns
+
+    lower = rates["Rate"] - rates["Lower"]
+    upper = rates["Upper"] - rates["Rate"]
+    if len(by) == 1:
+        positions = np.arange(len(rates))
+        ax.bar(positions, rates["Rate"], yerr=[lower, upper], capsize=3, color=sns.color_palette()[0])
+        ax.set_xticks(positions, [str(g) for g in rates.index])
+    else:
+        groups = rates.index.get_level_values(0)
+        hues = [", ".join(str(v) for v in key[1:]) for key in rates.index]
+        x_levels, hue_levels = list(dict.fromkeys(groups)), list(dict.fromkeys(hues))
+        width = 0.8 / len(hue_levels)
+        palette = sns.color_palette(n_colors=len(hue_levels))
+        x_pos = {g: i for i, g in enumerate(x_levels)}
+        for j, hue in enumerate(hue_levels):
+            mask = np.array([h == hue for h in hues])
+            positions = np.array([x_pos[g] for g in groups[mask]]) - 0.4 + width * (j + 0.5)
+            ax.bar(positions, rates["Rate"][mask], width, yerr=[lower[mask], upper[mask]], capsize=2, color=palette[j], label=hue)
+        ax.set_xticks(np.arange(len(x_levels)), [str(g) for g in x_levels])
+        ax.legend(title=" × ".join(by[1:]), fontsize=7)
+    ax.set_ylim(0, 1)
+    ax.set_xlabel(by[0])
+    ax.set_ylabel("Survival Rate")
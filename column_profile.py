@@ -0,0 +1,64 @@
+"""Per-column profile shared by the "Insights / Analysis" blocks.
+
+``column_profile`` summarizes every column of a dataset once per dataset
+version: dtype class, non-missing and missing counts, distinct values, mode
+with its count, and the mean of numeric columns. Value counts come from the
+dataset's count cube, so the insight text agrees with the charts and no
+insight recomputes ``value_counts`` or ``mean`` on a rerun. Only the cube's
+low-cardinality columns and categorical columns are counted; numeric
+columns with more distinct values (PassengerId, Fare, ...) get no mode, so
+profiling never factorizes them.
+"""
+
+
+import numpy as np
+
+import dataset_store
+from charts import is_categorical
+from count_cube import count_cube, value_counts
+from titanic_loader import frame_fingerprint
+
+CACHE_SIZE = 4
+
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+
+
+def build_profile(df, cube, sketches=None):
+    """Return ``{column: profile}`` for ``df`` using the value counts of ``cube``.
+
+    With the column ``sketches`` of ``df`` (see ``column_sketch``) the
+    distinct counts and means of high-cardinality numeric columns are read
+    from them instead of scanning the column.
+    """
+    profile = {}
+    for name in df.columns:
+        series = df[name]
+        categorical = is_categorical(series)
+        count = int(series.count())
+        sketch = (sketches or {}).get(name)
+        if sketch is not None and (not sketch.numeric or sketch.count != count):
+            sketch = None
+        entry = profile[name] = {
+            "dtype_class": "categorical" if categorical else "numeric",
+            "count": count,
+            "missing": len(series) - count,
+            "unique": None,
+            "mode": None,
+            "top_count": None,
+            "mean": np.nan if categorical else (sketch.mean if sketch is not None and count else float(series.mean())),
+        }
+        if categorical or name in cube["columns"]:
+            counts = value_counts(cube, name)
+            entry.update({
+                "unique": len(counts),
+                "mode": counts.index[0] if count else None,
+                "top_count": int(counts.iloc[0]) if count else 0,
+            })
+        else:
+            entry["unique"] = sketch.distinct() if sketch is not None else int(series.nunique())
+    return profile
+
+
+def column_profile(df, sketches=None):
+    """Memoized :func:`build_profile` keyed on the content fingerprint of ``df``."""
+    return _cache.memo(frame_fingerprint(df), lambda: build_profile(df, count_cube(df), sketches))
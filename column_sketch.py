@@ -0,0 +1,258 @@
+"""Mergeable single-pass column statistics.
+
+A :class:`ColumnSketch` is updated one chunk at a time and two sketches of
+the same column can be merged, so statistics for a file of any size are
+gathered in one pass with memory bounded by the chunk size:
+
+- row, missing and (estimated) distinct counts,
+- mean and variance (Chan et al. parallel update),
+- approximate quantiles and histograms (a compacting quantile sketch),
+- top-k values for the mode (Misra-Gries).
+
+Small inputs (up to ``QUANTILE_K`` values and ``TOP_K`` distinct values)
+are summarized exactly.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Items kept per level of the quantile sketch
+QUANTILE_K = 4096
+
+# Values tracked by the top-k summary
+TOP_K = 64
+
+# Smallest hashes kept for the distinct-count estimate
+DISTINCT_K = 1024
+
+_HASH_SPACE = float(2 ** 64)
+
+
+class QuantileSketch:
+    """Mergeable approximate quantiles: level ``i`` holds items of weight ``2**i``."""
+
+    def __init__(self, k=QUANTILE_K, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compact()
+
+    def _compact(self):
+        # Halve any full level by keeping every other sorted item, promoted to the next level
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                keep = len(items) - len(items) % 2
+                promoted = items[self._rng.integers(2):keep:2]
+                self.levels[level] = items[keep:]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** i) for i, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        items, weights = self.weighted_items()
+        if len(items) == 0:
+            return np.nan
+        if len(self.levels) == 1:
+            # Nothing compacted yet: exact, with pandas' linear interpolation
+            return float(np.quantile(items, q))
+        cumulative = np.cumsum(weights) - weights / 2
+        return float(np.interp(q * weights.sum(), cumulative, items))
+
+    def histogram(self, bins=20):
+        items, weights = self.weighted_items()
+        return np.histogram(items, bins=bins, weights=weights)
+
+
+class TopK:
+    """Misra-Gries frequent values; counts are exact while fewer than ``k`` values were seen."""
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.counts = {}
+        self.exact = True
+
+    def update(self, values):
+        counts = pd.Series(values).value_counts()
+        if len(counts) > self.k:
+            # Reduce the chunk to its own Misra-Gries summary before merging
+            self.exact = False
+            counts = counts.iloc[:self.k] - counts.iloc[self.k]
+            counts = counts[counts > 0]
+        self._add(counts.items())
+
+    def merge(self, other):
+        self.exact = self.exact and other.exact
+        self._add(other.counts.items())
+
+    def _add(self, items):
+        for value, count in items:
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        if len(self.counts) > self.k:
+            # Subtract the (k+1)-th largest count and drop values that fall to zero
+            self.exact = False
+            cut = sorted(self.counts.values(), reverse=True)[self.k]
+            self.counts = {value: count - cut for value, count in self.counts.items() if count > cut}
+
+    def most_common(self):
+        # Equal counts in value order, so the first value is Series.mode()[0]
+        try:
+            items = sorted(self.counts.items(), key=lambda item: item[0])
+        except TypeError:
+            items = list(self.counts.items())
+        return sorted(items, key=lambda item: item[1], reverse=True)
+
+
+class ColumnSketch:
+    """Counts, moments, quantiles and top values of one column, built chunk by chunk."""
+
+    def __init__(self, name):
+        self.name = name
+        self.dtype = None
+        self.numeric = None
+        self.rows = 0
+        self.missing = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = QuantileSketch()
+        self.top = TopK()
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, series):
+        values = series.dropna()
+        self.rows += len(series)
+        self.missing += len(series) - len(values)
+        if len(values) == 0:
+            # An all-missing chunk parses as float whatever the column holds, so it does not set the type
+            return
+        if self.dtype is None:
+            self.dtype = str(series.dtype)
+            self.numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+        self.top.update(values)
+        hashes = np.unique(pd.util.hash_array(values.to_numpy()))
+        self._hashes = np.union1d(self._hashes, hashes)[:DISTINCT_K]
+
+        if self.numeric:
+            data = values.to_numpy(dtype=np.float64)
+            self._merge_moments(len(data), data.mean(), ((data - data.mean()) ** 2).sum())
+            self.min, self.max = min(self.min, data.min()), max(self.max, data.max())
+            self.quantiles.update(data)
+
+    def _merge_moments(self, n, mean, m2):
+        count = self.count - n
+        total = count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * count * n / total
+
+    def merge(self, other):
+        if self.dtype is None:
+            self.dtype, self.numeric = other.dtype, other.numeric
+        n = other.count
+        self.rows += other.rows
+        self.missing += other.missing
+        if n:
+            self._merge_moments(n, other.mean, other.m2)
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self.quantiles.merge(other.quantiles)
+        self.top.merge(other.top)
+        self._hashes = np.union1d(self._hashes, other._hashes)[:DISTINCT_K]
+
+    @property
+    def count(self):
+        return self.rows - self.missing
+
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def median(self):
+        return self.quantiles.quantile(0.5)
+
+    def mode(self):
+        # Most frequent values first, like Series.mode()[0]
+        return [value for value, _ in self.top.most_common()]
+
+    def distinct(self):
+        """Distinct non-missing values: exact below ``DISTINCT_K``, a KMV estimate above."""
+        if len(self._hashes) < DISTINCT_K:
+            return len(self._hashes)
+        return int(round((DISTINCT_K - 1) / (float(self._hashes[-1]) / _HASH_SPACE)))
+
+    def estimated(self):
+        """Names of the :func:`describe_sketches` statistics that are estimates for this column."""
+        names = []
+        if len(self._hashes) >= DISTINCT_K:
+            names.append("unique")
+        if not self.numeric and not self.top.exact and self.top.counts:
+            names += ["top", "freq"]
+        if self.numeric and len(self.quantiles.levels) > 1:
+            names += ["25%", "50%", "75%"]
+        return names
+
+
+def profile_frame(df, sketches=None):
+    """Update (or create) a ``{column: ColumnSketch}`` mapping with one chunk ``df``."""
+    sketches = {} if sketches is None else sketches
+    for name in df.columns:
+        sketches.setdefault(name, ColumnSketch(name)).update(df[name])
+    return sketches
+
+
+def describe_sketches(sketches):
+    """A ``describe(include="all").T``-style table built from the sketches, plus missing counts.
+
+    The ``estimated`` column lists the statistics of each row that are
+    sketch estimates rather than exact values (for example ``freq``, a
+    Misra-Gries lower bound, once a column has more than ``TOP_K`` values).
+    """
+    rows = {}
+    for name, sketch in sketches.items():
+        top = sketch.top.most_common()
+        row = {"count": sketch.count, "missing": sketch.missing, "unique": sketch.distinct()}
+        if sketch.numeric:
+            row.update({
+                "mean": sketch.mean if sketch.count else np.nan,
+                "std": sketch.std(),
+                "min": sketch.min if sketch.count else np.nan,
+                "25%": sketch.quantiles.quantile(0.25),
+                "50%": sketch.median(),
+                "75%": sketch.quantiles.quantile(0.75),
+                "max": sketch.max if sketch.count else np.nan,
+            })
+        elif top:
+            row.update({"top": top[0][0], "freq": top[0][1]})
+        row["estimated"] = ", ".join(sketch.estimated())
+        rows[name] = row
+    columns = ["count", "missing", "unique", "top", "freq", "mean", "std", "min", "25%", "50%", "75%", "max", "estimated"]
+    return pd.DataFrame.from_dict(rows, orient="index").reindex(columns=columns)
+
+
+def missing_table(sketches):
+    """Missing count and percentage per column, as in the app's missing-value overview."""
+    table = pd.DataFrame({
+        "Missing Count": {name: sketch.missing for name, sketch in sketches.items()},
+        "Missing %": {name: sketch.missing / sketch.rows * 100 if sketch.rows else 0.0 for name, sketch in sketches.items()},
+    })
+    return table
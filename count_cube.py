@@ -0,0 +1,226 @@
+"""Precomputed category counts for the Pie, Bar, Histogram and Heatmap charts.
+
+``count_cube`` factorizes every low-cardinality column of a dataset into
+integer codes once, then builds per-column value counts and all pairwise
+crosstabs with ``np.bincount`` on combined codes. Charts and their insight
+text look the tables up instead of running ``value_counts``, ``groupby`` or
+``pivot_table`` on every rerun. Other columns are counted the first time
+they are requested and memoized in the same cube. Bar charts and heatmaps
+use ``top_crosstab``, which folds all but the most frequent values of each axis
+into "Other", so their size is bounded whatever the cardinality.
+
+For shared dataset versions the codes and labels are persisted in
+:mod:`artifact_store`; a cube rebuilt from them skips the factorization and
+counts its tables on first use. The cube of a filtered view
+(:func:`view_cube`) slices the codes of its parent's cube with the view's
+row positions, so a filter change never factorizes a column again.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import artifact_store
+import dataset_store
+from charts import is_categorical
+from titanic_loader import frame_fingerprint
+
+# Numeric columns with at most this many distinct values are precomputed too
+MAX_LEVELS = 50
+
+# Pairs whose table would exceed this many cells are folded to their top values
+DENSE_CELLS = 1_000_000
+
+# Categories kept per heatmap axis; the less frequent ones are folded into OTHER
+TOP_K = int(os.environ.get("TITANIC_HEATMAP_TOP_K", 20))
+OTHER = "Other"
+
+# Cubes kept per live session: its raw and cleaned versions and their filtered views
+CACHE_SIZE = int(os.environ.get("TITANIC_CUBE_CACHE_SIZE", 4))
+
+_cache = dataset_store.VersionCache(CACHE_SIZE, per_lease=True)
+
+
+def _factorize(series):
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, pd.Index(uniques, name=series.name)
+
+
+def _codes(cube, column):
+    entry = cube["codes"].get(column)
+    if entry is None:
+        parent = cube.get("parent")
+        if parent is None:
+            entry = _factorize(cube["frame"][column])
+        else:
+            with parent["lock"]:
+                codes, labels = _codes(parent, column)
+            entry = codes[cube["rows"]], labels
+        cube["codes"][column] = entry
+    return entry
+
+
+def _count_pair(cube, index, columns):
+    (row_codes, row_labels), (col_codes, col_labels) = _codes(cube, index), _codes(cube, columns)
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    cells = row_codes[valid].astype(np.int64) * len(col_labels) + col_codes[valid]
+    counts = np.bincount(cells, minlength=len(row_labels) * len(col_labels)).reshape(len(row_labels), len(col_labels))
+    table = pd.DataFrame(counts, index=row_labels, columns=col_labels)
+
+    # Drop values that only occur next to a missing value, as pivot_table does
+    return table.loc[table.any(axis=1), table.any(axis=0)]
+
+
+def value_counts(cube, column):
+    """Counts of each value of ``column``, most frequent first (missing values excluded)."""
+    with cube["lock"]:
+        counts = cube["counts"].get(column)
+        if counts is None:
+            codes, labels = _codes(cube, column)
+            counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(labels)), index=labels, name="count")
+            # Values of a view's parent that the view does not contain are left out
+            counts = cube["counts"][column] = counts[counts > 0].sort_values(ascending=False, kind="stable")
+        return counts
+
+
+def crosstab(cube, index, columns):
+    """Count table with the values of ``index`` as rows and ``columns`` as columns.
+
+    Pairs whose table would have more than ``DENSE_CELLS`` cells (e.g.
+    PassengerId × Name) are returned as :func:`top_crosstab` instead, so no
+    table grows with the square of the row count.
+    """
+    with cube["lock"]:
+        if len(_codes(cube, index)[1]) * len(_codes(cube, columns)[1]) > DENSE_CELLS:
+            return top_crosstab(cube, index, columns)
+        table = cube["pairs"].get((index, columns))
+        if table is None:
+            reverse = cube["pairs"].get((columns, index))
+            table = reverse.T if reverse is not None else _count_pair(cube, index, columns)
+            cube["pairs"][(index, columns)] = table
+        return table
+
+
+def _save_codes(version, codes):
+    # One frame of (downcast) codes per cube, one frame of labels per column
+    frame = pd.DataFrame({column: pd.to_numeric(entry[0], downcast="integer") for column, entry in codes.items()})
+    artifact_store.save_frame(version, "cube-codes", frame)
+    for i, (column, (_, labels)) in enumerate(codes.items()):
+        artifact_store.save_frame(version, f"cube-labels-{i}", labels.to_frame(index=False))
+
+
+def _load_codes(version):
+    frame = artifact_store.load_frame(version, "cube-codes")
+    if frame is None:
+        return None
+    codes = {}
+    for i, column in enumerate(frame.columns):
+        labels = artifact_store.load_frame(version, f"cube-labels-{i}")
+        if labels is None:
+            return None
+        codes[column] = (frame[column].to_numpy(), pd.Index(labels[column], name=column))
+    return codes
+
+
+def _top_codes(cube, column, k):
+    # Codes remapped to the k most frequent values (in label order) plus OTHER as code k
+    codes, labels = _codes(cube, column)
+    counts = value_counts(cube, column)
+    top = np.sort(labels.get_indexer(counts.index[:k]))
+    remap = np.full(len(labels) + 1, k, dtype=np.int64)
+    remap[top] = np.arange(len(top))
+    remap[-1] = -1
+    # Missing values (code -1) index the last slot and stay missing
+    top_labels = pd.Index(labels[top].astype(object).tolist() + [OTHER], name=column)
+    return remap[codes], top_labels
+
+
+def top_crosstab(cube, index, columns, k=None):
+    """Like :func:`crosstab`, but each axis keeps its ``k`` most frequent values.
+
+    The other values are summed into an ``OTHER`` row or column, so the
+    table has at most ``(k + 1) ** 2`` cells whatever the cardinality of
+    the columns. Columns with at most ``k`` values are returned unchanged.
+    """
+    k = TOP_K if k is None else k
+    with cube["lock"]:
+        rows, cols = len(_codes(cube, index)[1]), len(_codes(cube, columns)[1])
+        if rows <= k and cols <= k and rows * cols <= DENSE_CELLS:
+            return crosstab(cube, index, columns)
+        key = (index, columns, k)
+        table = cube["top"].get(key)
+        if table is None:
+            (row_codes, row_labels), (col_codes, col_labels) = _top_codes(cube, index, k), _top_codes(cube, columns, k)
+            valid = (row_codes >= 0) & (col_codes >= 0)
+            cells = row_codes[valid] * len(col_labels) + col_codes[valid]
+            counts = np.bincount(cells, minlength=len(row_labels) * len(col_labels)).reshape(len(row_labels), len(col_labels))
+            table = pd.DataFrame(counts, index=row_labels, columns=col_labels)
+            table = cube["top"][key] = table.loc[table.any(axis=1), table.any(axis=0)]
+        return table
+
+
+def build_cube(df, codes=None):
+    """Factorize the low-cardinality columns of ``df`` and count them and all their pairs.
+
+    With ``codes`` (as persisted by :func:`count_cube`) the factorization is
+    skipped and the tables are counted on first use instead.
+    """
+    cube = {"frame": df, "codes": {}, "counts": {}, "pairs": {}, "top": {}, "lock": threading.RLock()}
+    if codes is not None:
+        cube["codes"] = codes
+        cube["columns"] = [column for column, (_, labels) in codes.items() if len(labels) <= MAX_LEVELS]
+        return cube
+
+    columns = []
+    for column in df.columns:
+        series = df[column]
+        if is_categorical(series) or series.nunique() <= MAX_LEVELS:
+            # Codes of high-cardinality strings are kept for later lookups
+            cube["codes"][column] = _factorize(series)
+            if len(cube["codes"][column][1]) <= MAX_LEVELS:
+                columns.append(column)
+
+    cube["columns"] = columns
+    for column in columns:
+        value_counts(cube, column)
+    for i, index in enumerate(columns):
+        for other in columns[i + 1:]:
+            crosstab(cube, index, other)
+    return cube
+
+
+def count_cube(df):
+    """Memoized :func:`build_cube` keyed on the content fingerprint of ``df``.
+
+    Codes of shared dataset versions are persisted in :mod:`artifact_store`.
+    """
+    key = frame_fingerprint(df)
+    return _cache.memo(key, lambda: _build_persisted(df, key))
+
+
+def _build_persisted(df, version):
+    # build_cube, reusing (or persisting) the codes of a shared dataset version
+    persist = dataset_store.persistent(version)
+    codes = _load_codes(version) if persist else None
+    cube = build_cube(df, codes)
+    if persist and codes is None:
+        _save_codes(version, cube["codes"])
+    return cube
+
+
+def view_cube(df, view, rows):
+    """Memoized cube of ``view``, the rows at positions ``rows`` of ``df``.
+
+    Its codes are sliced from the cube of ``df`` (and its tables counted on
+    first use), so building it costs one take per column used instead of
+    a factorization of every column.
+    """
+    return _cache.memo(frame_fingerprint(view), lambda: _slice_cube(df, view, rows))
+
+
+def _slice_cube(df, view, rows):
+    parent = count_cube(df)
+    return {"frame": view, "parent": parent, "rows": rows, "columns": parent["columns"],
+            "codes": {}, "counts": {}, "pairs": {}, "top": {}, "lock": threading.RLock()}
@@ -0,0 +1,139 @@
+"""Row filters for the sidebar, backed by per-version indexes.
+
+``filter_index`` builds, once per dataset version, a packed bitmap (one bit
+per row) for every value of the categorical filter columns, from the codes
+of the dataset's count cube, and a sorted order of every numeric range
+column. A filter is then an OR of the selected values' bitmaps per column,
+an AND across columns, and a binary search per range, so applying one
+costs a few vectorized passes over ``rows / 8`` bytes instead of
+comparisons on the frame. ``filtered_view`` shares the filtered frame in
+:mod:`dataset_store` under the derived version ``(version, "filter",
+digest)``, which keys the count cube, profile and chart caches of the view;
+the store drops the view and those caches when the last session holding it
+(or the dataset it comes from) lets go. The view's count cube is sliced from
+the dataset's (see :func:`count_cube.view_cube`).
+"""
+
+import hashlib
+
+import numpy as np
+
+import dataset_store
+from count_cube import count_cube, view_cube
+from titanic_loader import frame_fingerprint, register_fingerprint
+
+# Columns offered as multiselects and as range sliders (when present)
+CATEGORY_COLUMNS = ["Sex", "Pclass", "Embarked", "Survived"]
+RANGE_COLUMNS = ["Age", "Fare"]
+
+CACHE_SIZE = 4
+
+# Filtered frames and their row positions kept per derived version
+VIEW_CACHE_SIZE = 8
+
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+_views = dataset_store.VersionCache(VIEW_CACHE_SIZE)
+
+
+def build_index(df, cube):
+    """Return the bitmaps and sorted orders of ``df`` (``cube`` is its count cube)."""
+    index = {"rows": len(df), "bitmaps": {}, "sorted": {}}
+    for column in CATEGORY_COLUMNS:
+        if column not in cube["columns"]:
+            continue
+        codes, labels = cube["codes"][column]
+        index["bitmaps"][column] = (labels, [np.packbits(codes == code) for code in range(len(labels))])
+    for column in RANGE_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        # argsort puts missing values last; they never fall inside a range
+        order = np.argsort(values, kind="stable")
+        present = int(np.count_nonzero(~np.isnan(values)))
+        index["sorted"][column] = (order[:present], values[order[:present]])
+    return index
+
+
+def filter_index(df):
+    """Memoized :func:`build_index` keyed on the content fingerprint of ``df``."""
+    return _cache.memo(frame_fingerprint(df), lambda: build_index(df, count_cube(df)))
+
+
+def category_options(index, column):
+    return list(index["bitmaps"][column][0]) if column in index["bitmaps"] else []
+
+
+def range_bounds(index, column):
+    """``(min, max)`` of a range column, or None when it has no values."""
+    values = index["sorted"].get(column, (None, []))[1]
+    return (float(values[0]), float(values[-1])) if len(values) else None
+
+
+def row_mask(index, selections, ranges):
+    """Boolean row mask for the filters, or None when no filter applies.
+
+    ``selections`` maps a category column to the values to keep (empty keeps
+    all); ``ranges`` maps a range column to inclusive ``(low, high)`` bounds.
+    Rows with a missing value in a filtered column are dropped.
+    """
+    packed = None
+    for column, values in selections.items():
+        if not values or column not in index["bitmaps"]:
+            continue
+        labels, bitmaps = index["bitmaps"][column]
+        positions = labels.get_indexer(list(values))
+        bits = np.zeros_like(bitmaps[0]) if len(bitmaps) else np.zeros((index["rows"] + 7) // 8, dtype=np.uint8)
+        for position in positions[positions >= 0]:
+            bits |= bitmaps[position]
+        packed = bits if packed is None else packed & bits
+
+    for column, (low, high) in ranges.items():
+        if column not in index["sorted"]:
+            continue
+        order, values = index["sorted"][column]
+        start, stop = np.searchsorted(values, low, side="left"), np.searchsorted(values, high, side="right")
+        mask = np.zeros(index["rows"], dtype=bool)
+        mask[order[start:stop]] = True
+        bits = np.packbits(mask)
+        packed = bits if packed is None else packed & bits
+
+    if packed is None:
+        return None
+    return np.unpackbits(packed, count=index["rows"]).view(bool)
+
+
+def active_filters(index, selections, ranges):
+    """Only the filters that remove rows: non-empty selections and narrowed ranges."""
+    selections = {c: tuple(v) for c, v in selections.items() if v and c in index["bitmaps"]}
+    ranges = {c: (float(lo), float(hi)) for c, (lo, hi) in ranges.items()
+              if c in index["sorted"] and range_bounds(index, c) is not None and (lo, hi) != range_bounds(index, c)}
+    return selections, ranges
+
+
+def filtered_view(df, selections, ranges):
+    """Return ``(view, version)``: the rows of ``df`` matching the filters.
+
+    Without active filters this is ``df`` and its own version. Otherwise the
+    view is a shared, read-only frame fingerprinted as ``(version, "filter",
+    digest)``; hold that version in the session's lease to keep it stored.
+    """
+    version = frame_fingerprint(df)
+    index = filter_index(df)
+    selections, ranges = active_filters(index, selections, ranges)
+    if not selections and not ranges:
+        return df, version
+
+    digest = hashlib.sha256(repr((sorted(selections.items()), sorted(ranges.items()))).encode()).hexdigest()[:12]
+    view_version = (version, "filter", digest)
+    entry = _views.get(view_version)
+    if entry is None:
+        rows = np.flatnonzero(row_mask(index, selections, ranges))
+        entry = dataset_store.share(view_version, df.take(rows)), rows
+        register_fingerprint(entry[0], view_version)
+        _views.put(view_version, entry)
+
+    view, rows = entry
+    # Store the view again if every lease on it was released since it was memoized
+    dataset_store.share(view_version, view)
+    view_cube(df, view, rows)
+    return view, view_version
@@ -0,0 +1,338 @@
+"""Process-wide store of read-only dataset frames shared by all sessions.
+
+Every browser session runs the script on its own, but the frames it works
+on (the loaded dataset and its cleaned form) are the same for everyone.
+The store keeps one read-only copy per dataset version, keyed by its
+content fingerprint. Sessions hold the versions they use through a
+:class:`SessionLease` kept in their session state; when the last lease on a
+version is released (the session ends or moves to another version) the
+frame is dropped together with the per-version caches registered with
+:func:`register_cache`; :class:`VersionCache` is the LRU memo the modules
+deriving data from a version (count cube, profile, ...) keep it in. A
+version no lease ever holds (shared by the warm-up, the report or a test)
+stays stored until the version it derives from is released or
+:func:`evict` drops it.
+
+Frames are handed out as :class:`ReadOnlyFrame`: in-place changes raise
+``TypeError``, while every operation that returns a new frame (``copy``,
+``head``, ``astype``, ...) returns an ordinary, writable DataFrame. The
+arrays behind a shared frame are marked read-only, so writes through a
+column Series (``df[col].iloc[0] = ...``, ``df[col].fillna(...,
+inplace=True)``), ``.values`` or ``.to_numpy()`` raise ``ValueError``
+instead of reaching the shared data; call ``.copy()`` for writable data.
+"""
+
+import functools
+import inspect
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# {version: {"frame": ReadOnlyFrame, "refs": live leases, "bytes": deep memory usage}}
+_entries = {}
+_lock = threading.RLock()
+
+# (cache, lock) pairs whose entries are keyed by a dataset version
+_caches = []
+
+# Live leases, for the memory summary and the size of per-lease caches
+_leases = weakref.WeakSet()
+
+
+def _refuse(*args, **kwargs):
+    raise TypeError("Shared dataset frames are read-only; call .copy() to get a private, writable frame.")
+
+
+class _ReadOnlyIndexer:
+    # Wraps .loc/.iloc/.at/.iat: reads pass through, assignments are refused
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    __setitem__ = _refuse
+
+    def __getattr__(self, name):
+        return getattr(self._indexer, name)
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """A DataFrame whose data, columns and index cannot be changed in place."""
+
+    @property
+    def _constructor(self):
+        # Results of operations are plain, writable frames
+        return pd.DataFrame
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+    def __setattr__(self, name, value):
+        # df.column = ... would otherwise fall back to setting a plain attribute
+        if name in self.__dict__ or name.startswith("_") or name not in self.columns:
+            return super().__setattr__(name, value)
+        _refuse()
+
+    def memory_usage(self, index=True, deep=False):
+        # pandas' deep count of object columns needs writable buffers; add the
+        # sizes of their Python objects the way it would
+        usage = super().memory_usage(index=index, deep=False)
+        if deep:
+            for name, series in self.items():
+                if series.dtype == object:
+                    usage[name] += sum(map(sys.getsizeof, series.array))
+                else:
+                    usage[name] = series.memory_usage(index=False, deep=True)
+            if index and self.index.dtype == object:
+                usage["Index"] = self.index.memory_usage(deep=True)
+        return usage
+
+    # Column assignment and deletion, update, augmented assignment, axis labels
+    __setitem__ = _refuse
+    __delitem__ = _refuse
+    insert = _refuse
+    isetitem = _refuse
+    pop = _refuse
+    update = _refuse
+    _update_inplace = _refuse
+    _set_axis = _refuse
+
+
+def _refuse_inplace(method):
+    # Some methods (fillna, where, ...) write into the blocks before _update_inplace
+    # is reached, so inplace=True has to be refused before pandas runs
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            _refuse()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+for _name, _method in inspect.getmembers(pd.DataFrame, inspect.isfunction):
+    if not _name.startswith("_") and "inplace" in inspect.signature(_method).parameters and _name not in vars(ReadOnlyFrame):
+        setattr(ReadOnlyFrame, _name, _refuse_inplace(_method))
+
+
+def _freeze(frame):
+    # Mark the arrays of every block read-only. Arrow-backed arrays are immutable
+    # already; other extension arrays keep their data in ndarrays under these
+    # attributes (masked, categorical, datetime, Python strings)
+    for block in frame._mgr.blocks:
+        values = block.values
+        if hasattr(values, "_pa_array"):
+            continue
+        arrays = [values] if isinstance(values, np.ndarray) else [
+            getattr(values, attr, None) for attr in ("_ndarray", "_codes", "_data", "_mask")]
+        for array in arrays:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+
+
+def share(version, df):
+    """Return the shared read-only frame for ``version``, storing ``df`` if it is new."""
+    with _lock:
+        entry = _entries.get(version)
+        if entry is None:
+            frame = df if isinstance(df, ReadOnlyFrame) else ReadOnlyFrame(df, copy=False)
+            _freeze(frame)
+            entry = _entries[version] = {
+                "frame": frame,
+                "refs": 0,
+                "bytes": int(frame.memory_usage(index=True, deep=True).sum()),
+            }
+        return entry["frame"]
+
+
+def get(version):
+    """The shared frame for ``version``, or None if it is not (or no longer) stored."""
+    with _lock:
+        entry = _entries.get(version)
+        return None if entry is None else entry["frame"]
+
+
+def persistent(version):
+    """Whether ``version`` is a stored dataset whose derived data belongs in :mod:`artifact_store`.
+
+    Derived versions (filtered views) are stored too, but there are as many
+    of them as filter combinations, so they are never written to disk.
+    """
+    return isinstance(version, str) and get(version) is not None
+
+
+def register_cache(cache, lock):
+    """Drop entries of ``cache`` keyed by (or by a tuple starting with) a version when it is evicted.
+
+    Derived versions are tuples starting with the version they come from, so
+    their entries are dropped with it as well.
+    """
+    _caches.append((cache, lock))
+
+
+class VersionCache:
+    """Thread-safe LRU memo whose keys are a dataset version or a tuple starting with one.
+
+    Holds at most ``size`` values, or ``size`` per live :class:`SessionLease`
+    with ``per_lease=True``, so concurrent sessions do not evict each other's
+    entries; the entries of a version are dropped when the store evicts it.
+    Values are computed outside the lock, so two sessions missing the same
+    key at once may both compute it.
+    """
+
+    def __init__(self, size, per_lease=False):
+        self.size = size
+        self.per_lease = per_lease
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        register_cache(self._entries, self._lock)
+
+    def get(self, key):
+        """The value stored under ``key`` (marking it recently used), or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def capacity(self):
+        """The number of values held before the least recently used is evicted."""
+        return self.size * max(1, len(_leases)) if self.per_lease else self.size
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``, evicting the least recently used entries over :meth:`capacity`."""
+        capacity = self.capacity()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > capacity:
+                self._entries.popitem(last=False)
+
+    def memo(self, key, compute):
+        """The value stored under ``key``, or ``compute()`` stored under it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+
+def _acquire(version):
+    # Take a reference on the stored entry of version; None when it is not stored
+    with _lock:
+        entry = _entries.get(version)
+        if entry is not None:
+            entry["refs"] += 1
+        return entry
+
+
+def _belongs(key, version):
+    # key is the version, a derived version such as (version, "filter", digest),
+    # or a tuple whose first element is one of those
+    return key == version or (isinstance(key, tuple) and len(key) > 0 and _belongs(key[0], version))
+
+
+def _release(version, entry):
+    # Give back the reference taken on entry; a version evicted and stored
+    # again since then is a different entry and keeps its references
+    with _lock:
+        if _entries.get(version) is not entry:
+            return
+        entry["refs"] -= 1
+        if entry["refs"] > 0:
+            return
+    evict(version)
+
+
+def evict(version):
+    """Drop ``version``, the versions derived from it and their cache entries, whatever holds them."""
+    with _lock:
+        # Versions derived from this one (filtered views) go with it
+        for key in [k for k in _entries if _belongs(k, version)]:
+            del _entries[key]
+
+    for cache, lock in _caches:
+        with lock:
+            for key in [k for k in cache if _belongs(k, version)]:
+                del cache[key]
+
+
+def _release_all(versions):
+    for version, entry in list(versions.items()):
+        _release(version, entry)
+    versions.clear()
+
+
+class SessionLease:
+    """The dataset versions one session is using.
+
+    Keep one lease per session (e.g. in ``st.session_state``); its versions
+    are released when it is garbage collected with the session.
+    """
+
+    def __init__(self):
+        # {version: the store entry this lease holds a reference on}
+        self.versions = {}
+        # The finalizer must not reference self, only the mapping it releases
+        self._finalizer = weakref.finalize(self, _release_all, self.versions)
+        _leases.add(self)
+
+    def add(self, versions):
+        """Hold ``versions`` as well, keeping every version held so far.
+
+        Versions that are not stored are skipped; nothing is released for them later.
+        """
+        for version in set(versions) - self.versions.keys():
+            entry = _acquire(version)
+            if entry is not None:
+                self.versions[version] = entry
+
+    def hold(self, versions):
+        """Hold exactly ``versions``, releasing any version held before and not listed.
+
+        New versions are acquired before old ones are released, so a version
+        held both before and after is never dropped in between.
+        """
+        versions = set(versions)
+        self.add(versions)
+        released = {version: self.versions.pop(version) for version in self.versions.keys() - versions}
+        for version, entry in released.items():
+            _release(version, entry)
+
+
+def _short(version):
+    # Abbreviate the content hash, keep suffixes such as ":cleaned-v2"; derived
+    # versions such as (version, "filter", digest) read "<version>:filter-<digest>"
+    if isinstance(version, tuple):
+        return _short(version[0]) + ":" + "-".join(map(str, version[1:]))
+    digest, _, suffix = version.partition(":")
+    return digest[:12] + (":" + suffix if suffix else "")
+
+
+def store_summary():
+    """Stored versions with their row count, memory and number of leases, as a DataFrame."""
+    with _lock:
+        rows = [{"Version": _short(version), "Rows": len(entry["frame"]), "Bytes": entry["bytes"], "Sessions": entry["refs"]}
+                for version, entry in _entries.items()]
+    return pd.DataFrame(rows, columns=["Version", "Rows", "Bytes", "Sessions"])
+
+
+def session_count():
+    return len(_leases)
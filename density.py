@@ -0,0 +1,130 @@
+"""Binned 2D density for scatter plots of large datasets.
+
+Above ``DENSITY_THRESHOLD`` rows the scatter charts switch from plotting
+every point to a fixed-size 2D histogram (optionally split per hue
+category), so render time and image size stay flat as the row count grows.
+Bin counts and the Pearson correlation are accumulated chunk by chunk.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import dataset_store
+from charts import is_categorical
+from feature_matrix import column, feature_matrix
+from titanic_loader import frame_fingerprint
+
+# Row count above which scatter plots are drawn as density images
+DENSITY_THRESHOLD = int(os.environ.get("TITANIC_DENSITY_THRESHOLD", 50_000))
+
+# Grid resolution and rows processed per chunk
+DENSITY_BINS = (120, 90)
+CHUNK_ROWS = 1_000_000
+
+# Hue categories drawn separately; the rest are grouped as "Other"
+MAX_HUE_GROUPS = 8
+
+CACHE_SIZE = 8
+
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+
+
+def use_density(df):
+    return len(df) > DENSITY_THRESHOLD
+
+
+def _hue_codes(series):
+    # Map the hue column to at most MAX_HUE_GROUPS (+ "Other") integer groups
+    if not is_categorical(series) and series.nunique() > MAX_HUE_GROUPS:
+        binned = pd.qcut(series, q=5, duplicates="drop")
+        codes = binned.cat.codes.to_numpy()
+        return codes, [str(c) for c in binned.cat.categories]
+
+    codes, uniques = pd.factorize(series, sort=True)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    if len(uniques) <= MAX_HUE_GROUPS:
+        return codes, [str(u) for u in uniques]
+
+    # Keep the most frequent groups, fold the rest into "Other"
+    keep = np.argsort(counts)[::-1][:MAX_HUE_GROUPS - 1]
+    lookup = np.full(len(uniques), MAX_HUE_GROUPS - 1)
+    lookup[keep] = np.arange(len(keep))
+    mapped = np.where(codes >= 0, lookup[codes], -1)
+    return mapped, [str(uniques[k]) for k in keep] + ["Other"]
+
+
+def _edges(values, bins):
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return np.linspace(0.0, 1.0, bins + 1)
+    lo, hi = finite.min(), finite.max()
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+def density_grid(x, y, hue=None, n_hue=1, bins=DENSITY_BINS):
+    """Bin ``x``/``y`` into a ``(n_hue, nx, ny)`` count grid in chunks.
+
+    ``hue`` holds integer group codes (-1 for missing). Returns a dict with
+    the counts, bin edges, the number of plotted rows and the Pearson
+    correlation of ``x`` and ``y``.
+    """
+    nx, ny = bins
+    xedges, yedges = _edges(x, nx), _edges(y, ny)
+    counts = np.zeros(n_hue * nx * ny, dtype=np.int64)
+
+    # Running sums for the correlation
+    n = sx = sy = sxx = syy = sxy = 0.0
+
+    for start in range(0, len(x), CHUNK_ROWS):
+        xs = x[start:start + CHUNK_ROWS].astype(np.float64, copy=False)
+        ys = y[start:start + CHUNK_ROWS].astype(np.float64, copy=False)
+        valid = np.isfinite(xs) & np.isfinite(ys)
+        xs, ys = xs[valid], ys[valid]
+
+        n += len(xs)
+        sx += xs.sum()
+        sy += ys.sum()
+        sxx += np.dot(xs, xs)
+        syy += np.dot(ys, ys)
+        sxy += np.dot(xs, ys)
+
+        ix = ((xs - xedges[0]) / (xedges[-1] - xedges[0]) * nx).astype(np.int64).clip(0, nx - 1)
+        iy = ((ys - yedges[0]) / (yedges[-1] - yedges[0]) * ny).astype(np.int64).clip(0, ny - 1)
+        cell = ix * ny + iy
+        if hue is not None:
+            hs = hue[start:start + CHUNK_ROWS][valid]
+            cell, hs = cell[hs >= 0], hs[hs >= 0]
+            cell = hs.astype(np.int64) * (nx * ny) + cell
+        counts += np.bincount(cell, minlength=len(counts))
+
+    denom = np.sqrt(max(n * sxx - sx * sx, 0.0) * max(n * syy - sy * sy, 0.0))
+    corr = (n * sxy - sx * sy) / denom if n > 1 and denom > 0 else float("nan")
+    return {
+        "counts": counts.reshape(n_hue, nx, ny),
+        "xedges": xedges,
+        "yedges": yedges,
+        "rows": int(n),
+        "corr": corr,
+    }
+
+
+def scatter_density(df, x_col, y_col, hue_col=None):
+    """Memoized :func:`density_grid` for two (optionally hue-split) columns of ``df``."""
+    return _cache.memo((frame_fingerprint(df), x_col, y_col, hue_col), lambda: _density(df, x_col, y_col, hue_col))
+
+
+def _density(df, x_col, y_col, hue_col):
+    matrix = feature_matrix(df)
+    x, y = column(matrix, x_col), column(matrix, y_col)
+    if hue_col is None:
+        result = density_grid(x, y)
+        result["labels"] = None
+    else:
+        codes, labels = _hue_codes(df[hue_col])
+        result = density_grid(x, y, hue=codes, n_hue=len(labels))
+        result["labels"] = labels
+    return result
@@ -0,0 +1,130 @@
+"""Encoded float32 feature matrix shared by scatter plots and correlations.
+
+``feature_matrix`` encodes every column of a dataset once per dataset
+version into one contiguous float32 array (categorical columns as integer
+category codes, as ``charts.encode_column`` does) with a column-name index.
+Each column is a contiguous row of the array, so ``column`` returns a
+zero-copy view. The Pearson correlation of all columns is computed once,
+on first use, and sliced by the charts that need it.
+
+For shared dataset versions the array and the correlation matrix are
+persisted in :mod:`artifact_store` and mapped back read-only on a restart.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+import artifact_store
+import dataset_store
+from charts import encode_column, is_categorical
+from titanic_loader import frame_fingerprint
+
+# Rows per chunk when accumulating the correlation sums
+CHUNK_ROWS = 1_000_000
+
+CACHE_SIZE = 4
+
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+
+
+def build_matrix(df, values=None, version=None):
+    """Return the encoded matrix of ``df``: a ``(columns, rows)`` float32 array and its index.
+
+    ``values`` reuses an already encoded array; with ``version`` the
+    correlation matrix is persisted in :mod:`artifact_store` under it.
+    """
+    if values is None:
+        values = np.empty((len(df.columns), len(df)), dtype=np.float32)
+        for i, name in enumerate(df.columns):
+            values[i] = encode_column(df[name]).to_numpy(dtype=np.float32, na_value=np.nan)
+    return {
+        "values": values,
+        "version": version,
+        "columns": list(df.columns),
+        "index": {name: i for i, name in enumerate(df.columns)},
+        # Columns select_dtypes(include="number") would keep
+        "numeric": [name for name in df.columns if _is_number(df[name])],
+        "corr": None,
+        "lock": threading.Lock(),
+    }
+
+
+def _is_number(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series) and not is_categorical(series)
+
+
+def column(matrix, name):
+    """Zero-copy float32 view of one encoded column."""
+    return matrix["values"][matrix["index"][name]]
+
+
+def _pairwise_corr(values):
+    # Pearson correlation over pairwise complete rows, like DataFrame.corr()
+    k = len(values)
+    n = np.zeros((k, k))
+    sx = np.zeros((k, k))
+    sxx = np.zeros((k, k))
+    sxy = np.zeros((k, k))
+    # Shift by the column means so the sums do not cancel for large values
+    shift = np.nan_to_num(np.nanmean(values, axis=1, dtype=np.float64)) if values.shape[1] else np.zeros(k)
+
+    for start in range(0, values.shape[1], CHUNK_ROWS):
+        chunk = values[:, start:start + CHUNK_ROWS].astype(np.float64) - shift[:, None]
+        present = np.isfinite(chunk)
+        chunk[~present] = 0.0
+        mask = present.astype(np.float64)
+        n += mask @ mask.T
+        # sx[i, j]: sum of column i over the rows where column j is present
+        sx += chunk @ mask.T
+        sxx += (chunk * chunk) @ mask.T
+        sxy += chunk @ chunk.T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx * sx / n
+        corr = cov / np.sqrt(var * var.T)
+    corr[(n < 2) | (var <= 0) | (var.T <= 0)] = np.nan
+    return corr
+
+
+def correlation(matrix, columns=None):
+    """Correlation matrix of ``columns`` (all columns by default), computed once per matrix."""
+    with matrix["lock"]:
+        if matrix["corr"] is None:
+            names, version = matrix["columns"], matrix["version"]
+            stored = artifact_store.load_array(version, "corr") if version is not None else None
+            if stored is not None and stored[1]["columns"] == names:
+                corr = stored[0]
+            else:
+                corr = _pairwise_corr(matrix["values"])
+                if version is not None:
+                    artifact_store.save_array(version, "corr", corr, columns=names)
+            matrix["corr"] = pd.DataFrame(corr, index=names, columns=names)
+    corr = matrix["corr"]
+    if columns is None:
+        return corr
+    return corr.loc[columns, columns]
+
+
+def feature_matrix(df):
+    """Memoized :func:`build_matrix` keyed on the content fingerprint of ``df``.
+
+    The array of a shared dataset version is persisted in :mod:`artifact_store`.
+    """
+    key = frame_fingerprint(df)
+    return _cache.memo(key, lambda: _build_persisted(df, key))
+
+
+def _build_persisted(df, key):
+    # build_matrix, reusing (or persisting) the array of a shared dataset version
+    version = key if dataset_store.persistent(key) else None
+    stored = artifact_store.load_array(version, "matrix") if version is not None else None
+    if stored is not None and stored[1]["columns"] == list(df.columns):
+        matrix = build_matrix(df, stored[0], version)
+    else:
+        matrix = build_matrix(df, version=version)
+        if version is not None:
+            artifact_store.save_array(version, "matrix", matrix["values"], columns=matrix["columns"])
+    return matrix
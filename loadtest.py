@@ -0,0 +1,331 @@
+"""Multi-session load test of the Streamlit app over its websocket protocol.
+
+Starts ``titanic_streamlit_app.py`` in a local Streamlit server on an
+offline dataset (a synthetic Titanic-schema CSV unless ``--source`` is
+given) and, for each concurrency level, opens that many simulated browser
+sessions on ``/_stcore/stream``. Every session loads the app, then walks
+the scripted interactions of ``benchmark_app`` (chart type changes and
+column selections in the raw and cleaned sections), sending the same
+``rerun_script`` messages (widget states, fragment id) a browser would and
+waiting for ``script_finished`` after each one, with a random think time in
+between. Each level reports p50/p95/p99 rerun latency, throughput and the
+server's CPU and RSS (sampled from ``/proc``, so Linux only), and the first
+level whose p95 exceeds ``--slo-ms`` is reported as the saturation point::
+
+    python loadtest.py --sessions 1 5 10 25 50 --output load.json
+
+Needs the ``websockets`` package. The client runs on the same host, so on
+small machines it competes with the server for CPU.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from benchmark_app import APP_PATH, CHART_SELECTIONS, SECTIONS, _git_commit, widget_key
+
+DEFAULT_SESSIONS = [1, 5, 10, 25, 50]
+
+# Rows of the synthetic dataset (unless --source is given)
+DEFAULT_ROWS = 1_000
+
+# Reruns per session after the initial load, and the mean pause between them
+DEFAULT_INTERACTIONS = 12
+DEFAULT_THINK_MS = 500
+
+# p95 rerun latency above which a level counts as saturated
+DEFAULT_SLO_MS = 2_000
+
+# Seconds between server CPU/RSS samples, to wait for the server, and for one rerun
+SAMPLE_INTERVAL = 0.25
+START_TIMEOUT = 120
+RUN_TIMEOUT = 600
+
+# Element types whose widget ids and fragments a session tracks
+WIDGET_TYPES = ("selectbox", "multiselect", "slider", "number_input")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(source, port, backend):
+    """Start the app in a headless Streamlit server and wait until it is healthy."""
+    env = dict(os.environ, TITANIC_DATA_SOURCE=str(source), TITANIC_CHART_BACKEND=backend, TITANIC_TRACE="0")
+    command = [sys.executable, "-m", "streamlit", "run", str(APP_PATH), "--server.headless", "true",
+               "--server.port", str(port), "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false"]
+    server = subprocess.Popen(command, cwd=APP_PATH.parent, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit server exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.read().strip() == b"ok":
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"Streamlit server did not become healthy within {START_TIMEOUT} s")
+
+
+def _proc_usage(pid):
+    # (CPU seconds, RSS bytes) of a process, from /proc
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/status") as status:
+        rss = next(int(line.split()[1]) * 1024 for line in status if line.startswith("VmRSS:"))
+    return cpu, rss
+
+
+class ServerMonitor:
+    """Samples the CPU time and RSS of the server process in a background thread."""
+
+    def __init__(self, pid, interval=SAMPLE_INTERVAL):
+        self.pid, self.interval, self.samples = pid, interval, []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.samples.append((time.perf_counter(), *_proc_usage(self.pid)))
+            except (OSError, ValueError, StopIteration):
+                return
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def usage(self, start, end):
+        """Mean and peak CPU % and peak and final RSS (MB) between two perf_counter times."""
+        window = [sample for sample in self.samples if start <= sample[0] <= end]
+        if len(window) < 2:
+            return {"cpu_percent_mean": None, "cpu_percent_max": None, "rss_mb_peak": None, "rss_mb_end": None}
+        times, cpu, rss = (np.array(column) for column in zip(*window))
+        rates = np.diff(cpu) / np.diff(times) * 100
+        return {
+            "cpu_percent_mean": round(float((cpu[-1] - cpu[0]) / (times[-1] - times[0]) * 100), 1),
+            "cpu_percent_max": round(float(rates.max()), 1),
+            "rss_mb_peak": round(float(rss.max()) / 1e6, 1),
+            "rss_mb_end": round(float(rss[-1]) / 1e6, 1),
+        }
+
+
+def interaction_plan():
+    """Units of ``(chart type key, chart type, selection)``; each unit is two reruns at most."""
+    plan = []
+    for section in SECTIONS:
+        for chart, selection in CHART_SELECTIONS.items():
+            plan.append((widget_key(section, "chart_type"), chart, {widget_key(section, key): value for key, value in selection.items()}))
+    return plan
+
+
+class Session:
+    """One simulated browser session: widget ids seen so far and the states it sends."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}
+        self.states = {}
+        self.errors = 0
+        self.bytes = 0
+
+    def _track(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+        if kind not in WIDGET_TYPES:
+            return
+        widget = getattr(element, kind)
+        key = widget.id.rsplit("-", 1)[-1]
+        if key != "None":
+            self.widgets[key] = (widget.id, delta.fragment_id)
+
+    async def rerun(self, fragment_id=""):
+        """Send a rerun with the current widget states; returns its latency in ms."""
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        message.rerun_script.fragment_id = fragment_id
+        message.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self.ws.send(message.SerializeToString())
+        while True:
+            data = await asyncio.wait_for(self.ws.recv(), RUN_TIMEOUT)
+            self.bytes += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self._track(forward.delta)
+            elif kind == "script_finished":
+                return (time.perf_counter() - start) * 1000
+
+    def set_value(self, widget_id, value):
+        self.states[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+
+async def run_session(url, interactions, think_ms, rng):
+    """Load the app and run ``interactions`` scripted reruns; returns the session's record."""
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=RUN_TIMEOUT) as ws:
+        session = Session(ws)
+        initial = await session.rerun()
+        latencies = []
+        plan = interaction_plan()
+        step = rng.randrange(len(plan))
+        # Steps skipped in a row because their chart's widget is not on the page
+        skipped = 0
+        while len(latencies) < interactions:
+            chart_key, chart, selection = plan[step % len(plan)]
+            step += 1
+            if chart_key not in session.widgets:
+                skipped += 1
+                if skipped >= len(plan):
+                    raise RuntimeError(f"None of the {len(plan)} scripted chart widgets is on the page")
+                continue
+            skipped = 0
+            box, fragment = session.widgets[chart_key]
+            session.set_value(box, chart)
+            for phase in ("chart type", "columns"):
+                if len(latencies) >= interactions:
+                    break
+                if phase == "columns":
+                    present = {key: session.widgets[key] for key in selection if key in session.widgets and session.widgets[key][1] == fragment}
+                    if not present:
+                        continue
+                    for key, (widget_id, _) in present.items():
+                        session.set_value(widget_id, selection[key])
+                await asyncio.sleep(rng.uniform(0.5, 1.5) * think_ms / 1000)
+                latencies.append(await session.rerun(fragment))
+        return {"initial_ms": initial, "latencies": latencies, "errors": session.errors, "bytes": session.bytes}
+
+
+def _percentile(values, q):
+    return round(float(np.percentile(values, q)), 1) if len(values) else None
+
+
+async def _run_sessions(url, sessions, interactions, think_ms, seed):
+    return await asyncio.gather(*(run_session(url, interactions, think_ms, random.Random(seed + i)) for i in range(sessions)),
+                                return_exceptions=True)
+
+
+def run_level(url, monitor, sessions, interactions, think_ms, seed=0):
+    """Run ``sessions`` concurrent sessions and summarize their latencies and the server usage."""
+    start = time.perf_counter()
+    records = asyncio.run(_run_sessions(url, sessions, interactions, think_ms, seed))
+    end = time.perf_counter()
+    completed = [record for record in records if not isinstance(record, BaseException)]
+    latencies = [latency for record in completed for latency in record["latencies"]]
+    initial = [record["initial_ms"] for record in completed]
+    return {
+        "sessions": sessions,
+        "failed_sessions": len(records) - len(completed),
+        "failures": sorted({f"{type(record).__name__}: {record}" for record in records if isinstance(record, BaseException)}),
+        "app_errors": sum(record["errors"] for record in completed),
+        "reruns": len(latencies),
+        "initial_p50_ms": _percentile(initial, 50),
+        "initial_p95_ms": _percentile(initial, 95),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "max_ms": _percentile(latencies, 100),
+        "reruns_per_s": round(len(latencies) / (end - start), 2),
+        "received_bytes": sum(record["bytes"] for record in completed),
+        "elapsed_s": round(end - start, 2),
+        **monitor.usage(start, end),
+    }
+
+
+def _show(level):
+    def value(name, fmt):
+        return format(level[name], fmt) if level[name] is not None else "-"
+    return (f"{level['sessions']:>8} {level['reruns']:>7} {value('p50_ms', '.0f'):>8} {value('p95_ms', '.0f'):>8} {value('p99_ms', '.0f'):>8} "
+            f"{value('initial_p95_ms', '.0f'):>11} {level['reruns_per_s']:>9.2f} {value('cpu_percent_mean', '.0f'):>6} "
+            f"{value('rss_mb_peak', '.0f'):>8} {level['failed_sessions'] + level['app_errors']:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent simulated sessions.")
+    parser.add_argument("--source", help="dataset path (default: a synthetic dataset of --rows rows)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="rows of the synthetic dataset")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS, help="concurrency levels to run")
+    parser.add_argument("--interactions", type=int, default=DEFAULT_INTERACTIONS, help="reruns per session after the initial load")
+    parser.add_argument("--think-ms", type=float, default=DEFAULT_THINK_MS, help="mean pause between a session's reruns")
+    parser.add_argument("--slo-ms", type=float, default=DEFAULT_SLO_MS, help="p95 rerun latency that counts as saturated")
+    parser.add_argument("--backend", choices=["matplotlib", "vega"], default="matplotlib", help="chart rendering backend")
+    parser.add_argument("--port", type=int, help="server port (default: a free port)")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    if args.source:
+        source = args.source
+    else:
+        from synthetic_data import synthetic_csv
+        source = synthetic_csv(args.rows)
+
+    port = args.port or _free_port()
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    server = start_server(source, port, args.backend)
+    monitor = ServerMonitor(server.pid)
+    results = {
+        "commit": _git_commit(),
+        "source": str(source),
+        "backend": args.backend,
+        "interactions": args.interactions,
+        "think_ms": args.think_ms,
+        "slo_ms": args.slo_ms,
+        "cpus": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+    try:
+        # One session walks the whole plan first, so the levels measure warm caches
+        results["warmup"] = run_level(url, monitor, 1, 2 * len(interaction_plan()), 0)
+        print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'load p95 ms':>11} {'reruns/s':>9} {'cpu %':>6} {'rss MB':>8} {'errors':>7}")
+        results["levels"] = []
+        for sessions in args.sessions:
+            level = run_level(url, monitor, sessions, args.interactions, args.think_ms, seed=sessions)
+            results["levels"].append(level)
+            print(_show(level), flush=True)
+    finally:
+        monitor.stop()
+        server.terminate()
+        server.wait(timeout=30)
+
+    saturated = next((level["sessions"] for level in results["levels"]
+                      if level["failed_sessions"] or (level["p95_ms"] is not None and level["p95_ms"] > args.slo_ms)), None)
+    results["saturation_sessions"] = saturated
+    if saturated is None:
+        print(f"No saturation up to {max(args.sessions)} sessions (p95 <= {args.slo_ms:.0f} ms).")
+    else:
+        print(f"Saturated at {saturated} sessions: p95 above {args.slo_ms:.0f} ms or failed sessions.")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
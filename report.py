@@ -0,0 +1,272 @@
+"""Static HTML EDA report rendered without a Streamlit server.
+
+Enumerates every chart type × column selection the app offers, for both the
+raw and the cleaned dataset, draws them with the app's chart functions
+(``charts`` and ``chart_render.encode_figure``) across a process pool and
+writes ``index.html`` with the images and their insight text::
+
+    python report.py --output report --jobs 8
+
+Selections are limited to readable charts: category axes use columns with
+at most ``--max-levels`` distinct values, scatter axes use numeric columns.
+Each chart is keyed by a digest of its inputs (dataset version, chart,
+columns and the source of the drawing code); charts whose digest is in the
+previous run's ``manifest.json`` are not drawn again.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+from pathlib import Path
+
+import numpy as np
+
+import charts
+from chart_insights import chart_insights
+from chart_render import encode_figure
+from column_profile import column_profile
+from count_cube import MAX_LEVELS, TOP_K, count_cube, top_crosstab, value_counts
+from density import DENSITY_THRESHOLD, scatter_density, use_density
+from feature_matrix import column, correlation, feature_matrix
+from survival import survival_rates
+from titanic_cleaning import clean_dataset
+from titanic_loader import configured_source, frame_fingerprint, load_dataset
+
+# Source files whose changes invalidate rendered charts
+CODE_FILES = [
+    "charts.py", "chart_insights.py", "chart_render.py", "column_profile.py", "column_sketch.py", "count_cube.py",
+    "density.py", "feature_matrix.py", "survival.py", "titanic_cleaning.py", "titanic_loader.py", "titanic_schema.py",
+    "report.py",
+]
+
+# Datasets loaded in this process: {"raw": {...}, "cleaned": {...}}
+_datasets = {}
+
+
+def load_datasets(source):
+    """Load the raw and cleaned datasets with their per-version caches (once per process)."""
+    if not _datasets:
+        df, info = load_dataset(source)
+        cleaned = clean_dataset(df, info["stats"])[0]
+        for label, frame, stats in (("raw", df, info["stats"]), ("cleaned", cleaned, None)):
+            _datasets[label] = {
+                "frame": frame,
+                "version": frame_fingerprint(frame),
+                "cube": count_cube(frame),
+                "profile": column_profile(frame, stats),
+                "matrix": feature_matrix(frame),
+            }
+    return _datasets
+
+
+def code_version():
+    """Digest of ``CODE_FILES`` and of the environment settings that change the charts."""
+    digest = hashlib.sha256()
+    for name in CODE_FILES:
+        digest.update((Path(__file__).resolve().parent / name).read_bytes())
+    digest.update(json.dumps({"top_k": TOP_K, "density_threshold": DENSITY_THRESHOLD}).encode())
+    return digest.hexdigest()[:16]
+
+
+# Each chart returns (draw, figsize, insights) for one column selection
+
+def _pie(data, category):
+    counts = value_counts(data["cube"], category)
+    return (lambda ax: charts.draw_pie(ax, counts, category)), (3, 3), chart_insights("Pie Chart", [category], counts)
+
+
+def _bar(data, bar_x, bar_hue):
+    table = top_crosstab(data["cube"], bar_x, bar_hue)
+    return (lambda ax: charts.draw_bar(ax, table, bar_x, bar_hue)), (5, 3), chart_insights("Bar Chart", [bar_x, bar_hue], table)
+
+
+def _histogram(data, category):
+    profile = data["profile"][category]
+    counts = value_counts(data["cube"], category) if profile["dtype_class"] == "categorical" else None
+    return (lambda ax: charts.draw_histogram(ax, data["frame"], category, counts)), (4, 3), chart_insights("Histogram", [category], profile)
+
+
+def _simple_scatter(data, x_col, y_col):
+    frame, matrix = data["frame"], data["matrix"]
+    if use_density(frame):
+        density = scatter_density(frame, x_col, y_col)
+        draw = lambda ax: charts.draw_density(ax, density, x_col, y_col)
+        corr = density["corr"] if density["rows"] > 1 else None
+    else:
+        x, y = column(matrix, x_col), column(matrix, y_col)
+        draw = lambda ax: charts.draw_simple_scatter(ax, x, y, x_col, y_col)
+        corr = correlation(matrix).at[x_col, y_col] if np.count_nonzero(np.isfinite(x) & np.isfinite(y)) > 1 else None
+    return draw, (4, 3), chart_insights("Scatter Plot (Simple)", [x_col, y_col], corr)
+
+
+def _complex_scatter(data, x_col, y_col, hue_col):
+    frame = data["frame"]
+    if use_density(frame):
+        density = scatter_density(frame, x_col, y_col, hue_col)
+        draw = lambda ax: charts.draw_density(ax, density, x_col, y_col, hue_col)
+    else:
+        draw = lambda ax: charts.draw_complex_scatter(ax, frame, x_col, y_col, hue_col)
+    return draw, (5, 4), chart_insights("Scatter Plot (Complex)", [x_col, y_col, hue_col], None)
+
+
+def _count_heatmap(data, heat_x, heat_y):
+    table = top_crosstab(data["cube"], heat_y, heat_x)
+    return (lambda ax: charts.draw_count_heatmap(ax, table, f"Heatmap: {heat_y} vs {heat_x}")), (5, 3), chart_insights(
+        "Heatmap (Categorical)", [heat_x, heat_y], table)
+
+
+def _percent_heatmap(data, heat_x, heat_y):
+    table = top_crosstab(data["cube"], heat_y, heat_x)
+    percent = table.div(table.sum(axis=0), axis=1) * 100
+    title = f"Percentage Heatmap: {heat_y} vs {heat_x} (Column %)"
+    return (lambda ax: charts.draw_count_heatmap(ax, percent, title, cmap="Purples", fmt=".1f")), (5, 3), chart_insights(
+        "Heatmap (Categorical – Percentages)", [heat_x, heat_y], percent)
+
+
+def _correlation_heatmap(data):
+    matrix = data["matrix"]
+    corr = correlation(matrix, matrix["numeric"])
+    return (lambda ax: charts.draw_correlation_heatmap(ax, corr)), (6, 4), chart_insights("Heatmap (Numerical Correlation)", [], corr)
+
+
+def _survival(data, *by):
+    rates = survival_rates(data["frame"], list(by))
+    return (lambda ax: charts.draw_survival_rates(ax, rates, list(by))), ((4, 3) if len(by) == 1 else (6, 3.5)), chart_insights("Survival Rates", by, rates)
+
+
+CHARTS = {
+    "Pie Chart": _pie,
+    "Bar Chart": _bar,
+    "Histogram": _histogram,
+    "Scatter Plot (Simple)": _simple_scatter,
+    "Scatter Plot (Complex)": _complex_scatter,
+    "Heatmap (Categorical)": _count_heatmap,
+    "Heatmap (Categorical – Percentages)": _percent_heatmap,
+    "Heatmap (Numerical Correlation)": _correlation_heatmap,
+    "Survival Rates": _survival,
+}
+
+
+def chart_jobs(datasets, max_levels=MAX_LEVELS):
+    """Every ``(dataset, chart, columns)`` selection of the report, in report order."""
+    jobs = []
+    for label, data in datasets.items():
+        profile, numeric = data["profile"], data["matrix"]["numeric"]
+        levels = [c for c in data["frame"].columns if 1 < profile[c]["unique"] <= max_levels]
+        selections = {
+            "Pie Chart": [(c,) for c in levels],
+            "Bar Chart": list(permutations(levels, 2)),
+            "Histogram": [(c,) for c in dict.fromkeys(levels + numeric)],
+            "Scatter Plot (Simple)": list(permutations(numeric, 2)),
+            "Scatter Plot (Complex)": [(x, y, hue) for x, y in permutations(numeric, 2) for hue in levels if hue not in (x, y)],
+            "Heatmap (Categorical)": list(permutations(levels, 2)),
+            "Heatmap (Numerical Correlation)": [()],
+        }
+        if label == "cleaned":
+            selections["Heatmap (Categorical – Percentages)"] = list(permutations(levels, 2))
+            survival_by = [c for c in levels if c != "Survived"]
+            selections["Survival Rates"] = [(c,) for c in survival_by] + [tuple(c for c in ("Sex", "Pclass", "IsAlone") if c in survival_by)]
+        for chart, columns in selections.items():
+            jobs.extend((label, chart, tuple(cols)) for cols in columns)
+    return jobs
+
+
+def job_digest(datasets, job, code):
+    label, chart, columns = job
+    return hashlib.sha256(json.dumps([datasets[label]["version"], chart, columns, code]).encode()).hexdigest()[:20]
+
+
+def _init_worker(source):
+    # Fork-started workers inherit the parent's datasets; others load them once here
+    load_datasets(source)
+
+
+def render_job(job, image_path, source):
+    """Draw one chart to ``image_path`` and return its insight sentences."""
+    label, chart, columns = job
+    draw, figsize, insights = CHARTS[chart](load_datasets(source)[label], *columns)
+    Path(image_path).write_bytes(encode_figure(draw, figsize))
+    return insights
+
+
+def _html_text(text):
+    # **bold** markdown of the insight sentences
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(text))
+
+
+def write_html(path, jobs, entries, datasets):
+    parts = ["<!DOCTYPE html>", "<html><head><meta charset='utf-8'><title>Titanic EDA report</title>",
+             "<style>body{font-family:sans-serif;margin:2em}figure{display:inline-block;vertical-align:top;width:420px;margin:0 1em 2em 0}"
+             "img{max-width:100%}figcaption{font-weight:bold}</style></head><body>",
+             "<h1>Titanic EDA report</h1>"]
+    current = None
+    for job, digest in jobs:
+        label, chart, columns = job
+        if (label, chart) != current:
+            if current is None or current[0] != label:
+                data = datasets[label]
+                parts.append(f"<h2>{label.title()} dataset</h2><p>{len(data['frame']):,} rows · version {data['version'][:12]}</p>")
+            parts.append(f"<h3>{html.escape(chart)}</h3>")
+            current = (label, chart)
+        entry = entries[digest]
+        items = "".join(f"<li>{_html_text(line)}</li>" for line in entry["insights"])
+        caption = html.escape(" × ".join(columns) or "All numeric columns")
+        parts.append(f"<figure><img src='{entry['image']}' loading='lazy'><figcaption>{caption}</figcaption><ul>{items}</ul></figure>")
+    parts.append("</body></html>")
+    Path(path).write_text("\n".join(parts), encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every chart of the app into a static HTML report.")
+    parser.add_argument("--source", help="dataset URL or path (default: TITANIC_DATA_SOURCE or the public URL)")
+    parser.add_argument("--output", default="report", help="output directory (index.html, images/, manifest.json)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--max-levels", type=int, default=MAX_LEVELS, help="most distinct values of a category axis")
+    parser.add_argument("--force", action="store_true", help="redraw charts even if their inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    source = args.source or configured_source()
+    output = Path(args.output)
+    (output / "images").mkdir(parents=True, exist_ok=True)
+    manifest_path = output / "manifest.json"
+    previous = {} if args.force or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+    start = time.perf_counter()
+    datasets = load_datasets(source)
+    code = code_version()
+    jobs = [(job, job_digest(datasets, job, code)) for job in chart_jobs(datasets, args.max_levels)]
+
+    entries = {digest: previous[digest] for _, digest in jobs
+               if digest in previous and (output / previous[digest]["image"]).exists()}
+    todo = [(job, digest) for job, digest in jobs if digest not in entries]
+
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=(source,)) as pool:
+        futures = {digest: pool.submit(render_job, job, output / "images" / f"{digest}.png", source) for job, digest in todo}
+        for job, digest in todo:
+            label, chart, columns = job
+            entries[digest] = {"dataset": label, "chart": chart, "columns": list(columns),
+                               "image": f"images/{digest}.png", "insights": futures[digest].result()}
+
+    write_html(output / "index.html", jobs, entries, datasets)
+    manifest_path.write_text(json.dumps(entries, indent=1))
+
+    # Images of selections that no longer exist
+    current = {entry["image"] for entry in entries.values()}
+    for image in (output / "images").glob("*.png"):
+        if f"images/{image.name}" not in current:
+            image.unlink()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(jobs)} charts: {len(todo)} rendered, {len(jobs) - len(todo)} unchanged, "
+          f"{elapsed:.1f} s ({len(todo) / elapsed:.1f} charts/s with {args.jobs} workers) -> {output / 'index.html'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Independently rerunnable app sections.
+
+``section`` turns a function into a Streamlit fragment, so a widget inside
+it only re-executes that function instead of the whole script. Each section
+ends with a caption counting its own runs next to the full-script runs of
+the session, which shows how much work an interaction triggered: a widget
+change inside a section bumps only that section's count.
+"""
+
+import functools
+import time
+
+import streamlit as st
+
+import tracing
+
+
+def count_script_run():
+    # Called once at the top of the script; fragment reruns never reach it
+    st.session_state["_script_runs"] = st.session_state.get("_script_runs", 0) + 1
+
+
+def section(name):
+    """Decorator running the function as a fragment named ``name``.
+
+    All data the section needs must be passed as arguments; a fragment rerun
+    reuses the arguments of the last full script run.
+    """
+    def decorate(func):
+        @st.fragment
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            runs = st.session_state.setdefault("_section_runs", {})
+            runs[name] = runs.get(name, 0) + 1
+            # Fragment reruns skip the top of the script, so re-apply the session's trace setting
+            tracing.enable(st.session_state.get("trace_enabled", tracing.enabled()))
+            start = time.perf_counter()
+            with tracing.span(f"section: {name}"):
+                result = func(*args, **kwargs)
+            elapsed = (time.perf_counter() - start) * 1000
+            st.caption(
+                f"Rerun scope · {name}: section run {runs[name]:,}, "
+                f"full script runs {st.session_state.get('_script_runs', 0):,}, this run {elapsed:.0f} ms"
+            )
+            return result
+        return wrapper
+    return decorate
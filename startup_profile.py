@@ -0,0 +1,142 @@
+"""Import-time and cold-start profile of the Streamlit app, for CI.
+
+Each measurement runs in a fresh interpreter so nothing is cached:
+
+- ``imports``: ``python -X importtime`` over the modules the app imports at
+  the top of the script, with the slowest modules and whether the plotting
+  stack (Matplotlib, Seaborn) or the optional model and interval libraries
+  (scikit-learn, SciPy) were imported eagerly;
+- ``cold_start``: a first ``AppTest`` run of the app on a local dataset, with
+  the time until the title was painted (the start of the "load dataset"
+  trace span) and the time until the whole script finished.
+
+Budgets turn the profile into a check; the exit status is 1 if one is
+exceeded or one of those modules is imported at startup::
+
+    python startup_profile.py --max-import-ms 2000 --max-first-paint-ms 500
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent / "titanic_streamlit_app.py"
+
+# Modules that must not be imported at startup: the plotting stack (imported
+# when the first chart is drawn) and the optional model and interval libraries
+LAZY_MODULES = ["matplotlib", "seaborn", "sklearn", "scipy"]
+
+# Rows of the synthetic dataset used for the cold start (unless --source is given)
+DEFAULT_ROWS = 1_000
+
+_COLD_START = """
+import json, time
+from streamlit.testing.v1 import AppTest
+start = time.time()
+at = AppTest.from_file({app!r}, default_timeout=600)
+at.run()
+print(json.dumps({{"start": start, "end": time.time(), "exception": [e.message for e in at.exception]}}))
+"""
+
+
+def app_imports():
+    """Top-level modules imported at the top of the app script."""
+    tree = ast.parse(APP_PATH.read_text())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_profile(top=10):
+    """Import the app's modules in a fresh interpreter with ``-X importtime``."""
+    modules = app_imports()
+    code = f"import json, sys\nimport {', '.join(modules)}\nprint(json.dumps(sorted(m for m in {LAZY_MODULES!r} if m in sys.modules)))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_PATH.parent,
+                            capture_output=True, text=True, check=True)
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({"module": name.strip(), "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                     "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    roots = [row for row in rows if row["depth"] == 0]
+    return {
+        "modules": modules,
+        "total_ms": round(sum(row["cumulative_ms"] for row in roots), 1),
+        "slowest": sorted(roots, key=lambda row: row["cumulative_ms"], reverse=True)[:top],
+        "eager_imports": json.loads(result.stdout.strip().splitlines()[-1]),
+    }
+
+
+def cold_start(source):
+    """First full run of the app in a fresh interpreter, with trace spans logged to a file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_log = Path(tmp) / "trace.jsonl"
+        env = dict(os.environ, TITANIC_DATA_SOURCE=str(source), TITANIC_TRACE="1", TITANIC_TRACE_LOG=str(trace_log))
+        result = subprocess.run([sys.executable, "-c", _COLD_START.format(app=str(APP_PATH))], cwd=APP_PATH.parent,
+                                env=env, capture_output=True, text=True, check=True)
+        run = json.loads(result.stdout.strip().splitlines()[-1])
+        spans = [json.loads(line) for line in trace_log.read_text().splitlines()] if trace_log.exists() else []
+
+    load = next((span for span in spans if span["span"] == "load dataset"), None)
+    return {
+        "source": str(source),
+        "first_paint_ms": round((load["ts"] - run["start"]) * 1000, 1) if load else None,
+        "load_ms": load["wall_ms"] if load else None,
+        "full_run_ms": round((run["end"] - run["start"]) * 1000, 1),
+        "exception": run["exception"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile import time and cold start of the Streamlit app.")
+    parser.add_argument("--source", help="dataset path (default: a synthetic dataset of --rows rows)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="rows of the synthetic dataset")
+    parser.add_argument("--max-import-ms", type=float, help="fail if importing the app's modules takes longer")
+    parser.add_argument("--max-first-paint-ms", type=float, help="fail if the title is painted later than this")
+    parser.add_argument("--output", help="write the JSON profile to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.source:
+        source = args.source
+    else:
+        from synthetic_data import synthetic_csv
+        source = synthetic_csv(args.rows)
+
+    profile = {"imports": import_profile(), "cold_start": cold_start(source)}
+
+    failures = []
+    if profile["imports"]["eager_imports"]:
+        failures.append(f"lazy modules imported at startup: {', '.join(profile['imports']['eager_imports'])}")
+    if args.max_import_ms is not None and profile["imports"]["total_ms"] > args.max_import_ms:
+        failures.append(f"import time {profile['imports']['total_ms']:.0f} ms > {args.max_import_ms:.0f} ms")
+    first_paint = profile["cold_start"]["first_paint_ms"]
+    if args.max_first_paint_ms is not None and (first_paint is None or first_paint > args.max_first_paint_ms):
+        failures.append(f"first paint {first_paint} ms > {args.max_first_paint_ms:.0f} ms")
+    if profile["cold_start"]["exception"]:
+        failures.append(f"app raised: {profile['cold_start']['exception'][0]}")
+    profile["failures"] = failures
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(profile, indent=2))
+    else:
+        print(json.dumps(profile, indent=2))
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Survival rates with closed-form confidence intervals.
+
+``survival_rates`` groups passengers by any columns (one or several, e.g.
+Sex × Pclass × IsAlone) with a single vectorized group-by and returns the
+survival rate of each group with its confidence interval. Wilson score
+intervals are computed in closed form; Clopper-Pearson (exact) intervals
+need scipy and are offered only when it is installed. Results are memoized
+per dataset version and grouping.
+"""
+
+import importlib.util
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+import dataset_store
+from titanic_loader import frame_fingerprint
+
+# Interval methods available in this environment; scipy is only imported
+# when an exact interval is computed, not at app startup
+INTERVAL_METHODS = ["Wilson"] + (["Clopper-Pearson"] if importlib.util.find_spec("scipy") is not None else [])
+
+CONFIDENCE = 0.95
+
+# Groups smaller than this are left out of the computed findings
+MIN_GROUP_SIZE = 10
+
+CACHE_SIZE = 32
+
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+
+
+def wilson_interval(survived, passengers, confidence=CONFIDENCE):
+    """Wilson score interval for ``survived`` successes out of ``passengers`` (arrays).
+
+    Empty groups get the uninformative interval [0, 1].
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    n = np.asarray(passengers, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.asarray(survived, dtype=np.float64) / n
+        denom = 1 + z ** 2 / n
+        center = (p + z ** 2 / (2 * n)) / denom
+        half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    empty = n == 0
+    return np.where(empty, 0.0, np.clip(center - half, 0, 1)), np.where(empty, 1.0, np.clip(center + half, 0, 1))
+
+
+def clopper_pearson_interval(survived, passengers, confidence=CONFIDENCE):
+    """Exact (Clopper-Pearson) interval from beta quantiles; requires scipy.
+
+    Empty groups get the uninformative interval [0, 1].
+    """
+    if "Clopper-Pearson" not in INTERVAL_METHODS:
+        raise ImportError("Clopper-Pearson intervals require scipy")
+    from scipy.stats import beta
+
+    k = np.asarray(survived, dtype=np.float64)
+    n = np.asarray(passengers, dtype=np.float64)
+    alpha = 1 - confidence
+    with np.errstate(invalid="ignore"):
+        lower = np.where(k > 0, beta.ppf(alpha / 2, k, n - k + 1), 0.0)
+        upper = np.where(k < n, beta.ppf(1 - alpha / 2, k + 1, n - k), 1.0)
+    return lower, upper
+
+
+def group_rates(df, by, method="Wilson", confidence=CONFIDENCE):
+    """Survival rate per group of the ``by`` columns.
+
+    Returns a DataFrame indexed by the groups (a MultiIndex for several
+    columns) with the passengers and survivors of each group, the rate and
+    the interval bounds. Passengers with a missing group value or survival
+    flag are left out.
+    """
+    survived = pd.Series(np.asarray(df["Survived"], dtype=np.float64), index=df.index)
+    known = survived.notna()
+    keys = [df[column][known] for column in by]
+    counts = survived[known].groupby(keys, observed=True, sort=True).agg(["size", "sum"])
+
+    interval = wilson_interval if method == "Wilson" else clopper_pearson_interval
+    lower, upper = interval(counts["sum"], counts["size"], confidence)
+    return pd.DataFrame({
+        "Passengers": counts["size"].astype(np.int64),
+        "Survived": counts["sum"].astype(np.int64),
+        "Rate": counts["sum"] / counts["size"],
+        "Lower": lower,
+        "Upper": upper,
+    }, index=counts.index)
+
+
+def survival_rates(df, by, method="Wilson", confidence=CONFIDENCE):
+    """Memoized :func:`group_rates` keyed on the dataset version and grouping."""
+    by = list(by)
+    return _cache.memo((frame_fingerprint(df), tuple(by), method, confidence), lambda: group_rates(df, by, method, confidence))
+
+
+def group_label(group, by):
+    # "Sex=female, Pclass=1"; a single grouping column has scalar group keys
+    if len(by) == 1:
+        group = (group,)
+    return ", ".join(f"{column}={value}" for column, value in zip(by, group))
+
+
+def _rate_text(row):
+    return f"{row['Rate']:.0%} ({row['Lower']:.0%}–{row['Upper']:.0%})"
+
+
+def findings(rates, by):
+    """Computed insight sentences for a :func:`survival_rates` table."""
+    sized = rates[rates["Passengers"] >= MIN_GROUP_SIZE]
+    if len(sized) < 2:
+        return [f"Fewer than two groups of {' × '.join(by)} have at least {MIN_GROUP_SIZE} passengers."]
+
+    ordered = sized.sort_values("Rate", ascending=False)
+    best, worst = ordered.iloc[0], ordered.iloc[-1]
+    best_label, worst_label = group_label(ordered.index[0], by), group_label(ordered.index[-1], by)
+    lines = [
+        f"Highest survival: **{best_label}** at **{_rate_text(best)}** of {int(best['Passengers']):,} passengers.",
+        f"Lowest survival: **{worst_label}** at **{_rate_text(worst)}** of {int(worst['Passengers']):,} passengers.",
+    ]
+    if best["Lower"] > worst["Upper"]:
+        lines.append("Their intervals do not overlap, so the gap is unlikely to be sampling noise.")
+    else:
+        lines.append("The intervals overlap, so the difference may be sampling noise.")
+    skipped = len(rates) - len(sized)
+    if skipped:
+        lines.append(f"{skipped} group(s) with fewer than {MIN_GROUP_SIZE} passengers are shown but not ranked.")
+    return lines
@@ -0,0 +1,198 @@
+"""Baseline survival classifiers trained on the cleaned dataset.
+
+``fit_model`` one-hot encodes the categorical features (at most
+``MAX_LEVELS`` values each, see :func:`feature_options`) and standardizes the
+numeric ones (an encoder fitted on the training rows), holds out a fixed
+share of rows to measure accuracy, and fits the chosen scikit-learn model;
+the models are offered only when scikit-learn is installed. Fitted models
+and their encoders are memoized per dataset version, feature set and
+hyperparameters, so reruns never retrain. ``score_csv`` scores an uploaded
+CSV in chunks with the same encoder.
+"""
+
+import importlib.util
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import dataset_store
+from charts import is_categorical
+from count_cube import MAX_LEVELS, count_cube
+from titanic_cleaning import add_family_features
+from titanic_loader import frame_fingerprint
+
+# Models available in this environment, with their default hyperparameters.
+# scikit-learn is only imported when a model is trained, not at app startup
+MODELS = {}
+if importlib.util.find_spec("sklearn") is not None:
+    MODELS["Logistic Regression"] = {"C": 1.0}
+    MODELS["Random Forest"] = {"n_estimators": 100, "max_depth": 8}
+
+# Cleaned columns used as features by default
+FEATURES = ["Pclass", "Sex", "Age", "Fare", "Embarked", "FamilySize", "IsAlone"]
+
+# Columns never offered as features: the label and the row identifier
+NON_FEATURES = {"Survived", "PassengerId"}
+
+# Share of rows held out to measure accuracy, and the seed of the split and forest
+HOLDOUT_FRACTION = 0.2
+SEED = 0
+
+# Cores a forest trains on; every session trains in the server process, so one by default
+MODEL_JOBS = int(os.environ.get("TITANIC_MODEL_JOBS", 1))
+
+# Rows per chunk when scoring an uploaded CSV
+SCORE_CHUNK_ROWS = int(os.environ.get("TITANIC_SCORE_CHUNK_ROWS", 100_000))
+
+CACHE_SIZE = 8
+
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+
+
+def feature_options(df):
+    """Columns of ``df`` usable as features: numeric ones and categorical ones with at most ``MAX_LEVELS`` values.
+
+    Free-text columns such as Name or Ticket would one-hot encode into one
+    column per row.
+    """
+    cube = count_cube(df)
+    return [c for c in df.columns if c not in NON_FEATURES and (not is_categorical(df[c]) or c in cube["columns"])]
+
+
+def fit_encoder(df, features):
+    """Levels of the categorical ``features`` and fill/center/scale of the numeric ones."""
+    encoder = {"columns": list(features), "levels": {}, "fill": {}, "center": {}, "scale": {}}
+    for column in features:
+        series = df[column]
+        if is_categorical(series):
+            values = series.cat.categories if isinstance(series.dtype, pd.CategoricalDtype) else series.dropna().unique()
+            if len(values) > MAX_LEVELS:
+                raise ValueError(f"{column} has {len(values):,} values; categorical features are limited to {MAX_LEVELS}")
+            encoder["levels"][column] = sorted(values)
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            encoder["fill"][column] = float(np.nanmedian(values))
+            encoder["center"][column] = float(np.nanmean(values))
+            encoder["scale"][column] = float(np.nanstd(values)) or 1.0
+    return encoder
+
+
+def feature_names(encoder):
+    names = []
+    for column in encoder["columns"]:
+        levels = encoder["levels"].get(column)
+        names += [column] if levels is None else [f"{column}={level}" for level in levels]
+    return names
+
+
+def encode(encoder, frame):
+    """Float64 design matrix of ``frame``; unseen categories encode as all zeros."""
+    blocks = []
+    for column in encoder["columns"]:
+        levels = encoder["levels"].get(column)
+        if levels is not None:
+            codes = pd.Categorical(frame[column], categories=levels).codes
+            block = np.zeros((len(frame), len(levels)))
+            rows = np.flatnonzero(codes >= 0)
+            block[rows, codes[rows]] = 1.0
+        else:
+            values = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            values = np.where(np.isnan(values), encoder["fill"][column], values)
+            block = ((values - encoder["center"][column]) / encoder["scale"][column])[:, None]
+        blocks.append(block)
+    return np.hstack(blocks) if blocks else np.zeros((len(frame), 0))
+
+
+def predict_proba(model, X):
+    """Survival probability of each row of the encoded matrix ``X``."""
+    return model["estimator"].predict_proba(X)[:, 1]
+
+
+def train_model(df, name, features, params):
+    """Fit model ``name`` on the labelled rows of the cleaned frame ``df``."""
+    if name not in MODELS:
+        raise ValueError(f"Model {name!r} is not available")
+    start = time.perf_counter()
+    labelled = df[df["Survived"].notna()]
+    y = np.asarray(labelled["Survived"], dtype=np.float64)
+    holdout = np.random.default_rng(SEED).random(len(labelled)) < HOLDOUT_FRACTION
+
+    encoder = fit_encoder(labelled[~holdout], features)
+    X = encode(encoder, labelled)
+    model = {"name": name, "features": list(features), "params": dict(params), "encoder": encoder, "feature_names": feature_names(encoder)}
+    if name == "Logistic Regression":
+        from sklearn.linear_model import LogisticRegression
+        estimator = LogisticRegression(max_iter=1000, **params)
+    else:
+        from sklearn.ensemble import RandomForestClassifier
+        estimator = RandomForestClassifier(random_state=SEED, n_jobs=MODEL_JOBS, **params)
+    model["estimator"] = estimator.fit(X[~holdout], y[~holdout])
+
+    model["train_rows"] = int((~holdout).sum())
+    model["train_seconds"] = time.perf_counter() - start
+    model["holdout_rows"] = int(holdout.sum())
+    model["accuracy"] = float(((predict_proba(model, X[holdout]) >= 0.5) == y[holdout]).mean()) if holdout.any() else np.nan
+    return model
+
+
+def fit_model(df, name, features, params):
+    """Memoized :func:`train_model`, returning ``(model, cached)``.
+
+    Keyed on the dataset version of ``df``, the feature list and the
+    hyperparameters.
+    """
+    key = (frame_fingerprint(df), name, tuple(features), tuple(sorted(params.items())))
+    model = _cache.get(key)
+    if model is not None:
+        return model, True
+
+    model = train_model(df, name, features, params)
+
+    _cache.put(key, model)
+    return model, False
+
+
+def feature_weights(model):
+    """Logistic coefficients (per standardized feature) or forest importances, largest first."""
+    if model["name"] == "Logistic Regression":
+        weights = pd.Series(model["estimator"].coef_[0], index=model["feature_names"], name="Coefficient")
+    else:
+        weights = pd.Series(model["estimator"].feature_importances_, index=model["feature_names"], name="Importance")
+    return weights.reindex(weights.abs().sort_values(ascending=False).index)
+
+
+def _with_family_features(frame):
+    # Raw Titanic CSVs have SibSp and Parch instead of the cleaned family features
+    if "FamilySize" in frame.columns or not {"SibSp", "Parch"} <= set(frame.columns):
+        return frame
+    columns = {name: frame[name] for name in frame.columns}
+    add_family_features(columns, frame)
+    return pd.DataFrame(columns, copy=False)
+
+
+def score_csv(model, file, chunk_rows=None):
+    """Score a raw or cleaned Titanic CSV in chunks; returns ``(scores, stats)``.
+
+    ``scores`` holds the PassengerId (when present), the survival
+    probability and the predicted label of every row; ``stats`` the row
+    count, chunk count and wall time.
+    """
+    chunk_rows = chunk_rows or SCORE_CHUNK_ROWS
+    start = time.perf_counter()
+    parts, chunks = [], 0
+    with pd.read_csv(file, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk = _with_family_features(chunk)
+            missing = [c for c in model["features"] if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"The CSV has no {', '.join(missing)} column(s)")
+            probability = predict_proba(model, encode(model["encoder"], chunk))
+            part = pd.DataFrame({"Survival probability": probability, "Predicted survived": (probability >= 0.5).astype(np.int8)}, index=chunk.index)
+            if "PassengerId" in chunk.columns:
+                part.insert(0, "PassengerId", chunk["PassengerId"])
+            parts.append(part)
+            chunks += 1
+    scores = pd.concat(parts) if parts else pd.DataFrame(columns=["Survival probability", "Predicted survived"])
+    return scores, {"rows": len(scores), "chunks": chunks, "seconds": time.perf_counter() - start}
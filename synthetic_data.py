@@ -0,0 +1,82 @@
+"""Synthetic datasets with the Titanic schema, for benchmarks and load tests.
+
+Columns, dtypes and missing-value rates follow the real dataset, so every
+chart and the cleaning pipeline behave as they do on it, at any row count.
+Files are written in chunks and reused when they already exist.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Where generated CSVs are kept between runs
+DATA_DIR = Path(__file__).resolve().parent / ".cache" / "synthetic"
+
+CHUNK_ROWS = 500_000
+
+_TITLES = np.array(["Mr.", "Mrs.", "Miss.", "Master.", "Dr.", "Rev."])
+_SURNAMES = np.array(["Smith", "Brown", "Andersson", "Sage", "Johnson", "Goodwin", "Carter", "Kelly", "Williams", "Panula"])
+
+
+def synthetic_frame(rows, seed=0, start=0):
+    """Return ``rows`` synthetic passengers with ids starting at ``start + 1``."""
+    rng = np.random.default_rng(seed)
+    pclass = rng.choice([1, 2, 3], rows, p=[0.24, 0.21, 0.55])
+    female = rng.random(rows) < 0.35
+    survived = rng.random(rows) < np.where(female, 0.74, 0.19) * np.array([0, 1.3, 1.0, 0.7])[pclass]
+
+    ids = np.arange(start + 1, start + rows + 1)
+    names = pd.Series(_SURNAMES[rng.integers(0, len(_SURNAMES), rows)]) + ", " + pd.Series(
+        _TITLES[rng.integers(0, len(_TITLES), rows)]) + " Passenger " + pd.Series(ids).astype(str)
+
+    age = np.round(np.clip(rng.normal(29.7, 14.5, rows), 0.42, 80), 1)
+    age[rng.random(rows) < 0.2] = np.nan
+    cabin = pd.Series(np.char.add(rng.choice(list("ABCDEF"), rows), rng.integers(1, 130, rows).astype(str)))
+    cabin[rng.random(rows) >= 0.23] = None
+    embarked = pd.Series(rng.choice(["S", "C", "Q"], rows, p=[0.72, 0.19, 0.09]))
+    embarked[rng.random(rows) < 0.002] = None
+
+    return pd.DataFrame({
+        "PassengerId": ids,
+        "Survived": survived.astype(int),
+        "Pclass": pclass,
+        "Name": names,
+        "Sex": np.where(female, "female", "male"),
+        "Age": age,
+        "SibSp": rng.choice([0, 1, 2, 3, 4, 5, 8], rows, p=[0.68, 0.235, 0.03, 0.02, 0.02, 0.01, 0.005]),
+        "Parch": rng.choice([0, 1, 2, 3, 4, 5, 6], rows, p=[0.76, 0.13, 0.09, 0.006, 0.005, 0.006, 0.003]),
+        "Ticket": pd.Series(rng.integers(100_000, 100_000 + max(rows * 3 // 4, 1), rows)).astype(str),
+        "Fare": np.round(rng.lognormal(2.7, 1.0, rows) * np.array([0, 3.0, 1.2, 0.8])[pclass], 4),
+        "Cabin": cabin,
+        "Embarked": embarked,
+    })
+
+
+def synthetic_csv(rows, seed=0, data_dir=DATA_DIR):
+    """Path of a synthetic CSV with ``rows`` rows, generating it on first use."""
+    path = Path(data_dir) / f"titanic_{rows}_{seed}.csv"
+    if path.exists():
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".part")
+    for chunk, start in enumerate(range(0, rows, CHUNK_ROWS)):
+        frame = synthetic_frame(min(CHUNK_ROWS, rows - start), seed=seed + chunk, start=start)
+        frame.to_csv(tmp_path, mode="w" if chunk == 0 else "a", header=chunk == 0, index=False)
+    tmp_path.replace(path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic Titanic-schema CSVs.")
+    parser.add_argument("rows", type=int, nargs="+", help="row counts to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    for rows in args.rows:
+        print(synthetic_csv(rows, seed=args.seed))
+
+
+if __name__ == "__main__":
+    main()
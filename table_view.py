@@ -0,0 +1,66 @@
+"""Paged table viewer for the Streamlit app.
+
+``show_table`` sends only the visible window of rows to the browser, with
+page, page-size and sort controls. Sorting happens on the server: the row
+order for each (dataset, column, direction) is computed once and reused, so
+paging through a sorted table only slices it. No rerun sends more than
+``MAX_ROWS`` rows.
+"""
+
+import os
+
+import numpy as np
+import streamlit as st
+
+import dataset_store
+from titanic_loader import frame_fingerprint
+
+# Hard cap on rows serialized per table and rerun
+MAX_ROWS = int(os.environ.get("TITANIC_TABLE_MAX_ROWS", 500))
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+
+# Sorted row orders kept in memory
+CACHE_SIZE = 16
+
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+
+_UNSORTED = "(original order)"
+
+
+def sort_order(df, column, ascending=True):
+    """Row positions of ``df`` sorted by ``column`` (missing values last), memoized."""
+    return _cache.memo((frame_fingerprint(df), column, ascending), lambda: _sort_order(df, column, ascending))
+
+
+def _sort_order(df, column, ascending):
+    series = df[column].reset_index(drop=True)
+    return series.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+def table_window(df, offset, limit, sort_by=None, ascending=True):
+    """Return the rows ``offset:offset + limit`` of ``df``, optionally sorted, capped at ``MAX_ROWS``."""
+    stop = offset + min(limit, MAX_ROWS)
+    if sort_by is None:
+        return df.iloc[offset:stop]
+    return df.iloc[sort_order(df, sort_by, ascending)[offset:stop]]
+
+
+def show_table(df, key):
+    """Display ``df`` one page at a time with page, page-size and sort controls."""
+    sizes = [size for size in PAGE_SIZES if size <= MAX_ROWS] or [MAX_ROWS]
+
+    col_sort, col_dir, col_size, col_page = st.columns([3, 2, 2, 2])
+    sort_by = col_sort.selectbox("Sort by", [_UNSORTED] + list(df.columns), key=f"{key}_sort")
+    descending = col_dir.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    page_size = col_size.selectbox("Rows per page", sizes, key=f"{key}_size")
+    pages = max(1, int(np.ceil(len(df) / page_size)))
+    # Keep the page in range when the page size or dataset changes
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = col_page.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    offset = (int(page) - 1) * page_size
+    window = table_window(df, offset, page_size, None if sort_by == _UNSORTED else sort_by, not descending)
+    st.dataframe(window)
+    st.caption(f"Rows {offset + 1:,}–{offset + len(window):,} of {len(df):,} (page {int(page):,} of {pages:,})")
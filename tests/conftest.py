@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app's modules live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import artifact_store  # noqa: E402
+from synthetic_data import synthetic_frame  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def artifact_dir(tmp_path, monkeypatch):
+    """Persist artifacts under the test's own directory, never in the repository's cache."""
+    monkeypatch.setattr(artifact_store, "ARTIFACT_DIR", tmp_path / "artifacts")
+    return artifact_store.ARTIFACT_DIR
+
+
+@pytest.fixture
+def passengers():
+    """Factory of synthetic Titanic-schema frames: ``passengers(rows, columns=None)``.
+
+    The same seed every time, so tests are reproducible; ``columns`` keeps
+    only the listed columns, in that order.
+    """
+    def make(rows=2_000, columns=None):
+        df = synthetic_frame(rows)
+        return df if columns is None else df[list(columns)]
+    return make
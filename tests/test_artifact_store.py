@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+import artifact_store
+
+pytest.importorskip("pyarrow")
+
+
+def test_first_write_of_a_code_version_prunes_the_others(artifact_dir, monkeypatch):
+    monkeypatch.setattr(artifact_store, "ENABLED", True)
+    stale = artifact_dir / "0123456789abcdef" / "version"
+    stale.mkdir(parents=True)
+    (stale / "frame.arrow").write_bytes(b"old")
+
+    frame = pd.DataFrame({"a": [1, 2, 3]})
+    artifact_store.save_frame("version", "frame", frame)
+    pd.testing.assert_frame_equal(artifact_store.load_frame("version", "frame"), frame)
+    assert [path.name for path in artifact_dir.iterdir()] == [artifact_store.code_version()]
@@ -0,0 +1,17 @@
+import pandas as pd
+
+from chart_insights import chart_insights
+
+
+def test_bar_insight_names_the_largest_group_by_column():
+    table = pd.crosstab(pd.Series([1, 3, 3], name="Pclass"), pd.Series(["m", "m", "f"], name="Sex"))
+    assert chart_insights("Bar Chart", ["Pclass", "Sex"], table)[0] == "The largest group is **Pclass=1, Sex=m** with **1 passengers**."
+
+
+def test_insights_without_data_say_so():
+    assert chart_insights("Pie Chart", ["Sex"], pd.Series([], dtype="int64")) == [
+        "The most common category in **Sex** is **None** with **0 passengers**."]
+    assert chart_insights("Scatter Plot (Simple)", ["Age", "Fare"], None) == ["Not enough data to compute correlation."]
+    corr = pd.DataFrame({"Age": [1.0]}, index=["Age"])
+    assert chart_insights("Heatmap (Numerical Correlation)", [], corr) == [
+        "Survived is not numeric in this view, so correlation with survival is not shown."]
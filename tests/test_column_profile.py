@@ -0,0 +1,25 @@
+import pytest
+
+from column_profile import build_profile
+from column_sketch import profile_frame
+from count_cube import build_cube
+
+
+def test_profile_counts_low_cardinality_columns_only(passengers):
+    df = passengers(columns=["PassengerId", "Pclass", "Embarked", "Fare"])
+    cube = build_cube(df)
+    profile = build_profile(df, cube)
+    assert profile["Embarked"]["mode"] == df["Embarked"].mode()[0]
+    assert profile["Embarked"]["top_count"] == df["Embarked"].value_counts().iloc[0]
+    assert profile["Pclass"]["unique"] == 3
+    assert profile["PassengerId"]["mode"] is None and profile["PassengerId"]["unique"] == len(df)
+    # High-cardinality numeric columns are never factorized into the cube
+    assert "PassengerId" not in cube["codes"] and "Fare" not in cube["codes"]
+
+
+def test_profile_reads_means_from_sketches(passengers):
+    df = passengers(columns=["PassengerId", "Pclass", "Embarked", "Fare"])
+    with_sketches = build_profile(df, build_cube(df), profile_frame(df))
+    assert with_sketches["Fare"]["mean"] == pytest.approx(df["Fare"].mean())
+    # Distinct counts above column_sketch.DISTINCT_K are estimates
+    assert with_sketches["Fare"]["unique"] == pytest.approx(len(df), rel=0.1)
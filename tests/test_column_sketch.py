@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from column_sketch import TOP_K, ColumnSketch, QuantileSketch, TopK, describe_sketches, profile_frame
+from titanic_loader import read_dataset
+from titanic_schema import concat_compact, compact_frame
+
+
+def _sketch(series, chunk_rows=None):
+    sketch = ColumnSketch(series.name)
+    for start in range(0, len(series), chunk_rows or len(series)):
+        sketch.update(series.iloc[start:start + (chunk_rows or len(series))])
+    return sketch
+
+
+def test_small_numeric_column_is_exact():
+    series = pd.Series([3.0, 1.0, np.nan, 4.0, 1.0, 5.0], name="Fare")
+    sketch = _sketch(series, chunk_rows=2)
+    assert (sketch.count, sketch.missing, sketch.distinct()) == (5, 1, 4)
+    assert sketch.mean == pytest.approx(series.mean())
+    assert sketch.std() == pytest.approx(series.std())
+    assert sketch.median() == series.median()
+    assert describe_sketches({"Fare": sketch}).loc["Fare", "estimated"] == ""
+
+
+def test_merge_matches_a_single_pass():
+    values = pd.Series(np.random.default_rng(0).normal(30, 10, 10_000), name="Age")
+    left, right = _sketch(values.iloc[:3_000]), _sketch(values.iloc[3_000:])
+    left.merge(right)
+    whole = _sketch(values)
+    assert (left.count, left.min, left.max) == (whole.count, whole.min, whole.max)
+    assert left.mean == pytest.approx(whole.mean)
+    assert left.std() == pytest.approx(whole.std())
+
+
+def test_large_inputs_give_close_estimates():
+    values = np.random.default_rng(1).uniform(0, 1, 100_000)
+    quantiles = QuantileSketch()
+    for chunk in np.array_split(values, 10):
+        quantiles.update(chunk)
+    assert quantiles.quantile(0.5) == pytest.approx(np.median(values), abs=0.02)
+
+    sketch = _sketch(pd.Series(np.arange(50_000), name="PassengerId"), chunk_rows=5_000)
+    assert sketch.distinct() == pytest.approx(50_000, rel=0.1)
+    assert "unique" in sketch.estimated()
+
+
+def test_top_values_are_marked_approximate_beyond_k():
+    exact = TopK()
+    exact.update(pd.Series(["S", "C", "S", "Q"]))
+    assert exact.exact and exact.most_common()[0] == ("S", 2)
+
+    values = pd.Series(["S"] * 500 + [f"T{i}" for i in range(2 * TOP_K)], name="Ticket")
+    sketch = _sketch(values, chunk_rows=100)
+    assert sketch.mode()[0] == "S" and not sketch.top.exact
+    row = describe_sketches({"Ticket": sketch}).loc["Ticket"]
+    assert row["top"] == "S" and row["freq"] <= 500
+    assert row["estimated"] == "top, freq"
+
+
+def test_all_missing_first_chunk_does_not_fix_the_type():
+    # read_csv parses a chunk without any Cabin value as float64
+    sketches = profile_frame(pd.DataFrame({"Cabin": np.full(100, np.nan)}))
+    sketches = profile_frame(pd.DataFrame({"Cabin": ["C39", "B12", "C39"]}), sketches)
+    sketch = sketches["Cabin"]
+    assert not sketch.numeric and (sketch.count, sketch.missing) == (3, 100)
+    assert sketch.mode()[0] == "C39"
+
+
+def test_concat_compact_ignores_all_missing_chunks():
+    first = compact_frame(pd.DataFrame({"Embarked": [np.nan] * 4, "Age": [np.nan] * 4}))[0]
+    second = compact_frame(pd.DataFrame({"Embarked": ["S", "S", "C", "S"], "Age": [1.0, 2.0, 3.0, 4.0]}))[0]
+    df = concat_compact([first, second])
+    assert isinstance(df["Embarked"].dtype, pd.CategoricalDtype)
+    assert df["Embarked"].isna().sum() == 4 and list(df["Embarked"].iloc[4:]) == ["S", "S", "C", "S"]
+    assert df["Age"].isna().sum() == 4
+
+
+def test_chunked_read_matches_a_single_read(tmp_path):
+    rows = 300
+    frame = pd.DataFrame({
+        "PassengerId": np.arange(1, rows + 1),
+        "Cabin": [None] * 100 + [f"C{i % 7}" for i in range(rows - 100)],
+        "Fare": np.linspace(5, 80, rows),
+    })
+    path = tmp_path / "titanic.csv"
+    frame.to_csv(path, index=False)
+    whole, _, whole_sketches = read_dataset(path, chunk_rows=0)
+    chunked, _, sketches = read_dataset(path, chunk_rows=100)
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert sketches["Cabin"].count == whole_sketches["Cabin"].count == rows - 100
+    assert sketches["Cabin"].mode()[0] == whole_sketches["Cabin"].mode()[0]
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from count_cube import OTHER, build_cube, crosstab, top_crosstab, value_counts, view_cube
+
+COLUMNS = ["PassengerId", "Pclass", "Sex"]
+
+
+def test_low_cardinality_crosstab_is_exact(passengers):
+    df = passengers(5_000, COLUMNS)
+    table = crosstab(build_cube(df), "Pclass", "Sex")
+    expected = pd.crosstab(df["Pclass"], df["Sex"])
+    assert (table.to_numpy() == expected.to_numpy()).all()
+
+
+def test_high_cardinality_pairs_are_folded_to_top_values(passengers):
+    df = passengers(5_000, COLUMNS)
+    cube = build_cube(df)
+    for table in (crosstab(cube, "PassengerId", "PassengerId"), top_crosstab(cube, "PassengerId", "Sex", k=5)):
+        assert OTHER in table.index
+        assert table.shape[0] <= 21 and table.shape[1] <= 21
+        assert table.to_numpy().sum() == len(df)
+
+
+def test_view_cube_counts_match_a_cube_built_from_the_view(passengers):
+    df = passengers(5_000, COLUMNS)
+    rows = np.flatnonzero(df["Sex"].to_numpy() == "female")
+    view = df.take(rows)
+    sliced, built = view_cube(df, view, rows), build_cube(view)
+    for column in ("Pclass", "Sex", "PassengerId"):
+        pd.testing.assert_series_equal(value_counts(sliced, column), value_counts(built, column))
+    pd.testing.assert_frame_equal(crosstab(sliced, "Pclass", "Sex"), crosstab(built, "Pclass", "Sex"))
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_store
+from count_cube import build_cube
+from cross_filter import build_index, filtered_view, row_mask
+from titanic_loader import frame_fingerprint, register_fingerprint
+
+
+COLUMNS = ["Pclass", "Sex", "Embarked", "Age", "Fare"]
+
+
+@pytest.mark.parametrize("selections, ranges", [
+    ({"Sex": ["female"]}, {}),
+    ({"Pclass": [1, 3], "Embarked": ["C", "Q"]}, {}),
+    ({}, {"Age": (18.0, 40.0)}),
+    ({}, {"Fare": (0.0, 10.0)}),
+    ({"Sex": ["male"], "Pclass": [2]}, {"Age": (10.5, 60.0), "Fare": (5.0, 100.0)}),
+])
+def test_row_mask_matches_boolean_filtering(passengers, selections, ranges):
+    df = passengers(3_000, COLUMNS)
+    expected = pd.Series(True, index=df.index)
+    for column, values in selections.items():
+        expected &= df[column].isin(values)
+    for column, (low, high) in ranges.items():
+        expected &= df[column].between(low, high)
+    mask = row_mask(build_index(df, build_cube(df)), selections, ranges)
+    np.testing.assert_array_equal(mask, expected.to_numpy())
+
+
+def test_filtered_view_is_shared_and_released_with_its_lease(passengers):
+    df = dataset_store.share("test:cross-filter", passengers(3_000, COLUMNS))
+    register_fingerprint(df, "test:cross-filter")
+    lease = dataset_store.SessionLease()
+    lease.hold(["test:cross-filter"])
+    view, version = filtered_view(df, {"Sex": ["female"]}, {})
+    assert version[:2] == ("test:cross-filter", "filter") and frame_fingerprint(view) == version
+    assert dataset_store.get(version) is view
+    lease.add([version])
+    lease.hold(["test:cross-filter"])
+    assert dataset_store.get(version) is None
+    # Releasing the dataset drops views of it that no lease holds
+    filtered_view(df, {"Sex": ["female"]}, {})
+    lease.hold([])
+    assert dataset_store.get(version) is None
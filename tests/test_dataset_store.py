@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_store
+from dataset_store import ReadOnlyFrame, SessionLease
+
+
+def _frame():
+    return pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": [np.nan, 2.0, 2.0]})
+
+
+@pytest.mark.parametrize("change", [
+    lambda f: f.fillna(0, inplace=True),
+    lambda f: f.replace(1.0, 9.0, inplace=True),
+    lambda f: f.where(f > 1, 0, inplace=True),
+    lambda f: f.mask(f > 1, 0, inplace=True),
+    lambda f: f.ffill(inplace=True),
+    lambda f: f.bfill(inplace=True),
+    lambda f: f.interpolate(inplace=True),
+    lambda f: f.clip(0, 1, inplace=True),
+    lambda f: f.dropna(inplace=True),
+    lambda f: f.sort_values("a", ascending=False, inplace=True),
+    lambda f: f.rename(columns={"a": "z"}, inplace=True),
+    lambda f: f.update(pd.DataFrame({"a": [5.0, 5.0, 5.0]})),
+    lambda f: f.__setitem__("a", 0),
+    lambda f: f.loc.__setitem__((0, "a"), 0),
+    lambda f: f.iat.__setitem__((0, 0), 0),
+    lambda f: setattr(f, "a", 0),
+    lambda f: f.insert(0, "c", 0),
+    lambda f: f.pop("a"),
+    lambda f: f.__iadd__(1),
+])
+def test_in_place_changes_are_refused_and_leave_data_unchanged(change):
+    frame = ReadOnlyFrame(_frame(), copy=False)
+    with pytest.raises(TypeError):
+        change(frame)
+    pd.testing.assert_frame_equal(pd.DataFrame(frame), _frame())
+
+
+def test_derived_frames_are_writable():
+    filled = ReadOnlyFrame(_frame(), copy=False).fillna(0)
+    assert type(filled) is pd.DataFrame
+    filled.loc[0, "a"] = 5.0
+    assert filled.loc[0, "a"] == 5.0
+
+
+def test_rehold_keeps_versions_listed_again():
+    dataset_store.share("test:raw", _frame())
+    dataset_store.share("test:cleaned", _frame())
+    lease = SessionLease()
+    lease.hold(["test:raw", "test:cleaned"])
+    # A rerun first adds the raw version, then holds both again
+    lease.add(["test:raw"])
+    lease.hold(["test:raw", "test:cleaned"])
+    assert dataset_store.get("test:cleaned") is not None
+    lease.hold([])
+    assert dataset_store.get("test:raw") is None and dataset_store.get("test:cleaned") is None
+
+
+def test_version_cache_is_lru_and_dropped_with_its_version():
+    cache = dataset_store.VersionCache(2)
+    cache.put(("v-cache-1", "a"), 1)
+    cache.put(("v-cache-2", "b"), 2)
+    assert cache.get(("v-cache-1", "a")) == 1
+    cache.put("v-cache-3", 3)
+    assert cache.get(("v-cache-2", "b")) is None and cache.get("v-cache-3") == 3
+
+    dataset_store.share("v-cache-1", _frame())
+    lease = SessionLease()
+    lease.hold(["v-cache-1"])
+    lease.hold([])
+    assert cache.get(("v-cache-1", "a")) is None and cache.get("v-cache-3") == 3
+
+
+def _mixed_frame():
+    return _frame().assign(
+        name=["x", None, "z"],
+        level=pd.Categorical(["lo", "hi", "lo"]),
+        count=pd.array([1, None, 3], dtype="Int8"),
+    )
+
+
+# Chained assignment is what these writes test; pandas warns about it
+@pytest.mark.filterwarnings("ignore::FutureWarning", "ignore:(?s).*set on a copy")
+@pytest.mark.parametrize("change", [
+    lambda f: f["a"].fillna(0, inplace=True),
+    lambda f: f["a"].iloc.__setitem__(0, 9.0),
+    lambda f: f["b"].clip(0, 1, inplace=True),
+    lambda f: f["a"].values.__setitem__(0, 9.0),
+    lambda f: f[["a", "b"]].to_numpy().__setitem__((0, 0), 9.0),
+    lambda f: f["name"].fillna("y", inplace=True),
+    lambda f: f["name"].iloc.__setitem__(0, "y"),
+    lambda f: f["level"].iloc.__setitem__(0, "hi"),
+    lambda f: f["count"].values.__setitem__(0, 5),
+])
+def test_writes_through_a_column_series_do_not_reach_the_shared_frame(change):
+    frame = dataset_store.share("test:series-writes", _mixed_frame())
+    try:
+        change(frame)
+    except ValueError:
+        # Read-only arrays refuse the write
+        pass
+    pd.testing.assert_frame_equal(pd.DataFrame(frame), _mixed_frame())
+
+
+def test_shared_frames_report_deep_memory_usage():
+    frame = dataset_store.share("test:memory", _mixed_frame())
+    pd.testing.assert_series_equal(frame.memory_usage(deep=True), _mixed_frame().memory_usage(deep=True))
+    dataset_store.evict("test:memory")
+    assert dataset_store.get("test:memory") is None
+
+
+def test_leases_only_release_references_they_took():
+    early = SessionLease()
+    # Not stored yet: nothing is acquired, so nothing may be released later
+    early.add(["test:late"])
+    dataset_store.share("test:late", _frame())
+    holder = SessionLease()
+    holder.hold(["test:late"])
+    early.hold([])
+    del early
+    assert dataset_store.get("test:late") is not None
+    holder.hold([])
+    assert dataset_store.get("test:late") is None
+
+
+def test_version_cache_memo_computes_once():
+    cache = dataset_store.VersionCache(2)
+    calls = []
+    for _ in range(3):
+        assert cache.memo(("v-memo", "a"), lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
+
+
+def test_per_lease_cache_grows_with_live_sessions():
+    cache = dataset_store.VersionCache(2, per_lease=True)
+    leases = [SessionLease() for _ in range(3)]
+    assert cache.capacity() == 2 * dataset_store.session_count() >= 6
+    for i in range(cache.capacity()):
+        cache.put(("v-lease", i), i)
+    assert cache.get(("v-lease", 0)) == 0
+    del leases
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import feature_matrix
+from feature_matrix import _pairwise_corr
+
+
+def _frame(passengers, rows=1_000):
+    df = passengers(rows, ["Age", "Fare", "Pclass", "SibSp"])
+    rng = np.random.default_rng(0)
+    # A constant column and one with too few complete pairs for a correlation
+    return df.assign(
+        Fare=df["Fare"] + 1e4,
+        Constant=3.0,
+        Sparse=np.where(rng.random(rows) < 0.01, rng.normal(size=rows), np.nan),
+    )
+
+
+@pytest.mark.parametrize("chunk_rows", [feature_matrix.CHUNK_ROWS, 64])
+def test_pairwise_corr_matches_dataframe_corr(passengers, monkeypatch, chunk_rows):
+    monkeypatch.setattr(feature_matrix, "CHUNK_ROWS", chunk_rows)
+    values = _frame(passengers).to_numpy(dtype=np.float32).T
+    expected = pd.DataFrame(values.T.astype(np.float64)).corr()
+    np.testing.assert_allclose(_pairwise_corr(values), expected.to_numpy(), rtol=1e-6, atol=1e-9)
+    # The constant column has no correlation, not even with itself
+    assert np.isnan(_pairwise_corr(values)[4]).all()
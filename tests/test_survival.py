@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from survival import clopper_pearson_interval, wilson_interval
+
+# Survivors, passengers and the 95% interval, from R's binom.confint
+WILSON = [
+    (0, 10, 0.0, 0.2775328),
+    (10, 10, 0.7224672, 1.0),
+    (5, 10, 0.2365931, 0.7634069),
+    (1, 3, 0.0614919, 0.7923404),
+    (0, 0, 0.0, 1.0),
+]
+CLOPPER_PEARSON = [
+    (0, 10, 0.0, 0.3084971),
+    (10, 10, 0.6915029, 1.0),
+    (5, 10, 0.1870860, 0.8129140),
+    (1, 3, 0.0084038, 0.9057007),
+    (0, 0, 0.0, 1.0),
+]
+
+
+@pytest.mark.parametrize("interval, reference", [(wilson_interval, WILSON), (clopper_pearson_interval, CLOPPER_PEARSON)])
+def test_intervals_match_reference_values(interval, reference):
+    if interval is clopper_pearson_interval:
+        pytest.importorskip("scipy")
+    survived, passengers, lower, upper = map(np.array, zip(*reference))
+    low, high = interval(survived, passengers)
+    np.testing.assert_allclose(low, lower, atol=1e-6)
+    np.testing.assert_allclose(high, upper, atol=1e-6)
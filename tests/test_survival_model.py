@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from survival_model import feature_options, feature_weights, fit_encoder, train_model
+
+
+@pytest.fixture
+def labelled(passengers):
+    # Survival follows Sex exactly, so a fitted model must be perfect
+    df = passengers(400, ["PassengerId", "Survived", "Pclass", "Sex", "Age", "Name"])
+    return df.assign(Survived=(df["Sex"] == "female").astype(np.int8))
+
+
+def test_feature_options_skip_high_cardinality_text(labelled):
+    assert feature_options(labelled) == ["Pclass", "Sex", "Age"]
+
+
+def test_encoder_refuses_high_cardinality_categories(labelled):
+    with pytest.raises(ValueError, match="Name"):
+        fit_encoder(labelled, ["Name"])
+
+
+@pytest.mark.parametrize("name, params", [
+    ("Logistic Regression", {"C": 1.0}),
+    ("Random Forest", {"n_estimators": 10, "max_depth": 3}),
+])
+def test_models_learn_the_signal(labelled, name, params):
+    pytest.importorskip("sklearn")
+    model = train_model(labelled, name, ["Sex", "Age"], params)
+    assert model["accuracy"] == 1.0
+    assert feature_weights(model).index[0].startswith("Sex=")
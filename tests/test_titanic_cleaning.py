@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from column_sketch import profile_frame
+from titanic_cleaning import run_pipeline
+
+
+def _frame(passengers, rows=891):
+    df = passengers(rows, ["Survived", "Pclass", "Age", "SibSp", "Parch", "Embarked", "Cabin"])
+    # "S" and "C" tie for the mode and "S" is seen first; Series.mode()[0] picks "C"
+    embarked = np.array(["S", "C"] * (rows // 2) + ["Q"] * (rows % 2), dtype=object)
+    embarked[[0, 1, 2, 3]] = [None, "Q", None, "Q"]
+    return df.assign(Embarked=embarked)
+
+
+def _baseline(df):
+    # The cleaning the app ran before the step pipeline
+    df_cleaned = df.copy()
+    df_cleaned["Age"] = df_cleaned["Age"].fillna(df["Age"].median())
+    df_cleaned["Embarked"] = df_cleaned["Embarked"].fillna(df["Embarked"].mode()[0])
+    df_cleaned = df_cleaned.drop(columns=["Cabin"])
+    df_cleaned["Pclass"] = df_cleaned["Pclass"].astype("category")
+    df_cleaned["Survived"] = df_cleaned["Survived"].astype("category")
+    df_cleaned["FamilySize"] = df_cleaned["SibSp"] + df_cleaned["Parch"] + 1
+    df_cleaned["IsAlone"] = (df_cleaned["FamilySize"] == 1).astype(int)
+    return df_cleaned.drop(columns=["SibSp", "Parch"])
+
+
+@pytest.mark.parametrize("stats", [
+    lambda df: None,
+    lambda df: profile_frame(df),
+    # Sketches merged over chunks, as chunked ingestion builds them
+    lambda df: profile_frame(df.iloc[300:], profile_frame(df.iloc[:300])),
+])
+def test_pipeline_matches_baseline_cleaning(passengers, stats):
+    df = _frame(passengers)
+    cleaned = run_pipeline(df, stats=stats(df))[0]
+    expected = _baseline(df)
+    assert cleaned["Embarked"].isna().sum() == 0 and (cleaned["Embarked"].iloc[[0, 2]] == "C").all()
+    pd.testing.assert_frame_equal(cleaned[expected.columns], expected, check_dtype=False)
@@ -0,0 +1,54 @@
+import http.client
+import io
+import json
+
+import pandas as pd
+
+import titanic_loader
+
+URL = "https://example.com/titanic.csv"
+
+
+class _Response(io.BytesIO):
+    # urlopen's response: a readable context manager
+    def __init__(self, data, fail=False):
+        super().__init__(data)
+        self.fail = fail
+
+    def read(self, *args):
+        if self.fail:
+            raise http.client.IncompleteRead(b"Passenger")
+        return super().read(*args)
+
+
+def test_cut_short_download_falls_back_to_the_stale_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(titanic_loader, "SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(titanic_loader.urllib.request, "urlopen", lambda url, timeout: _Response(b"PassengerId\n1\n"))
+    path, checksum, origin = titanic_loader.resolve_source(URL)
+    assert origin == "network"
+
+    monkeypatch.setattr(titanic_loader.urllib.request, "urlopen", lambda url, timeout: _Response(b"", fail=True))
+    assert titanic_loader.resolve_source(URL, refresh=True) == (path, checksum, "stale snapshot")
+    assert path.read_bytes() == b"PassengerId\n1\n"
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_offline_first_start_uses_the_bundled_snapshot(tmp_path, monkeypatch):
+    def unreachable(url, timeout):
+        raise OSError("network is unreachable")
+
+    monkeypatch.setattr(titanic_loader, "SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(titanic_loader.urllib.request, "urlopen", unreachable)
+    path, _, origin = titanic_loader.resolve_source(URL)
+    assert (path, origin) == (titanic_loader.BUNDLED_SNAPSHOT, "bundled snapshot")
+    df = pd.read_csv(path)
+    assert list(df.columns) == titanic_loader.DATASET_COLUMNS and len(df) == 891
+
+
+def test_snapshot_metadata_without_fetch_time_is_stale(tmp_path, monkeypatch):
+    monkeypatch.setattr(titanic_loader, "SNAPSHOT_DIR", tmp_path)
+    csv_path, meta_path = titanic_loader._snapshot_paths(URL)
+    csv_path.write_bytes(b"PassengerId\n1\n")
+    meta_path.write_text(json.dumps({"sha256": titanic_loader.file_checksum(csv_path)}))
+    monkeypatch.setattr(titanic_loader.urllib.request, "urlopen", lambda url, timeout: _Response(b"PassengerId\n2\n"))
+    assert titanic_loader.resolve_source(URL)[2] == "network"
@@ -0,0 +1,16 @@
+import tracemalloc
+
+import tracing
+
+
+def test_spans_do_not_start_tracemalloc_without_the_memory_flag(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_MEMORY", False)
+    tracing.start_run(True)
+    with tracing.span("outer"):
+        with tracing.span("inner"):
+            pass
+    tracing.enable(False)
+    assert not tracemalloc.is_tracing()
+    spans = tracing.run_spans()
+    assert [record["span"] for record in spans] == ["outer", "inner"]
+    assert spans[1]["parent"] == "outer" and spans[1]["process_alloc_bytes"] is None
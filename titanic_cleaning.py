@@ -0,0 +1,116 @@
+"""Cleaning pipeline for the Titanic dataset.
+
+The pipeline is a list of named steps applied to a column mapping, so only
+the columns a step touches are rebuilt and the input frame is never copied
+as a whole. Results are memoized on the content fingerprint of the input,
+which lets Streamlit reruns reuse the cleaned frame, and persisted through
+:mod:`artifact_store` so a restarted app skips the pipeline.
+"""
+
+import time
+
+import pandas as pd
+
+import artifact_store
+import dataset_store
+from titanic_loader import frame_fingerprint, register_fingerprint
+
+# Bump when the steps change so memoized results are not reused
+PIPELINE_VERSION = 2
+
+# Number of cleaned datasets kept in memory
+CACHE_SIZE = 4
+
+# Step reports per (input version, pipeline version, sketched); dropped with the input version
+_cache = dataset_store.VersionCache(CACHE_SIZE)
+
+
+def fill_median(columns, source, column):
+    columns[column] = columns[column].fillna(source[column].median())
+
+
+def fill_mode(columns, source, column):
+    columns[column] = columns[column].fillna(source[column].mode()[0])
+
+
+def drop_columns(columns, source, *names):
+    for name in names:
+        columns.pop(name, None)
+
+
+def to_category(columns, source, *names):
+    for name in names:
+        columns[name] = columns[name].astype("category")
+
+
+def add_family_features(columns, source):
+    # Compute in int64 so narrow (compacted) inputs cannot overflow, then narrow again
+    family_size = pd.to_numeric(columns["SibSp"].astype("int64") + columns["Parch"] + 1, downcast="integer")
+    columns["FamilySize"] = family_size
+    columns["IsAlone"] = (family_size == 1).astype(int)
+
+
+# Steps are (name, function, arguments) and run in order; functions are called
+# as function(columns, source, *arguments), where source is the input frame or
+# its column sketches and supports source[column].median() / .mode()
+CLEANING_STEPS = [
+    # Fill missing Age with median, Embarked with mode
+    ("Fill Age with median", fill_median, ("Age",)),
+    ("Fill Embarked with mode", fill_mode, ("Embarked",)),
+    # Drop Cabin column since it has too many missing values
+    ("Drop Cabin", drop_columns, ("Cabin",)),
+    # Convert Pclass and Survived to categorical
+    ("Categorize Pclass and Survived", to_category, ("Pclass", "Survived")),
+    # Create FamilySize and IsAlone features
+    ("Add FamilySize and IsAlone", add_family_features, ()),
+    # Drop original columns (SibSp, Parch) used to create FamilySize
+    ("Drop SibSp and Parch", drop_columns, ("SibSp", "Parch")),
+]
+
+
+def run_pipeline(df, steps=CLEANING_STEPS, stats=None):
+    """Apply ``steps`` to ``df`` and return ``(cleaned, report)``.
+
+    Fill values (median, mode) are read from ``stats`` column sketches (see
+    ``column_sketch``) when given, instead of rescanning ``df``. ``report``
+    is a DataFrame with the wall time of each step.
+    """
+    # Work on column references; untouched columns are shared with df
+    columns = {name: df[name] for name in df.columns}
+    source = df if stats is None else stats
+    report = []
+    for name, func, args in steps:
+        start = time.perf_counter()
+        func(columns, source, *args)
+        report.append({"Step": name, "Time (ms)": (time.perf_counter() - start) * 1000})
+
+    start = time.perf_counter()
+    cleaned = pd.DataFrame(columns, copy=False)
+    report.append({"Step": "Assemble frame", "Time (ms)": (time.perf_counter() - start) * 1000})
+    return cleaned, pd.DataFrame(report)
+
+
+def clean_dataset(df, stats=None):
+    """Memoized :func:`run_pipeline` keyed on the content fingerprint of ``df``.
+
+    Returns ``(cleaned, report, cached)``; the cleaned frame is a read-only
+    frame shared through :mod:`dataset_store`. On a miss the frame and step
+    report are loaded from :mod:`artifact_store` when persisted there
+    (``cached`` is then True and the report holds the original timings).
+    """
+    key = (frame_fingerprint(df), PIPELINE_VERSION, stats is not None)
+    version = f"{key[0]}:cleaned-v{PIPELINE_VERSION}" + (":sketch" if stats is not None else "")
+    cleaned, report = dataset_store.get(version), _cache.get(key)
+    if cleaned is not None and report is not None:
+        return cleaned, report, True
+
+    cleaned, report = artifact_store.load_frame(version, "frame"), artifact_store.load_frame(version, "steps")
+    cached = cleaned is not None and report is not None
+    if not cached:
+        cleaned, report = run_pipeline(df, stats=stats)
+        artifact_store.save_frame(version, "frame", cleaned)
+        artifact_store.save_frame(version, "steps", report)
+    cleaned = dataset_store.share(version, cleaned)
+    register_fingerprint(cleaned, version)
+    _cache.put(key, report)
+    return cleaned, report, cached
@@ -0,0 +1,266 @@
+"""Dataset loading for the Titanic Streamlit app.
+
+The dataset can come from a URL, a local CSV path or the snapshot bundled
+with the repository. Remote sources are mirrored into an on-disk snapshot
+(validated by TTL and SHA-256 checksum) so the app keeps working without
+network access, and parsed frames are kept in memory so Streamlit reruns do
+not re-download or re-parse the file. Parsed frames are also persisted by
+checksum in :mod:`artifact_store`, so a restarted app maps them instead of
+parsing the CSV again.
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import time
+import urllib.request
+import weakref
+from pathlib import Path
+
+import pandas as pd
+
+import artifact_store
+import dataset_store
+from column_sketch import profile_frame
+from titanic_schema import column_footprint, compact_frame, concat_compact, memory_report
+
+# Default public source of the Titanic dataset
+DEFAULT_DATA_URL = "https://raw.githubusercontent.com/datasciencedojo/datasets/master/titanic.csv"
+
+# Snapshot shipped with the repository (used when the network is unavailable)
+BUNDLED_SNAPSHOT = Path(__file__).resolve().parent / "data" / "titanic.csv"
+
+# Where downloaded snapshots are stored, and how long they stay fresh
+SNAPSHOT_DIR = Path(os.environ.get("TITANIC_SNAPSHOT_DIR", Path(__file__).resolve().parent / ".cache" / "snapshots"))
+SNAPSHOT_TTL = float(os.environ.get("TITANIC_SNAPSHOT_TTL", 24 * 60 * 60))
+
+# Seconds to wait for the remote source before falling back to a snapshot
+FETCH_TIMEOUT = float(os.environ.get("TITANIC_FETCH_TIMEOUT", 5))
+
+# Rows per chunk for streaming ingestion (0 reads the file in one go)
+STREAM_CHUNK_ROWS = int(os.environ.get("TITANIC_STREAM_CHUNK_ROWS", 0))
+
+# Columns of the Titanic CSV (the app shows them as a table skeleton while loading)
+DATASET_COLUMNS = ["PassengerId", "Survived", "Pclass", "Name", "Sex", "Age", "SibSp", "Parch", "Ticket", "Fare", "Cabin", "Embarked"]
+
+# Info of parsed datasets, keyed by the resolved source; the frames live in dataset_store
+_memory_cache = {}
+
+# Content fingerprints of frames, keyed by id() and dropped when the frame is collected
+_fingerprints = {}
+
+
+def configured_source():
+    # Source from the environment, falling back to the public URL
+    return os.environ.get("TITANIC_DATA_SOURCE", DEFAULT_DATA_URL)
+
+
+def _is_url(source):
+    return str(source).startswith(("http://", "https://"))
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _snapshot_paths(url):
+    name = hashlib.sha256(url.encode()).hexdigest()[:16]
+    return SNAPSHOT_DIR / f"{name}.csv", SNAPSHOT_DIR / f"{name}.json"
+
+
+def _read_snapshot_meta(meta_path):
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _valid_snapshot(csv_path, meta_path):
+    # A snapshot is usable if it exists and its checksum matches the metadata
+    meta = _read_snapshot_meta(meta_path)
+    if meta is None or not csv_path.exists():
+        return None
+    if file_checksum(csv_path) != meta.get("sha256"):
+        return None
+    return meta
+
+
+def _download(url, csv_path, meta_path):
+    # Download to a temporary file first so a failed transfer never replaces a good snapshot
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = csv_path.with_suffix(".part")
+    try:
+        with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response, open(tmp_path, "wb") as fh:
+            shutil.copyfileobj(response, fh)
+        checksum = file_checksum(tmp_path)
+        os.replace(tmp_path, csv_path)
+    finally:
+        # Left behind only when the transfer failed
+        tmp_path.unlink(missing_ok=True)
+    meta = {"source": url, "sha256": checksum, "fetched_at": time.time()}
+    meta_path.write_text(json.dumps(meta))
+    return meta
+
+
+def resolve_source(source=None, ttl=None, refresh=False):
+    """Return ``(path, sha256, origin)`` of a local CSV for the given source.
+
+    URLs are served from a fresh snapshot when possible, re-downloaded once
+    the snapshot is older than ``ttl`` seconds, and fall back to a stale
+    snapshot or the bundled one when the download fails.
+    """
+    source = source or configured_source()
+    ttl = SNAPSHOT_TTL if ttl is None else ttl
+
+    # Local file
+    if not _is_url(source):
+        path = Path(source).expanduser()
+        return path, file_checksum(path), "local"
+
+    csv_path, meta_path = _snapshot_paths(source)
+    meta = _valid_snapshot(csv_path, meta_path)
+
+    # Fresh snapshot, no network needed
+    # Hand-written or older metadata without a fetch time counts as stale
+    if meta is not None and not refresh and time.time() - meta.get("fetched_at", 0) < ttl:
+        return csv_path, meta["sha256"], "snapshot"
+
+    try:
+        meta = _download(source, csv_path, meta_path)
+        return csv_path, meta["sha256"], "network"
+    except (OSError, http.client.IncompleteRead) as error:
+        # Network unavailable or the transfer was cut short: use a stale snapshot, then the bundled copy
+        if meta is not None:
+            return csv_path, meta["sha256"], "stale snapshot"
+        if BUNDLED_SNAPSHOT.exists():
+            return BUNDLED_SNAPSHOT, file_checksum(BUNDLED_SNAPSHOT), "bundled snapshot"
+        raise OSError(f"{source} is unreachable and neither a downloaded snapshot nor {BUNDLED_SNAPSHOT} exists "
+                      "(run `python titanic_loader.py --bundle` once while online to create it)") from error
+
+
+def register_fingerprint(df, fingerprint):
+    # Remember a known content hash for df (e.g. the checksum of its source file)
+    key = id(df)
+    _fingerprints[key] = fingerprint
+    weakref.finalize(df, _fingerprints.pop, key, None)
+    return fingerprint
+
+
+def frame_fingerprint(df):
+    """Content hash of a DataFrame, computed once per frame object."""
+    fingerprint = _fingerprints.get(id(df))
+    if fingerprint is None:
+        digest = hashlib.sha256()
+        digest.update(repr([(c, str(t)) for c, t in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        fingerprint = register_fingerprint(df, digest.hexdigest())
+    return fingerprint
+
+
+def read_dataset(path, chunk_rows=None):
+    """Parse a CSV into ``(df, memory_report, sketches)``.
+
+    With ``chunk_rows`` the file is read in chunks: each chunk updates the
+    column sketches (see ``column_sketch``) and is compacted before the next
+    one is parsed, so the raw parse never holds more than one chunk.
+    """
+    chunk_rows = STREAM_CHUNK_ROWS if chunk_rows is None else chunk_rows
+    if not chunk_rows:
+        df, memory = compact_frame(pd.read_csv(path))
+        return df, memory, profile_frame(df)
+
+    parts, footprint, sketches = [], {}, None
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            for name, (dtype, size) in column_footprint(chunk).items():
+                first_dtype, total = footprint.get(name, (dtype, 0))
+                footprint[name] = (first_dtype, total + size)
+            part = compact_frame(chunk)[0]
+            sketches = profile_frame(part, sketches)
+            parts.append(part)
+    df = concat_compact(parts)
+    return df, memory_report(footprint, df), sketches
+
+
+def _read_parsed(path, checksum):
+    # read_dataset through the artifact store, keyed by the source checksum
+    df, memory = artifact_store.load_frame(checksum, "frame"), artifact_store.load_frame(checksum, "memory")
+    stats = artifact_store.load_object(checksum, "stats")
+    if df is None or memory is None or stats is None:
+        df, memory, stats = read_dataset(path)
+        artifact_store.save_frame(checksum, "frame", df)
+        artifact_store.save_frame(checksum, "memory", memory)
+        artifact_store.save_object(checksum, "stats", stats)
+    return df, memory, stats
+
+
+def load_dataset(source=None, ttl=None, refresh=False):
+    """Load the Titanic dataset, returning ``(df, info)``.
+
+    The parsed frame is kept in :mod:`dataset_store`, shared by all sessions
+    and reused until the snapshot expires or the last session holding it
+    ends, so repeated calls on Streamlit reruns are cheap. Column
+    dtypes are compacted by :func:`titanic_schema.compact_frame`;
+    ``info["memory"]`` holds its per-column report and ``info["stats"]`` the
+    column sketches gathered while reading (see :func:`read_dataset`). The
+    returned frame is a read-only ``dataset_store.ReadOnlyFrame``.
+    """
+    source = source or configured_source()
+    ttl = SNAPSHOT_TTL if ttl is None else ttl
+
+    cached = _memory_cache.get(source)
+    # The shared frame is gone once every session holding it has ended
+    df = dataset_store.get(cached["sha256"]) if cached is not None else None
+    if df is not None and not refresh and time.time() - cached["loaded_at"] < ttl:
+        return df, cached
+
+    path, checksum, origin = resolve_source(source, ttl=ttl, refresh=refresh)
+
+    # Reuse the parsed frame if the file content has not changed
+    if df is not None and cached["sha256"] == checksum:
+        cached.update(loaded_at=time.time(), origin=origin)
+        return df, cached
+
+    df, memory, stats = _read_parsed(path, checksum)
+    df = dataset_store.share(checksum, df)
+    register_fingerprint(df, checksum)
+    info = {"source": source, "path": str(path), "sha256": checksum, "origin": origin, "loaded_at": time.time(),
+            "memory": memory, "stats": stats}
+    _memory_cache[source] = info
+    return df, info
+
+
+def bundle_snapshot(source=None):
+    """Copy the CSV of ``source`` to :data:`BUNDLED_SNAPSHOT`, checking it has the Titanic columns."""
+    path, _, origin = resolve_source(source, refresh=True)
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    if columns != DATASET_COLUMNS:
+        raise ValueError(f"{path} does not have the Titanic columns: {columns}")
+    if Path(path).resolve() != BUNDLED_SNAPSHOT:
+        BUNDLED_SNAPSHOT.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, BUNDLED_SNAPSHOT)
+    return BUNDLED_SNAPSHOT, origin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download the Titanic dataset into the snapshot cache.")
+    parser.add_argument("source", nargs="?", help="URL or CSV path (default: TITANIC_DATA_SOURCE or the public URL)")
+    parser.add_argument("--bundle", action="store_true", help=f"also write the CSV to {BUNDLED_SNAPSHOT} for offline starts")
+    args = parser.parse_args(argv)
+    if args.bundle:
+        path, origin = bundle_snapshot(args.source)
+    else:
+        path, _, origin = resolve_source(args.source, refresh=True)
+    # Parse one column so quoted multi-line fields count as one row
+    print(f"{path} ({origin}, {len(pd.read_csv(path, usecols=[0])):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compact column dtypes for loaded datasets.
+
+``compact_frame`` maps low-cardinality strings to ``category``, downcasts
+numeric columns to the smallest width that holds their values exactly and
+stores the remaining (high-cardinality) strings as Arrow-backed strings when
+pyarrow is installed. It also reports the memory used by each column before
+and after the conversion.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    STRING_DTYPE = None
+
+# String columns with at most this share of distinct values become categories
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _is_string(series):
+    return series.dtype == "object" or str(series.dtype) in ("str", "string")
+
+
+def compact_column(series):
+    """Return ``series`` converted to the most compact dtype that keeps its values."""
+    if _is_string(series):
+        non_null = series.count()
+        if non_null and series.nunique() <= CATEGORY_MAX_RATIO * non_null:
+            return series.astype("category")
+        if STRING_DTYPE is not None:
+            return series.astype(STRING_DTYPE)
+        return series
+
+    if pd.api.types.is_bool_dtype(series):
+        return series
+
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+
+    if pd.api.types.is_float_dtype(series):
+        # float32 only when every value survives the round trip
+        narrow = series.astype(np.float32)
+        if np.array_equal(narrow.astype(series.dtype), series, equal_nan=True):
+            return narrow
+    return series
+
+
+def compact_frame(df):
+    """Return ``(compact, report)`` for ``df``.
+
+    ``report`` is a DataFrame with the dtype and deep memory usage of each
+    column before and after compaction, plus a total row.
+    """
+    columns = {name: compact_column(df[name]) for name in df.columns}
+    compact = pd.DataFrame(columns, index=df.index, copy=False)
+    return compact, memory_report(column_footprint(df), compact)
+
+
+def column_footprint(df):
+    # {column: (dtype, deep bytes)}
+    return {name: (str(df[name].dtype), int(df[name].memory_usage(index=False, deep=True))) for name in df.columns}
+
+
+def memory_report(before, compact):
+    """Per-column report comparing a :func:`column_footprint` with the compacted frame."""
+    rows = []
+    for name, (dtype, size) in before.items():
+        after = compact[name]
+        rows.append({
+            "Column": name,
+            "Before": dtype,
+            "After": str(after.dtype),
+            "Before (bytes)": size,
+            "After (bytes)": int(after.memory_usage(index=False, deep=True)),
+        })
+
+    report = pd.DataFrame(rows)
+    total = {"Column": "Total", "Before": "", "After": "",
+             "Before (bytes)": int(report["Before (bytes)"].sum()), "After (bytes)": int(report["After (bytes)"].sum())}
+    report = pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+    report["Saved %"] = (1 - report["After (bytes)"] / report["Before (bytes)"].where(report["Before (bytes)"] > 0)) * 100
+    return report
+
+
+def _as_strings(part):
+    if STRING_DTYPE is not None:
+        return part.astype(STRING_DTYPE)
+    return part.astype(object)
+
+
+def _missing_categorical(piece, categories):
+    # An all-missing chunk as a categorical whose categories have the dtype of the others
+    return pd.Series(pd.Categorical.from_codes(np.full(len(piece), -1), dtype=pd.CategoricalDtype(categories)))
+
+
+def concat_compact(parts):
+    """Concatenate chunks compacted separately, reconciling their column dtypes.
+
+    A column that became ``category`` in every chunk is merged with
+    ``union_categoricals``; one that was categorical in some chunks and a
+    string in others is stored as strings. Numeric columns take the widest
+    chunk dtype. Chunks in which a column is entirely missing parse it as
+    float whatever it holds, so they do not decide its type.
+    """
+    columns = {}
+    for name in parts[0].columns:
+        pieces = [part[name] for part in parts]
+        typed = [piece for piece in pieces if piece.notna().any()] or pieces
+        if all(isinstance(piece.dtype, pd.CategoricalDtype) for piece in typed):
+            categories = typed[0].cat.categories[:0]
+            pieces = [piece if isinstance(piece.dtype, pd.CategoricalDtype) else _missing_categorical(piece, categories) for piece in pieces]
+            columns[name] = pd.Series(union_categoricals(pieces, ignore_order=True), name=name)
+        elif any(isinstance(piece.dtype, pd.CategoricalDtype) or _is_string(piece) for piece in typed):
+            columns[name] = pd.concat([_as_strings(piece) for piece in pieces], ignore_index=True)
+        else:
+            columns[name] = pd.concat(pieces, ignore_index=True)
+    return pd.DataFrame(columns, copy=False)
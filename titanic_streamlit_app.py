@@ -1,21 +1,97 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+
+import chart_backend
+import charts
+import dataset_store
+import tracing
+import vega_charts
+from chart_backend import show_chart
+from chart_insights import chart_insights
+from chart_render import render_stats
+from cross_filter import CATEGORY_COLUMNS, RANGE_COLUMNS, category_options, filter_index, filtered_view, range_bounds
+from count_cube import MAX_LEVELS, OTHER, TOP_K, count_cube, top_crosstab, value_counts
+from density import scatter_density, use_density
+from rerun_scope import count_script_run, section
+from survival_model import FEATURES, MODELS, feature_options, feature_weights, fit_model, score_csv
+from survival import CONFIDENCE, INTERVAL_METHODS, survival_rates
+from table_view import show_table
+from column_profile import column_profile
+from column_sketch import describe_sketches, missing_table
+from feature_matrix import column, correlation, feature_matrix
+from titanic_cleaning import clean_dataset
+from titanic_loader import DATASET_COLUMNS, frame_fingerprint, load_dataset
 
 # Set Streamlit page configuration
 st.set_page_config(page_title="Explore Titantic dataset with Streamlit", layout="wide")
+count_script_run()
+
+# Opt-in per-stage timings (sidebar panel and JSON trace log)
+tracing.start_run(st.sidebar.toggle("Performance trace", value=tracing.TRACE_DEFAULT, key="trace_enabled"))
 
 # Title and subtitle
 st.title("Explore Titanic Dataset with Streamlit")
 st.subheader("This Streamlit app explores the Titanic dataset to uncover survival insights and visualize passenger data")
 
-# Load Titanic dataset from URL
-data_url = "https://raw.githubusercontent.com/datasciencedojo/datasets/master/titanic.csv"
-df = pd.read_csv(data_url)
-
-# Displays the full dataframe
-st.write(df)
+# Skeleton of the raw table, painted before the dataset is loaded and replaced by the table
+source_slot = st.empty()
+raw_table_slot = st.empty()
+raw_table_slot.dataframe(pd.DataFrame(columns=DATASET_COLUMNS), hide_index=True)
+
+# Load Titanic dataset (URL, local path or snapshot; cached between reruns)
+try:
+    with tracing.span("load dataset"), st.spinner("Loading the Titanic dataset..."):
+        df, data_info = load_dataset()
+except OSError as exc:
+    st.error(f"Could not load the Titanic dataset and no local snapshot is available: {exc}")
+    st.stop()
+
+source_slot.caption(f"Data source: {data_info['source']} (loaded from {data_info['origin']})")
+
+
+# Displays the dataframe one page at a time (paging reruns only the table)
+@section("Raw table")
+def raw_table(df):
+    show_table(df, key="raw_table")
+
+
+with raw_table_slot.container():
+    raw_table(df)
+
+# Dataset version used to key cached charts
+data_version = frame_fingerprint(df)
+
+# Hold the shared frames this session uses; they are released when the session ends.
+# Versions from the previous run stay held until the cleaned version and the filtered views are known below.
+if "_dataset_lease" not in st.session_state:
+    st.session_state["_dataset_lease"] = dataset_store.SessionLease()
+dataset_lease = st.session_state["_dataset_lease"]
+dataset_lease.add([data_version])
+
+# Sidebar filters; every chart, insight and survival plot uses the matching rows
+with st.sidebar.expander("Filters", expanded=True), tracing.span("filters", dataset="raw"):
+    data_filters = filter_index(df)
+    filter_selections = {}
+    for c in CATEGORY_COLUMNS:
+        options = category_options(data_filters, c)
+        if options:
+            filter_selections[c] = st.multiselect(c, options, key=f"filter_{c}")
+    filter_ranges = {}
+    for c in RANGE_COLUMNS:
+        bounds = range_bounds(data_filters, c)
+        if bounds is not None:
+            filter_ranges[c] = st.slider(c, bounds[0], bounds[1], bounds, key=f"filter_{c}")
+    df_view, view_version = filtered_view(df, filter_selections, filter_ranges)
+    dataset_lease.add([view_version])
+    st.caption(f"{len(df_view):,} of {len(df):,} passengers match. Narrowing a range drops rows with a missing value in that column.")
+
+# Category counts and crosstabs shared by the Pie, Bar, Histogram and Heatmap charts
+with tracing.span("count cube", dataset="raw"):
+    view_counts = count_cube(df_view)
+with tracing.span("column profile", dataset="raw"):
+    # The load-time sketches describe the unfiltered dataset only
+    view_profile = column_profile(df_view, data_info["stats"] if df_view is df else None)
 
 # Dataset overview
 st.subheader("Dataset Overview: Titanic Passenger Data")
@@ -64,260 +140,221 @@ st.write("The dataset has {} rows and {} columns.".format(df.shape[0], df.shape[
 
 # Data types overview
 st.subheader("Data Types Overview to help distinguish between numerical features, categorical identifiers, and the target label:")
-st.write(df.dtypes.value_counts())
-st.write("There are 2 numerical features (float64), 5 categorical features (object), and 1 target label (int64).")
-
-# Summary statistics
+st.write(df.dtypes.astype(str).value_counts())
+categorical_count = len(charts.categorical_columns(df))
+st.write(f"There are {df.shape[1] - categorical_count} numerical columns (including the Survived target label) and {categorical_count} categorical or text columns.")
+
+# Memory used by each column before and after dtype compaction
+with st.expander("Memory usage by column"):
+    memory_report = data_info["memory"]
+    total = memory_report.iloc[-1]
+    st.write(f"Compact dtypes reduce the dataset from **{total['Before (bytes)'] / 1e6:.2f} MB** to **{total['After (bytes)'] / 1e6:.2f} MB**.")
+    st.dataframe(memory_report, hide_index=True)
+
+# Summary statistics (from the column sketches gathered while loading)
 st.write("Summary statistics for all columns transposed:")
-st.write(df.describe(include='all').T)
-
-# Data Visualization
-st.subheader("Graphs to visualize data distributions and relationships:")
-st.header("Data Visualization")
-
-# Two dropdowns for selecting chart type and columns
-# Create two columns for layout
-col1, col2 = st.columns(2)
-
-# Chart type selection
-chart_type = col1.selectbox(
-    "Select Chart Type",
-    [ "Pie Chart",
-     "Bar Chart",
-     "Histogram",
-     "Scatter Plot (Simple)",
-     "Scatter Plot (Complex)",
-     "Heatmap (Categorical)",
-     "Heatmap (Numerical Correlation)"
-    ]
-)
-
-# Dynamic column selection based on chart type
-with col2:
-    # Depending on chart type, show relevant dropdowns
-    if chart_type in ["Pie Chart", "Histogram"]:
-        category = st.selectbox("Select Column", df.columns, key="cat_select")
-    
-    # Additional selections for other chart types
-    elif chart_type == "Bar Chart":
-        bar_x = st.selectbox("X-axis Category", df.columns, key="bar_x")
-        bar_hue = st.selectbox("Group By", df.columns, key="bar_hue")
-    
-    # Scatter Plot (Simple)
-    elif chart_type == "Scatter Plot (Simple)":
-        x_col = st.selectbox("X-axis", df.columns, key="simple_x")
-        y_col = st.selectbox("Y-axis", df.columns, key="simple_y")
-    
-    # Scatter Plot (Complex)
-    elif chart_type == "Scatter Plot (Complex)":
-        x_col = st.selectbox("X-axis", df.columns, key="complex_x")
-        y_col = st.selectbox("Y-axis", df.columns, key="complex_y")
-        hue_col = st.selectbox("Color By", df.columns, key="complex_hue")
-    
-    # Heatmap (Categorical)
-    elif chart_type == "Heatmap (Categorical)":
-        categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-        categorical_cols += ["Pclass", "Survived", "Embarked", "Sex"]
-
-        heat_x = st.selectbox("Heatmap X-axis", categorical_cols, index=categorical_cols.index("Pclass"), key="cat_heat_x")
-        heat_y = st.selectbox("Heatmap Y-axis", categorical_cols, index=categorical_cols.index("Survived"), key="cat_heat_y")
-    
-    # Heatmap (Numerical Correlation)
-    elif chart_type == "Heatmap (Numerical Correlation)":
-        st.write("Shows correlation between numerical features.")
-        # No dropdowns needed
-        pass
-
-# Pie Chart
-if chart_type == "Pie Chart":
-    fig, ax = plt.subplots(figsize=(3, 3))
-    
-    # Create pie chart
-    df[category].value_counts().plot(
-        kind="pie",
-        autopct="%1.1f%%",
-        ax=ax,
-        startangle=90,
-        textprops={"fontsize": 8}
-    )
-    ax.set_ylabel("")
-    ax.set_title(f"{category} Distribution", fontsize=12)
-    st.pyplot(fig)
-
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    top_value = df[category].value_counts().idxmax()
-    top_count = df[category].value_counts().max()
-
-    st.write(f"""
-    • The most common category in **{category}** is **{top_value}** with **{top_count} passengers**.  
-    • This distribution helps identify dominant groups in the dataset.  
-    """)
+with tracing.span("describe"):
+    st.write(describe_sketches(data_info["stats"]))
+st.caption("Statistics named in the estimated column come from single-pass sketches of large columns and are approximate.")
 
-# Bar Chart
-elif chart_type == "Bar Chart":
-    fig, ax = plt.subplots(figsize=(5, 3))
-    sns.countplot(data=df, x=bar_x, hue=bar_hue, ax=ax)
-    ax.set_title(f"{bar_x} by {bar_hue}")
-    st.pyplot(fig)
+# Missing values before cleaning
+st.subheader("Missing Values Overview (Before Cleaning)")
+missing_df = missing_table(data_info["stats"])
+st.dataframe(missing_df[missing_df["Missing Count"] > 0])
 
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    largest_group = df.groupby([bar_x, bar_hue]).size().idxmax()
-    largest_count = df.groupby([bar_x, bar_hue]).size().max()
-
-    st.write(f"""
-    • The largest group is **{largest_group}** with **{largest_count} passengers**.  
-    • This chart highlights how **{bar_hue}** varies across **{bar_x}**.  
-    """)
-
-# Histogram
-elif chart_type == "Histogram":
-    fig, ax = plt.subplots(figsize=(4, 3))
-    
-    # Checks if the column is categorical or numerical
-    if df[category].dtype == "object":
-        # Categorical histogram
-        df[category].value_counts().plot(kind="bar", ax=ax, color="purple")
-        ax.set_title(f"{category} Frequency")
-    else:
-        # Numerical histogram
-        ax.hist(df[category].dropna(), bins=20, color="skyblue", edgecolor="black")
-        ax.set_title(f"Histogram of {category}")
-    ax.set_xlabel(category)
-    ax.set_ylabel("Count")
-    st.pyplot(fig)
-
-    # Provide insights
+# Insight sentences under a chart (the ones the static report shows) and optional reading notes
+def show_insights(chart, columns, result, notes=()):
     st.subheader("Insights / Analysis")
+    st.write("\n".join(f"- {line}" for line in chart_insights(chart, columns, result) + list(notes)))
+
+
+# Pie and Histogram start on the first low-cardinality categorical column (Sex) rather than
+# the first column (PassengerId), which would draw one slice per passenger
+def category_index(df, profile):
+    columns = list(df.columns)
+    low = [c for c in columns if profile[c]["unique"] <= MAX_LEVELS]
+    default = next((c for c in low if profile[c]["dtype_class"] == "categorical"), low[0] if low else columns[0])
+    return columns.index(default)
+
+
+# Data Visualization (reruns on its own when a chart selection changes)
+@section("Data Visualization")
+def raw_visualizations(df, data_version, data_counts, data_profile):
+    st.subheader("Graphs to visualize data distributions and relationships:")
+    st.header("Data Visualization")
+    if df.empty:
+        st.info("No passengers match the current filters.")
+        return
+
+
+    # Two dropdowns for selecting chart type and columns
+    # Create two columns for layout
+    col1, col2 = st.columns(2)
+
+    # Chart type selection
+    chart_type = col1.selectbox(
+        "Select Chart Type",
+        [ "Pie Chart",
+         "Bar Chart",
+         "Histogram",
+         "Scatter Plot (Simple)",
+         "Scatter Plot (Complex)",
+         "Heatmap (Categorical)",
+         "Heatmap (Numerical Correlation)"
+        ],
+        key="raw_chart_type",
+    )
 
-    if df[category].dtype == "object":
-        most_common = df[category].value_counts().idxmax()
-        st.write(f"""
-        • The most frequent category in **{category}** is **{most_common}**.  
-        • This helps identify dominant categorical groups.  
-        """)
-    else:
-        mean_val = df[category].mean()
-        st.write(f"""
-        • The average value of **{category}** is **{mean_val:.2f}**.  
-        • The histogram shows how values are distributed around this mean.  
-        """)
-
-# Simple Scatter
-elif chart_type == "Scatter Plot (Simple)":
-    fig, ax = plt.subplots(figsize=(4, 3))
-
-    # Convert categorical to numeric for scatter
-    df_numeric = df.copy()
-    for col in df_numeric.columns:
-        if df_numeric[col].dtype == "object":
-            df_numeric[col] = df_numeric[col].astype("category").cat.codes
-    ax.scatter(df_numeric[x_col], df_numeric[y_col], alpha=0.6)
-    ax.set_xlabel(x_col)
-    ax.set_ylabel(y_col)
-    ax.set_title(f"{x_col} vs {y_col}")
-    st.pyplot(fig)
-
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    corr_val = df_numeric[[x_col, y_col]].corr().iloc[0,1]
-
-    st.write(f"""
-    • The correlation between **{x_col}** and **{y_col}** is **{corr_val:.2f}**.  
-    • This indicates the strength and direction of their relationship.  
-    """)
-
-
-# Complex Scatter
-elif chart_type == "Scatter Plot (Complex)":
-    fig, ax = plt.subplots(figsize=(5, 4))
-    sns.scatterplot(data=df, x=x_col, y=y_col, hue=hue_col, ax=ax)
-    ax.set_title(f"{x_col} vs {y_col} colored by {hue_col}")
-    st.pyplot(fig)
-
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    st.write(f"""
-    • This chart shows how **{y_col}** varies with **{x_col}** across different **{hue_col}** groups.  
-    • Look for clustering or separation between colors to identify group differences.  
-    """)
-
-
-# Categorical Heatmap
-elif chart_type == "Heatmap (Categorical)":    
-    df_clean = df[[heat_x, heat_y]].dropna()
-    heatmap_data = df_clean.pivot_table(index=heat_y, columns=heat_x, aggfunc="size", fill_value=0)
-    
-    # Warn if too many categories
-    if heatmap_data.shape[0] > 50 or heatmap_data.shape[1] > 50:
-        st.warning("This heatmap has too many categories and may take a long time to render.")
-
-    # Check if heatmap_data is empty
-    if heatmap_data.empty:
-        st.write("No data available for the selected combination.")
-    else:
-        fig, ax = plt.subplots(figsize=(5, 3))
-        sns.heatmap(heatmap_data, annot=True, cmap="Blues", fmt="d", ax=ax)
-        ax.set_title(f"Heatmap: {heat_y} vs {heat_x}")
-        st.pyplot(fig)
-
-        # Provide insights
-        st.subheader("Insights / Analysis")
-        max_cell = heatmap_data.values.max()
-        max_loc = list(zip(*divmod(heatmap_data.values.argmax(), heatmap_data.shape)))
-
-        st.write(f"""
-        • The highest count is **{max_cell}**, indicating the strongest category combination.  
-        • Darker cells represent larger passenger groups.  
-        • This heatmap highlights how **{heat_x}** and **{heat_y}** interact.  
-        """)
-
-# Numerical Correlation Heatmap
-elif chart_type == "Heatmap (Numerical Correlation)":
-    numeric_df = df.select_dtypes(include=["int64", "float64"])
-    corr = numeric_df.corr()
-    
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.heatmap(corr, annot=True, cmap="coolwarm", linewidths=0.5, ax=ax)
-    ax.set_title("Numerical Correlation Heatmap")
-    st.pyplot(fig)
-
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    surv_corr = corr['Survived'].sort_values(ascending=False)
-
-    st.write(f"""
-    • The strongest positive correlation with survival is **{surv_corr.index[1]} ({surv_corr.iloc[1]:.2f})**.  
-    • The strongest negative correlation with survival is **{surv_corr.index[-1]} ({surv_corr.iloc[-1]:.2f})**.  
-    • This helps identify which numeric features matter most.  
-    """)
+    # Dynamic column selection based on chart type
+    with col2:
+        # Depending on chart type, show relevant dropdowns
+        if chart_type in ["Pie Chart", "Histogram"]:
+            category = st.selectbox("Select Column", df.columns, index=category_index(df, data_profile), key="raw_category")
+
+        # Additional selections for other chart types
+        elif chart_type == "Bar Chart":
+            bar_x = st.selectbox("X-axis Category", df.columns, key="raw_bar_x")
+            bar_hue = st.selectbox("Group By", df.columns, key="raw_bar_hue")
+
+        # Scatter Plot (Simple)
+        elif chart_type == "Scatter Plot (Simple)":
+            x_col = st.selectbox("X-axis", df.columns, key="raw_simple_x")
+            y_col = st.selectbox("Y-axis", df.columns, key="raw_simple_y")
+
+        # Scatter Plot (Complex)
+        elif chart_type == "Scatter Plot (Complex)":
+            x_col = st.selectbox("X-axis", df.columns, key="raw_complex_x")
+            y_col = st.selectbox("Y-axis", df.columns, key="raw_complex_y")
+            hue_col = st.selectbox("Color By", df.columns, key="raw_complex_hue")
+
+        # Heatmap (Categorical)
+        elif chart_type == "Heatmap (Categorical)":
+            categorical_cols = charts.categorical_columns(df)
+            categorical_cols += ["Pclass", "Survived", "Embarked", "Sex"]
+
+            heat_x = st.selectbox("Heatmap X-axis", categorical_cols, index=categorical_cols.index("Pclass"), key="raw_cat_heat_x")
+            heat_y = st.selectbox("Heatmap Y-axis", categorical_cols, index=categorical_cols.index("Survived"), key="raw_cat_heat_y")
+
+        # Heatmap (Numerical Correlation)
+        elif chart_type == "Heatmap (Numerical Correlation)":
+            st.write("Shows correlation between numerical features.")
+            # No dropdowns needed
+            pass
+
+    with tracing.span(f"chart: {chart_type}", section="raw"):
+        # Pie Chart
+        if chart_type == "Pie Chart":
+            # Create pie chart
+            counts = value_counts(data_counts, category)
+            show_chart(data_version, chart_type, [category], lambda ax: charts.draw_pie(ax, counts, category), (3, 3), lambda: vega_charts.pie(counts, category))
+
+            # Provide insights
+            show_insights(chart_type, [category], counts, ["This distribution helps identify dominant groups in the dataset."])
+
+        # Bar Chart
+        elif chart_type == "Bar Chart":
+            bar_table = top_crosstab(data_counts, bar_x, bar_hue)
+            if OTHER in bar_table.index or OTHER in bar_table.columns:
+                st.caption(f"Each axis shows its {TOP_K} most frequent values; the rest are grouped as \"{OTHER}\".")
+            show_chart(data_version, chart_type, [bar_x, bar_hue], lambda ax: charts.draw_bar(ax, bar_table, bar_x, bar_hue), (5, 3), lambda: vega_charts.bar(bar_table, bar_x, bar_hue))
+
+            # Provide insights
+            show_insights(chart_type, [bar_x, bar_hue], bar_table)
+
+        # Histogram
+        elif chart_type == "Histogram":
+            categorical = data_profile[category]["dtype_class"] == "categorical"
+            counts = value_counts(data_counts, category) if categorical else None
+            show_chart(data_version, chart_type, [category], lambda ax: charts.draw_histogram(ax, df, category, counts), (4, 3), lambda: vega_charts.histogram(df[category], category, counts))
+
+            # Provide insights
+            show_insights(chart_type, [category], data_profile[category], [
+                "This helps identify dominant categorical groups." if categorical else "The histogram shows how values are distributed around this mean."])
+
+        # Simple Scatter
+        elif chart_type == "Scatter Plot (Simple)":
+            # Large datasets are drawn as a binned density image instead of one point per row
+            if use_density(df):
+                density = scatter_density(df, x_col, y_col)
+                show_chart(data_version, chart_type, [x_col, y_col, "density"], lambda ax: charts.draw_density(ax, density, x_col, y_col), (4, 3), lambda: vega_charts.density(density, x_col, y_col))
+                corr_val = density["corr"] if density["rows"] > 1 else None
+            else:
+                # Categorical columns are plotted by their category codes
+                matrix = feature_matrix(df)
+                x, y = column(matrix, x_col), column(matrix, y_col)
+                show_chart(data_version, chart_type, [x_col, y_col], lambda ax: charts.draw_simple_scatter(ax, x, y, x_col, y_col), (4, 3), lambda: vega_charts.scatter(x, y, x_col, y_col))
+                corr_val = correlation(matrix).at[x_col, y_col] if np.count_nonzero(np.isfinite(x) & np.isfinite(y)) > 1 else None
+
+            # Provide insights
+            show_insights(chart_type, [x_col, y_col], corr_val, ["This indicates the strength and direction of their relationship."] if corr_val is not None else [])
+
+
+        # Complex Scatter
+        elif chart_type == "Scatter Plot (Complex)":
+            if use_density(df):
+                density = scatter_density(df, x_col, y_col, hue_col)
+                show_chart(data_version, chart_type, [x_col, y_col, hue_col, "density"], lambda ax: charts.draw_density(ax, density, x_col, y_col, hue_col), (5, 4), lambda: vega_charts.density(density, x_col, y_col, hue_col))
+                st.caption(f"{len(df):,} rows: showing binned density (color = most common {hue_col} group per cell).")
+            else:
+                show_chart(data_version, chart_type, [x_col, y_col, hue_col], lambda ax: charts.draw_complex_scatter(ax, df, x_col, y_col, hue_col), (5, 4), lambda: vega_charts.scatter(df[x_col], df[y_col], x_col, y_col, df[hue_col], hue_col))
+
+            # Provide insights
+            show_insights(chart_type, [x_col, y_col, hue_col], None, ["Look for clustering or separation between colors to identify group differences."])
+
+
+        # Categorical Heatmap
+        elif chart_type == "Heatmap (Categorical)":    
+            heatmap_data = top_crosstab(data_counts, heat_y, heat_x)
+
+            # Rare categories are folded into "Other" so the table stays small
+            if OTHER in heatmap_data.index or OTHER in heatmap_data.columns:
+                st.caption(f"Each axis shows its {TOP_K} most frequent values; the rest are grouped as \"{OTHER}\".")
+
+            # Check if heatmap_data is empty
+            if heatmap_data.empty:
+                st.write("No data available for the selected combination.")
+            else:
+                show_chart(data_version, chart_type, [heat_x, heat_y], lambda ax: charts.draw_count_heatmap(ax, heatmap_data, f"Heatmap: {heat_y} vs {heat_x}"), (5, 3), lambda: vega_charts.count_heatmap(heatmap_data, f"Heatmap: {heat_y} vs {heat_x}"))
+
+                # Provide insights
+                show_insights(chart_type, [heat_x, heat_y], heatmap_data, [
+                    "Darker cells represent larger passenger groups.",
+                    f"This heatmap highlights how **{heat_x}** and **{heat_y}** interact."])
+
+        # Numerical Correlation Heatmap
+        elif chart_type == "Heatmap (Numerical Correlation)":
+            matrix = feature_matrix(df)
+            corr = correlation(matrix, matrix["numeric"])
+
+            show_chart(data_version, chart_type, [], lambda ax: charts.draw_correlation_heatmap(ax, corr), (6, 4), lambda: vega_charts.correlation_heatmap(corr))
+
+            # Provide insights
+            show_insights(chart_type, [], corr, ["This helps identify which numeric features matter most."])
+
+
+raw_visualizations(df_view, view_version, view_counts, view_profile)
 
 # Data Cleaning
 st.header("Data Cleaning")
 
-# Create a copy of the original dataframe to clean
-df_cleaned = df.copy()
-
-# Handle missing values
-
-# Fill missing Age with median, Embarked with mode
-df_cleaned['Age'].fillna(df['Age'].median(), inplace=True)
-df_cleaned['Embarked'].fillna(df['Embarked'].mode()[0], inplace=True)
-
-# Drop Cabin column since it has too many missing values
-df_cleaned.drop(columns=['Cabin'], inplace=True)
-
-# Convert Pclass and Survived to categorical
-df_cleaned['Pclass'] = df_cleaned['Pclass'].astype('category')
-df_cleaned['Survived'] = df_cleaned['Survived'].astype('category')
-
-# Create FamilySize and IsAlone features
-df_cleaned['FamilySize'] = df_cleaned['SibSp'] + df_cleaned['Parch'] + 1
-df_cleaned['IsAlone'] = (df_cleaned['FamilySize'] == 1).astype(int)
-
-# Drop original columns (SibSp, Parch) used to create FamilySize
-df_cleaned.drop(columns=['SibSp', 'Parch'], inplace=True)
+# Run the cleaning pipeline (memoized on the dataset fingerprint)
+with tracing.span("cleaning"):
+    df_cleaned, cleaning_report, cleaning_cached = clean_dataset(df, data_info["stats"])
+    cleaned_version = frame_fingerprint(df_cleaned)
+dataset_lease.add([cleaned_version])
+with tracing.span("filters", dataset="cleaned"):
+    cleaned_view, cleaned_view_version = filtered_view(df_cleaned, filter_selections, filter_ranges)
+# Release the versions and filtered views of the previous run that are no longer used
+dataset_lease.hold([data_version, view_version, cleaned_version, cleaned_view_version])
+with tracing.span("count cube", dataset="cleaned"):
+    cleaned_view_counts = count_cube(cleaned_view)
+with tracing.span("column profile", dataset="cleaned"):
+    cleaned_view_profile = column_profile(cleaned_view)
+
+# Show the cleaning steps and their cost
+with st.expander("Cleaning steps"):
+    st.write("Reused the cleaned dataset from cache." if cleaning_cached else "Cleaned dataset computed on this run.")
+    st.dataframe(cleaning_report, hide_index=True)
 
 # Display cleaned data preview
 st.write("Preview of cleaned data:")
@@ -333,249 +370,301 @@ missing_df_clean = pd.DataFrame({
 })
 st.dataframe(missing_df_clean[missing_df_clean["Missing Count"] > 0])
 
-# Display the full cleaned dataframe
+# Display the full cleaned dataframe one page at a time
 st.subheader("Full Cleaned Dataset:")
-st.write(df_cleaned)
-
-# Post-cleaning EDA & Visualizations
-st.header("4. Visualizations & Insights (Using Cleaned Data)")
-
-st.subheader("Graphs to visualize data distributions and relationships:")
-st.caption("All visualizations below use the cleaned dataset.")
-
-# Two dropdowns for selecting chart type and columns (cleaned data)
-col1, col2 = st.columns(2)
-
-chart_type = col1.selectbox(
-    "Select Chart Type",
-    [
-        "Pie Chart",
-        "Bar Chart",
-        "Histogram",
-        "Scatter Plot (Simple)",
-        "Scatter Plot (Complex)",
-        "Heatmap (Categorical – Counts)",
-        "Heatmap (Categorical – Percentages)",
-        "Heatmap (Numerical Correlation)"
-    ]
-)
-
-# Dynamic column selection based on chart type
-with col2:
-    if chart_type in ["Pie Chart", "Histogram"]:
-        category = st.selectbox("Select Column", df_cleaned.columns, key="cat_select_clean")
-
-    elif chart_type == "Bar Chart":
-        bar_x = st.selectbox("X-axis Category", df_cleaned.columns, key="bar_x")
-        bar_hue = st.selectbox("Group By", df_cleaned.columns, key="bar_hue")
-    
-    elif chart_type == "Scatter Plot (Simple)":
-        x_col = st.selectbox("X-axis", df_cleaned.columns, key="simple_x")
-        y_col = st.selectbox("Y-axis", df_cleaned.columns, key="simple_y")
-    
-    elif chart_type == "Scatter Plot (Complex)":
-        x_col = st.selectbox("X-axis", df_cleaned.columns, key="complex_x")
-        y_col = st.selectbox("Y-axis", df_cleaned.columns, key="complex_y")
-        hue_col = st.selectbox("Color By", df_cleaned.columns, key="complex_hue")
-    
-    elif chart_type in ["Heatmap (Categorical – Counts)", "Heatmap (Categorical – Percentages)"]:
-        categorical_cols = df_cleaned.select_dtypes(include=["object", "category"]).columns.tolist()
-        categorical_cols += ["Pclass", "Survived", "Embarked", "Sex"]
-        categorical_cols = list(dict.fromkeys([c for c in categorical_cols if c in df_cleaned.columns]))
-        
-        heat_x = st.selectbox("Heatmap X-axis", categorical_cols, index=categorical_cols.index("Pclass"), key="cat_heat_x")
-        heat_y = st.selectbox("Heatmap Y-axis", categorical_cols, index=categorical_cols.index("Survived"), key="cat_heat_y")
-    
-    elif chart_type == "Heatmap (Numerical Correlation)":
-        st.write("Shows correlations between numerical features.")
-        pass
-
-# Pie chart
-if chart_type == "Pie Chart":
-    fig, ax = plt.subplots(figsize=(3, 3))
-    df_cleaned[category].value_counts().plot(
-        kind="pie",
-        autopct="%1.1f%%",
-        ax=ax,
-        startangle=90,
-        textprops={"fontsize": 8}
+
+
+@section("Cleaned table")
+def cleaned_table(df_cleaned):
+    show_table(df_cleaned, key="cleaned_table")
+
+
+cleaned_table(df_cleaned)
+
+# Post-cleaning EDA & Visualizations (reruns on its own when a chart selection changes)
+@section("Visualizations (Cleaned Data)")
+def cleaned_visualizations(df_cleaned, cleaned_version, cleaned_counts, cleaned_profile):
+    st.header("4. Visualizations & Insights (Using Cleaned Data)")
+    if df_cleaned.empty:
+        st.info("No passengers match the current filters.")
+        return
+
+
+    st.subheader("Graphs to visualize data distributions and relationships:")
+    st.caption("All visualizations below use the cleaned dataset.")
+
+    # Two dropdowns for selecting chart type and columns (cleaned data)
+    col1, col2 = st.columns(2)
+
+    chart_type = col1.selectbox(
+        "Select Chart Type",
+        [
+            "Pie Chart",
+            "Bar Chart",
+            "Histogram",
+            "Scatter Plot (Simple)",
+            "Scatter Plot (Complex)",
+            "Heatmap (Categorical – Counts)",
+            "Heatmap (Categorical – Percentages)",
+            "Heatmap (Numerical Correlation)"
+        ],
+        key="cleaned_chart_type",
     )
-    ax.set_ylabel("")
-    ax.set_title(f"{category} Distribution", fontsize=12)
-    st.pyplot(fig)
 
-    # Provide insights        
-    st.subheader("Insights / Analysis")
-    top_value = df_cleaned[category].value_counts().idxmax()
-    top_count = df_cleaned[category].value_counts().max()
-    st.write(f"- The most common category in **{category}** is **{top_value}** with **{top_count} passengers**.")
-    
-# Bar Chart
-elif chart_type == "Bar Chart":
-    fig, ax = plt.subplots(figsize=(5, 3))
-    sns.countplot(data=df_cleaned, x=bar_x, hue=bar_hue, ax=ax)
-    ax.set_title(f"{bar_x} by {bar_hue}")
-    st.pyplot(fig)
-
-    # Provide insights    
-    st.subheader("Insights / Analysis")
-    group_sizes = df_cleaned.groupby([bar_x, bar_hue]).size()
-    largest_group = group_sizes.idxmax()
-    largest_count = group_sizes.max()
-    st.write(f"- The largest group is **{largest_group}** with **{largest_count} passengers**.")
-    
-# Histogram
-elif chart_type == "Histogram":
-    fig, ax = plt.subplots(figsize=(4, 3))
-    
-    # Check if categorical or numerical
-    if df_cleaned[category].dtype == "object" or str(df_cleaned[category].dtype) == "category":
-        df_cleaned[category].value_counts().plot(kind="bar", ax=ax, color="purple")
-        ax.set_title(f"{category} Frequency")
-    else:
-        ax.hist(df_cleaned[category].dropna(), bins=20, color="skyblue", edgecolor="black")
-        ax.set_title(f"Histogram of {category}")
-        
-    ax.set_xlabel(category)
-    ax.set_ylabel("Count")
-    st.pyplot(fig)
-    
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    if df_cleaned[category].dtype == "object" or str(df_cleaned[category].dtype) == "category":
-        most_common = df_cleaned[category].value_counts().idxmax()
-        st.write(f"- The most frequent category in **{category}** is **{most_common}**.")
-    else:
-        mean_val = df_cleaned[category].mean()
-        st.write(f"- The average value of **{category}** is **{mean_val:.2f}**.")
-
-# Simple Scatter
-elif chart_type == "Scatter Plot (Simple)":
-    fig, ax = plt.subplots(figsize=(4, 3))
-        
-    df_numeric = df_cleaned.copy()
-    for col in df_numeric.columns:
-        if df_numeric[col].dtype == "object" or str(df_numeric[col].dtype) == "category":
-            df_numeric[col] = df_numeric[col].astype("category").cat.codes
-        
-    ax.scatter(df_numeric[x_col], df_numeric[y_col], alpha=0.6)
-    ax.set_xlabel(x_col)
-    ax.set_ylabel(y_col)
-    ax.set_title(f"{x_col} vs {y_col}")
-    st.pyplot(fig)
-    
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    if df_numeric[[x_col, y_col]].dropna().shape[0] > 1:
-        corr_val = df_numeric[[x_col, y_col]].corr().iloc[0, 1]
-        st.write(f"- The correlation between **{x_col}** and **{y_col}** is **{corr_val:.2f}**.")
-    else:
-        st.write("- Not enough data to compute correlation.")
-    
-# Complex Scatter
-elif chart_type == "Scatter Plot (Complex)":
-    fig, ax = plt.subplots(figsize=(5, 4))
-    sns.scatterplot(data=df_cleaned, x=x_col, y=y_col, hue=hue_col, ax=ax)
-    ax.set_title(f"{x_col} vs {y_col} colored by {hue_col}")
-    st.pyplot(fig)
-    
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    st.write(f"- This chart shows how **{y_col}** varies with **{x_col}** across different **{hue_col}** groups.")
-    
-# Categorical Heatmap (Counts)
-elif chart_type == "Heatmap (Categorical – Counts)":
-    df_clean = df_cleaned[[heat_x, heat_y]].dropna()
-    heatmap_data = df_clean.pivot_table(index=heat_y, columns=heat_x, aggfunc="size", fill_value=0)
-
-    # Warn if too many categories 
-    if heatmap_data.shape[0] > 50 or heatmap_data.shape[1] > 50:
-        st.warning("This heatmap has too many categories and may take a long time to render.")
-    
-    # Check if heatmap_data is empty
-    if heatmap_data.empty:
-        st.write("No data available for the selected combination.")
-    else:
-        fig, ax = plt.subplots(figsize=(5, 3))
-        sns.heatmap(heatmap_data, annot=True, cmap="Blues", fmt="d", ax=ax)
-        ax.set_title(f"Heatmap: {heat_y} vs {heat_x} (Counts)")
-        st.pyplot(fig)
-        
-        # Provide insights
-        st.subheader("Insights / Analysis")
-        max_val = heatmap_data.values.max()
-        st.write(f"- The highest count in this table is **{max_val}**, indicating the strongest category combination.")
-            
-# Categorical Heatmap (Percentages)
-elif chart_type == "Heatmap (Categorical Percentages)":
-    # Prepare percentage table
-    df_clean = df_cleaned[[heat_x, heat_y]].dropna()
-    count_table = df_clean.pivot_table(index=heat_y, columns=heat_x, aggfunc="size", fill_value=0)
-        
-    # Check if count_table is empty
-    if count_table.empty:
-        st.write("No data available for the selected combination.")
-    else:
-        percent_table = count_table.div(count_table.sum(axis=0), axis=1) * 100
-            
-        if percent_table.shape[0] > 50 or percent_table.shape[1] > 50:
-            st.warning("This heatmap has too many categories and may take a long time to render.")
-        
-        # Plot percentage heatmap
-        fig, ax = plt.subplots(figsize=(5, 3))
-        sns.heatmap(percent_table, annot=True, cmap="Purples", fmt=".1f", ax=ax)
-        ax.set_title(f"Percentage Heatmap: {heat_y} vs {heat_x} (Column %)")
-        st.pyplot(fig)
-        
-        # Provide insights
-        st.subheader("Insights / Analysis")
-        max_pct = percent_table.values.max()
-        st.write(f"- The highest percentage in this table is **{max_pct:.1f}%**, showing the strongest proportional relationship.")
-    
-# Numerical Correlation Heatmap
-elif chart_type == "Heatmap (Numerical Correlation)":
-    # Prepare correlation matrix
-    numeric_df = df_cleaned.select_dtypes(include=["int64", "float64"])
-    corr = numeric_df.corr()
-        
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.heatmap(corr, annot=True, cmap="coolwarm", linewidths=0.5, ax=ax)
-    ax.set_title("Numerical Correlation Heatmap")
-    st.pyplot(fig)
-    
+    # Dynamic column selection based on chart type
+    with col2:
+        if chart_type in ["Pie Chart", "Histogram"]:
+            category = st.selectbox("Select Column", df_cleaned.columns, index=category_index(df_cleaned, cleaned_profile), key="cleaned_category")
+
+        elif chart_type == "Bar Chart":
+            bar_x = st.selectbox("X-axis Category", df_cleaned.columns, key="cleaned_bar_x")
+            bar_hue = st.selectbox("Group By", df_cleaned.columns, key="cleaned_bar_hue")
+
+        elif chart_type == "Scatter Plot (Simple)":
+            x_col = st.selectbox("X-axis", df_cleaned.columns, key="cleaned_simple_x")
+            y_col = st.selectbox("Y-axis", df_cleaned.columns, key="cleaned_simple_y")
+
+        elif chart_type == "Scatter Plot (Complex)":
+            x_col = st.selectbox("X-axis", df_cleaned.columns, key="cleaned_complex_x")
+            y_col = st.selectbox("Y-axis", df_cleaned.columns, key="cleaned_complex_y")
+            hue_col = st.selectbox("Color By", df_cleaned.columns, key="cleaned_complex_hue")
+
+        elif chart_type in ["Heatmap (Categorical – Counts)", "Heatmap (Categorical – Percentages)"]:
+            categorical_cols = charts.categorical_columns(df_cleaned)
+            categorical_cols += ["Pclass", "Survived", "Embarked", "Sex"]
+            categorical_cols = list(dict.fromkeys([c for c in categorical_cols if c in df_cleaned.columns]))
+
+            heat_x = st.selectbox("Heatmap X-axis", categorical_cols, index=categorical_cols.index("Pclass"), key="cleaned_cat_heat_x")
+            heat_y = st.selectbox("Heatmap Y-axis", categorical_cols, index=categorical_cols.index("Survived"), key="cleaned_cat_heat_y")
+
+        elif chart_type == "Heatmap (Numerical Correlation)":
+            st.write("Shows correlations between numerical features.")
+            pass
+
+    with tracing.span(f"chart: {chart_type}", section="cleaned"):
+        # Pie chart
+        if chart_type == "Pie Chart":
+            counts = value_counts(cleaned_counts, category)
+            show_chart(cleaned_version, chart_type, [category], lambda ax: charts.draw_pie(ax, counts, category), (3, 3), lambda: vega_charts.pie(counts, category))
+
+            # Provide insights
+            show_insights(chart_type, [category], counts)
+
+        # Bar Chart
+        elif chart_type == "Bar Chart":
+            bar_table = top_crosstab(cleaned_counts, bar_x, bar_hue)
+            if OTHER in bar_table.index or OTHER in bar_table.columns:
+                st.caption(f"Each axis shows its {TOP_K} most frequent values; the rest are grouped as \"{OTHER}\".")
+            show_chart(cleaned_version, chart_type, [bar_x, bar_hue], lambda ax: charts.draw_bar(ax, bar_table, bar_x, bar_hue), (5, 3), lambda: vega_charts.bar(bar_table, bar_x, bar_hue))
+
+            # Provide insights
+            show_insights(chart_type, [bar_x, bar_hue], bar_table)
+
+        # Histogram
+        elif chart_type == "Histogram":
+            categorical = cleaned_profile[category]["dtype_class"] == "categorical"
+            counts = value_counts(cleaned_counts, category) if categorical else None
+            show_chart(cleaned_version, chart_type, [category], lambda ax: charts.draw_histogram(ax, df_cleaned, category, counts), (4, 3), lambda: vega_charts.histogram(df_cleaned[category], category, counts))
+
+            # Provide insights
+            show_insights(chart_type, [category], cleaned_profile[category])
+
+        # Simple Scatter
+        elif chart_type == "Scatter Plot (Simple)":
+            if use_density(df_cleaned):
+                density = scatter_density(df_cleaned, x_col, y_col)
+                show_chart(cleaned_version, chart_type, [x_col, y_col, "density"], lambda ax: charts.draw_density(ax, density, x_col, y_col), (4, 3), lambda: vega_charts.density(density, x_col, y_col))
+                corr_val = density["corr"] if density["rows"] > 1 else None
+            else:
+                matrix = feature_matrix(df_cleaned)
+                x, y = column(matrix, x_col), column(matrix, y_col)
+                show_chart(cleaned_version, chart_type, [x_col, y_col], lambda ax: charts.draw_simple_scatter(ax, x, y, x_col, y_col), (4, 3), lambda: vega_charts.scatter(x, y, x_col, y_col))
+                corr_val = correlation(matrix).at[x_col, y_col] if np.count_nonzero(np.isfinite(x) & np.isfinite(y)) > 1 else None
+
+            # Provide insights
+            show_insights(chart_type, [x_col, y_col], corr_val)
+
+        # Complex Scatter
+        elif chart_type == "Scatter Plot (Complex)":
+            if use_density(df_cleaned):
+                density = scatter_density(df_cleaned, x_col, y_col, hue_col)
+                show_chart(cleaned_version, chart_type, [x_col, y_col, hue_col, "density"], lambda ax: charts.draw_density(ax, density, x_col, y_col, hue_col), (5, 4), lambda: vega_charts.density(density, x_col, y_col, hue_col))
+                st.caption(f"{len(df_cleaned):,} rows: showing binned density (color = most common {hue_col} group per cell).")
+            else:
+                show_chart(cleaned_version, chart_type, [x_col, y_col, hue_col], lambda ax: charts.draw_complex_scatter(ax, df_cleaned, x_col, y_col, hue_col), (5, 4), lambda: vega_charts.scatter(df_cleaned[x_col], df_cleaned[y_col], x_col, y_col, df_cleaned[hue_col], hue_col))
+
+            # Provide insights
+            show_insights(chart_type, [x_col, y_col, hue_col], None)
+
+        # Categorical Heatmap (Counts)
+        elif chart_type == "Heatmap (Categorical – Counts)":
+            heatmap_data = top_crosstab(cleaned_counts, heat_y, heat_x)
+
+            # Rare categories are folded into "Other" so the table stays small
+            if OTHER in heatmap_data.index or OTHER in heatmap_data.columns:
+                st.caption(f"Each axis shows its {TOP_K} most frequent values; the rest are grouped as \"{OTHER}\".")
+
+            # Check if heatmap_data is empty
+            if heatmap_data.empty:
+                st.write("No data available for the selected combination.")
+            else:
+                show_chart(cleaned_version, chart_type, [heat_x, heat_y], lambda ax: charts.draw_count_heatmap(ax, heatmap_data, f"Heatmap: {heat_y} vs {heat_x} (Counts)"), (5, 3), lambda: vega_charts.count_heatmap(heatmap_data, f"Heatmap: {heat_y} vs {heat_x} (Counts)"))
+
+                # Provide insights
+                show_insights(chart_type, [heat_x, heat_y], heatmap_data)
+
+        # Categorical Heatmap (Percentages)
+        elif chart_type == "Heatmap (Categorical – Percentages)":
+            # Prepare percentage table
+            count_table = top_crosstab(cleaned_counts, heat_y, heat_x)
+
+            # Rare categories are folded into "Other" so the table stays small
+            if OTHER in count_table.index or OTHER in count_table.columns:
+                st.caption(f"Each axis shows its {TOP_K} most frequent values; the rest are grouped as \"{OTHER}\".")
+
+            # Check if count_table is empty
+            if count_table.empty:
+                st.write("No data available for the selected combination.")
+            else:
+                percent_table = count_table.div(count_table.sum(axis=0), axis=1) * 100
+
+                # Plot percentage heatmap
+                show_chart(cleaned_version, chart_type, [heat_x, heat_y], lambda ax: charts.draw_count_heatmap(ax, percent_table, f"Percentage Heatmap: {heat_y} vs {heat_x} (Column %)", cmap="Purples", fmt=".1f"), (5, 3), lambda: vega_charts.count_heatmap(percent_table, f"Percentage Heatmap: {heat_y} vs {heat_x} (Column %)", scheme="purples", fmt=".1f"))
+
+                # Provide insights
+                show_insights(chart_type, [heat_x, heat_y], percent_table)
+
+        # Numerical Correlation Heatmap
+        elif chart_type == "Heatmap (Numerical Correlation)":
+            # Slice the numeric columns from the cached correlation matrix
+            matrix = feature_matrix(df_cleaned)
+            corr = correlation(matrix, matrix["numeric"])
+
+            show_chart(cleaned_version, chart_type, [], lambda ax: charts.draw_correlation_heatmap(ax, corr), (6, 4), lambda: vega_charts.correlation_heatmap(corr))
+
+            # Provide insights
+            show_insights(chart_type, [], corr)
+
+
+cleaned_visualizations(cleaned_view, cleaned_view_version, cleaned_view_counts, cleaned_view_profile)
+
+# Survival Analysis Summary (reruns on its own when the grouping changes)
+@section("Survival Analysis")
+def survival_analysis(df_cleaned, cleaned_version, cleaned_profile):
+    st.header("Survival Analysis Highlights (Cleaned Data)")
+    if df_cleaned.empty:
+        st.info("No passengers match the current filters.")
+        return
+
+    st.caption(f"Bars show survival rates with {CONFIDENCE:.0%} confidence intervals computed in closed form.")
+
+    method = st.selectbox("Confidence interval", INTERVAL_METHODS, key="survival_ci") if len(INTERVAL_METHODS) > 1 else INTERVAL_METHODS[0]
+
+    col_sa1, col_sa2 = st.columns(2)
+    for col, group_col in ((col_sa1, "Sex"), (col_sa2, "Pclass")):
+        with col, tracing.span(f"chart: Survival by {group_col}", section="survival"):
+            st.subheader(f"Survival by {group_col}")
+            rates = survival_rates(df_cleaned, [group_col], method)
+            show_chart(cleaned_version, "Survival Rates", [group_col, method], lambda ax: charts.draw_survival_rates(ax, rates, [group_col]), (4, 3), lambda: vega_charts.survival_rates(rates, [group_col]))
+            st.write("\n".join(f"- {line}" for line in chart_insights("Survival Rates", [group_col], rates)))
+
+    # Any combination of low-cardinality columns, e.g. Sex × Pclass × IsAlone
+    st.subheader("Survival by Group")
+    options = [c for c in df_cleaned.columns if c != "Survived" and cleaned_profile[c]["unique"] <= MAX_LEVELS]
+    by = st.multiselect("Group by", options, default=[c for c in ("Sex", "Pclass", "IsAlone") if c in options], key="survival_by")
+    if not by:
+        st.write("Select at least one column to group by.")
+        return
+
+    with tracing.span("chart: Survival by Group", section="survival"):
+        rates = survival_rates(df_cleaned, by, method)
+        show_chart(cleaned_version, "Survival Rates", by + [method], lambda ax: charts.draw_survival_rates(ax, rates, by), (6, 3.5), lambda: vega_charts.survival_rates(rates, by))
+    st.dataframe(rates.reset_index().style.format({"Rate": "{:.1%}", "Lower": "{:.1%}", "Upper": "{:.1%}"}), hide_index=True)
+
     # Provide insights
-    st.subheader("Insights / Analysis")
-    if "Survived" in corr.columns:
-        surv_corr = corr["Survived"].sort_values(ascending=False)
-        if len(surv_corr) > 1:
-            st.write(f"- Strongest positive correlation with **Survived**: **{surv_corr.index[1]} ({surv_corr.iloc[1]:.2f})**.")
-            st.write(f"- Strongest negative correlation with **Survived**: **{surv_corr.index[-1]} ({surv_corr.iloc[-1]:.2f})**.")
+    show_insights("Survival Rates", by, rates)
+
+
+survival_analysis(cleaned_view, cleaned_view_version, cleaned_view_profile)
+
+# Baseline survival models (reruns on its own when the model or an upload changes)
+@section("Modeling")
+def modeling(df_cleaned):
+    st.header("Survival Model (Cleaned Data)")
+    st.caption("Trained on the full cleaned dataset (filters do not apply), with 20% of rows held out for accuracy.")
+    if not MODELS:
+        st.info("Install scikit-learn to train survival models.")
+        return
+
+    col1, col2 = st.columns(2)
+    name = col1.selectbox("Model", list(MODELS), key="model_name")
+    options = feature_options(df_cleaned)
+    features = col2.multiselect("Features", options, default=[c for c in FEATURES if c in options], key="model_features")
+    if not features:
+        st.write("Select at least one feature.")
+        return
+
+    # Hyperparameters of the selected model
+    if name == "Logistic Regression":
+        params = {"C": col1.number_input("Inverse regularization strength (C)", 0.001, 1000.0, MODELS[name]["C"], key="model_c")}
     else:
-        st.write("- Survived is not numeric in this view, so correlation with survival is not shown.")
-    
-# Survival Analysis Summary
-st.header("Survival Analysis Highlights (Cleaned Data)")
-
-col_sa1, col_sa2 = st.columns(2)
-
-with col_sa1:
-    st.subheader("Survival by Sex")
-    fig, ax = plt.subplots(figsize=(4, 3))
-    sns.barplot(data=df_cleaned, x="Sex", y=df_cleaned["Survived"].astype(int), ax=ax)
-    ax.set_ylabel("Survival Rate")
-    st.pyplot(fig)
-
-with col_sa2:
-    st.subheader("Survival by Pclass")
-    fig, ax = plt.subplots(figsize=(4, 3))
-    sns.barplot(data=df_cleaned, x="Pclass", y=df_cleaned["Survived"].astype(int), ax=ax)
-    ax.set_ylabel("Survival Rate")
-    st.pyplot(fig)
-    
-    # Provide insights
-    st.subheader("Insights / Analysis")
-    st.write(
-        "- Females generally show a much higher survival rate than males.\n"
-        "- 1st class passengers have the highest survival rate, while 3rd class have the lowest.\n"
-        "- These patterns reinforce the impact of gender and socioeconomic status on survival."
-    )
\ No newline at end of file
+        params = {
+            "n_estimators": col1.slider("Trees", 10, 500, MODELS[name]["n_estimators"], key="model_trees"),
+            "max_depth": col2.slider("Maximum depth", 1, 20, MODELS[name]["max_depth"], key="model_depth"),
+        }
+
+    try:
+        with tracing.span(f"model: {name}", section="modeling"), st.spinner(f"Training {name}..."):
+            model, cached = fit_model(df_cleaned, name, features, params)
+    except (ValueError, MemoryError) as exc:
+        st.error(f"Could not train {name}: {exc}")
+        return
+
+    metric1, metric2, metric3 = st.columns(3)
+    metric1.metric("Holdout accuracy", f"{model['accuracy']:.1%}")
+    metric2.metric("Training rows/sec", f"{model['train_rows'] / model['train_seconds']:,.0f}")
+    metric3.metric("Training rows", f"{model['train_rows']:,}")
+    st.caption("Reused the fitted model from cache." if cached else f"Model trained on this run in {model['train_seconds']:.2f} s.")
+    st.dataframe(feature_weights(model).to_frame())
+
+    # Batch scoring of an uploaded CSV with the fitted encoder and model
+    st.subheader("Score a CSV")
+    upload = st.file_uploader("Titanic CSV (raw or cleaned columns)", type="csv", key="model_upload")
+    if upload is None:
+        return
+    try:
+        with tracing.span("model: score", section="modeling"):
+            scores, stats = score_csv(model, upload)
+    except (ValueError, pd.errors.ParserError) as exc:
+        st.error(f"Could not score the file: {exc}")
+        return
+    st.write(f"Scored **{stats['rows']:,}** rows in {stats['chunks']:,} chunk(s) at **{stats['rows'] / max(stats['seconds'], 1e-9):,.0f} rows/sec**.")
+    st.dataframe(scores.head(100), hide_index=True)
+    st.download_button("Download scores", scores.to_csv(index=False), file_name="survival_scores.csv", mime="text/csv")
+
+
+modeling(df_cleaned)
+
+# Server cost and payload of the charts drawn so far, per backend
+with st.sidebar.expander("Chart rendering"):
+    st.caption(f"Backend: **{chart_backend.BACKEND}** (set with TITANIC_CHART_BACKEND).")
+    st.dataframe(pd.DataFrame(render_stats(), columns=["Backend", "Chart", "Renders", "Render ms", "Payload bytes"]), hide_index=True)
+    st.caption("Render ms and payload bytes are means over cache misses in this server process.")
+
+# Frames shared by all sessions of this server
+with st.sidebar.expander("Shared dataset store"):
+    st.dataframe(dataset_store.store_summary(), hide_index=True)
+    st.caption(f"One read-only copy per dataset version, held by {dataset_store.session_count():,} live session(s).")
+
+# Performance trace of this run (fragment reruns are only logged)
+if tracing.enabled():
+    with st.sidebar:
+        st.subheader("Performance trace")
+        spans = pd.DataFrame(tracing.run_spans())
+        spans["span"] = ["\u2003" * depth + name for depth, name in zip(spans["depth"], spans["span"])]
+        if spans["process_alloc_bytes"].notna().any():
+            st.dataframe(spans[["span", "wall_ms", "cpu_ms", "process_alloc_bytes"]], hide_index=True)
+            st.caption("Wall and CPU time in ms; process_alloc_bytes is the net memory allocated by the whole server process (all sessions) while the span ran.")
+        else:
+            st.dataframe(spans[["span", "wall_ms", "cpu_ms"]], hide_index=True)
+            st.caption("Wall and CPU time in ms. Start the app with TITANIC_TRACE_MEMORY=1 to also record allocations (slows the whole process).")
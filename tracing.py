@@ -0,0 +1,111 @@
+"""Lightweight per-stage tracing for the Streamlit app.
+
+``span(name)`` measures wall time and CPU time of the current thread inside
+a block. Finished spans are kept for the current
+script run (per thread, as Streamlit runs each session in its own thread)
+and written as JSON lines to the ``titanic.trace`` logger. Tracing is
+switched per thread with :func:`enable` and defaults to ``TITANIC_TRACE=1``;
+while it is off ``span`` returns a shared no-op context manager.
+
+With ``TITANIC_TRACE_MEMORY=1`` spans also record ``process_alloc_bytes``,
+the net bytes allocated by the whole process while the span ran (every
+thread and session, not only the traced block). It uses ``tracemalloc``,
+which slows every allocation in the process several times over, so it is
+started only with that flag and then stays on until the process exits.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+
+# Optional file for the JSON lines (stderr otherwise)
+TRACE_LOG = os.environ.get("TITANIC_TRACE_LOG")
+
+# Whether tracing is on for threads that never called enable()
+TRACE_DEFAULT = os.environ.get("TITANIC_TRACE", "") == "1"
+
+# Whether traced threads also start tracemalloc (process-wide and slow)
+TRACE_MEMORY = os.environ.get("TITANIC_TRACE_MEMORY", "") == "1"
+
+_local = threading.local()
+_logger = logging.getLogger("titanic.trace")
+_noop = contextlib.nullcontext()
+_handler_lock = threading.Lock()
+
+
+def enabled():
+    return getattr(_local, "enabled", TRACE_DEFAULT)
+
+
+def enable(on=True):
+    """Turn tracing on or off for the current thread."""
+    _local.enabled = bool(on)
+    if on and TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def _emit(record):
+    with _handler_lock:
+        if not _logger.handlers:
+            handler = logging.FileHandler(TRACE_LOG) if TRACE_LOG else logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger.addHandler(handler)
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+    _logger.info(json.dumps(record))
+
+
+def start_run(on=None):
+    # Called at the top of each full script run; spans of the previous run are dropped
+    if on is not None:
+        enable(on)
+    _local.run_id = uuid.uuid4().hex[:12]
+    _local.spans = []
+    _local.stack = []
+
+
+def run_spans():
+    """Spans finished in this thread since the last :func:`start_run`, in start order."""
+    return sorted(getattr(_local, "spans", []), key=lambda record: record["ts"])
+
+
+@contextlib.contextmanager
+def _span(name, fields):
+    if not hasattr(_local, "spans"):
+        start_run()
+    parent = _local.stack[-1] if _local.stack else None
+    _local.stack.append(name)
+    memory = tracemalloc.is_tracing()
+    alloc_start = tracemalloc.get_traced_memory()[0] if memory else 0
+    started = time.time()
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        record = {
+            "ts": started,
+            "run": _local.run_id,
+            "span": name,
+            "parent": parent,
+            "depth": len(_local.stack) - 1,
+            "wall_ms": round((time.perf_counter() - wall_start) * 1000, 3),
+            "cpu_ms": round((time.thread_time() - cpu_start) * 1000, 3),
+            "process_alloc_bytes": tracemalloc.get_traced_memory()[0] - alloc_start if memory else None,
+            **fields,
+        }
+        _local.stack.pop()
+        _local.spans.append(record)
+        _emit(record)
+
+
+def span(name, **fields):
+    """Context manager timing the enclosed block as ``name``; extra ``fields`` are logged with it."""
+    if not getattr(_local, "enabled", TRACE_DEFAULT):
+        return _noop
+    return _span(name, fields)
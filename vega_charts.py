@@ -0,0 +1,144 @@
+"""Vega-Lite specs for the browser-side chart backend.
+
+Each function mirrors a ``draw_*`` function of ``charts`` but returns a
+Vega-Lite spec (a plain dict) instead of drawing. The specs carry only
+pre-aggregated data: value counts, crosstabs, histogram bins, density grid
+cells, correlations and survival rates. Only scatter plots below the
+density threshold send one row per plotted point.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from charts import ANNOTATION_CELLS
+
+SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+
+def _values(frame):
+    # JSON-safe records (numpy scalars to Python, NaN to null)
+    return json.loads(frame.to_json(orient="records"))
+
+
+def _spec(frame, title, **spec):
+    return {"$schema": SCHEMA, "title": title, "data": {"values": _values(frame)}, **spec}
+
+
+def pie(counts, category):
+    frame = pd.DataFrame({"value": counts.index.astype(str), "count": counts.to_numpy()})
+    return _spec(frame, f"{category} Distribution", mark={"type": "arc", "tooltip": True}, encoding={
+        "theta": {"field": "count", "type": "quantitative"},
+        "color": {"field": "value", "type": "nominal", "title": category, "sort": None},
+    })
+
+
+def bar(table, bar_x, bar_hue):
+    long = table.stack().rename("count")
+    long.index.names = ["x", "hue"]
+    long = long[long > 0].reset_index()
+    long[["x", "hue"]] = long[["x", "hue"]].astype(str)
+    return _spec(long, f"{bar_x} by {bar_hue}", mark={"type": "bar", "tooltip": True}, encoding={
+        "x": {"field": "x", "type": "nominal", "title": bar_x},
+        "xOffset": {"field": "hue", "type": "nominal"},
+        "y": {"field": "count", "type": "quantitative", "title": "Count"},
+        "color": {"field": "hue", "type": "nominal", "title": bar_hue},
+    })
+
+
+def histogram(series, category, counts=None):
+    if counts is not None:
+        frame = pd.DataFrame({"value": counts.index.astype(str), "count": counts.to_numpy()})
+        return _spec(frame, f"{category} Frequency", mark={"type": "bar", "color": "purple", "tooltip": True}, encoding={
+            "x": {"field": "value", "type": "nominal", "title": category, "sort": None},
+            "y": {"field": "count", "type": "quantitative", "title": "Count"},
+        })
+    values = series.dropna().to_numpy(dtype=np.float64)
+    hist, edges = np.histogram(values, bins=20)
+    frame = pd.DataFrame({"start": edges[:-1], "end": edges[1:], "count": hist})
+    return _spec(frame, f"Histogram of {category}", mark={"type": "bar", "color": "skyblue", "stroke": "black", "tooltip": True}, encoding={
+        "x": {"field": "start", "type": "quantitative", "bin": {"binned": True}, "title": category},
+        "x2": {"field": "end"},
+        "y": {"field": "count", "type": "quantitative", "title": "Count"},
+    })
+
+
+def scatter(x, y, x_col, y_col, hue=None, hue_col=None):
+    # One point per row; only used below the density threshold
+    frame = pd.DataFrame({"x": x, "y": y})
+    encoding = {
+        "x": {"field": "x", "type": "quantitative", "title": x_col},
+        "y": {"field": "y", "type": "quantitative", "title": y_col},
+    }
+    title = f"{x_col} vs {y_col}"
+    if hue is not None:
+        frame["hue"] = pd.Series(hue).astype(str).to_numpy()
+        encoding["color"] = {"field": "hue", "type": "nominal", "title": hue_col}
+        title += f" colored by {hue_col}"
+    frame = frame.dropna(subset=["x", "y"])
+    return _spec(frame, title, mark={"type": "point", "opacity": 0.6}, encoding=encoding)
+
+
+def density(grid, x_col, y_col, hue_col=None):
+    # Non-empty cells of a density.py grid as rectangles
+    counts = grid["counts"]
+    total = counts.sum(axis=0)
+    ix, iy = np.nonzero(total)
+    xedges, yedges = grid["xedges"], grid["yedges"]
+    frame = pd.DataFrame({"x": xedges[ix], "x2": xedges[ix + 1], "y": yedges[iy], "y2": yedges[iy + 1], "count": total[ix, iy]})
+    encoding = {
+        "x": {"field": "x", "type": "quantitative", "title": x_col},
+        "x2": {"field": "x2"},
+        "y": {"field": "y", "type": "quantitative", "title": y_col},
+        "y2": {"field": "y2"},
+    }
+    if grid["labels"] is None:
+        encoding["color"] = {"field": "count", "type": "quantitative", "scale": {"type": "log", "scheme": "viridis"}, "title": "Passengers"}
+        title = f"{x_col} vs {y_col} (density of {grid['rows']:,} rows)"
+    else:
+        # Dominant hue group per cell, shaded by density
+        frame["group"] = np.asarray(grid["labels"])[counts.argmax(axis=0)[ix, iy]]
+        encoding["color"] = {"field": "group", "type": "nominal", "title": hue_col}
+        encoding["opacity"] = {"field": "count", "type": "quantitative", "scale": {"type": "log"}, "legend": None}
+        title = f"{x_col} vs {y_col} colored by {hue_col} (density)"
+    return _spec(frame, title, mark={"type": "rect", "tooltip": True}, encoding=encoding)
+
+
+def _matrix(table, value, fmt, title, color):
+    long = table.stack().rename(value)
+    long.index.names = ["row", "column"]
+    long = long.reset_index()
+    long[["row", "column"]] = long[["row", "column"]].astype(str)
+    axes = {
+        "x": {"field": "column", "type": "nominal", "title": table.columns.name, "sort": None},
+        "y": {"field": "row", "type": "nominal", "title": table.index.name, "sort": None},
+    }
+    layers = [{"mark": {"type": "rect", "tooltip": True}, "encoding": {**axes, "color": {"field": value, "type": "quantitative", **color}}}]
+    if table.size <= ANNOTATION_CELLS:
+        layers.append({"mark": {"type": "text", "fontSize": 9}, "encoding": {**axes, "text": {"field": value, "type": "quantitative", "format": fmt}}})
+    return _spec(long, title, layer=layers)
+
+
+def count_heatmap(table, title, scheme="blues", fmt="d"):
+    return _matrix(table, "count", fmt, title, {"scale": {"scheme": scheme}})
+
+
+def correlation_heatmap(corr):
+    return _matrix(corr, "corr", ".2f", "Numerical Correlation Heatmap", {"scale": {"scheme": "redblue", "domain": [-1, 1], "reverse": True}})
+
+
+def survival_rates(rates, by):
+    frame = rates.reset_index()
+    frame["x"] = frame[by[0]].astype(str)
+    encoding = {"x": {"field": "x", "type": "nominal", "title": by[0]}}
+    color = {}
+    if len(by) > 1:
+        frame["group"] = frame[by[1:]].astype(str).agg(", ".join, axis=1)
+        encoding["xOffset"] = {"field": "group", "type": "nominal"}
+        color = {"color": {"field": "group", "type": "nominal", "title": " × ".join(by[1:])}}
+    frame = frame[["x", "Rate", "Lower", "Upper", "Passengers"] + (["group"] if len(by) > 1 else [])]
+    return _spec(frame, f"Survival by {' × '.join(by)}", encoding=encoding, layer=[
+        {"mark": {"type": "bar", "tooltip": True}, "encoding": {"y": {"field": "Rate", "type": "quantitative", "title": "Survival Rate", "scale": {"domain": [0, 1]}}, **color}},
+        {"mark": {"type": "rule"}, "encoding": {"y": {"field": "Lower", "type": "quantitative"}, "y2": {"field": "Upper"}}},
+    ])
@@ -0,0 +1,76 @@
+"""Warm start for the Streamlit app.
+
+``warm_up`` loads the dataset, runs the cleaning pipeline and fills the
+per-version caches (count cubes, column profiles, feature matrices) and,
+optionally, imports the plotting stack, so the first session after a
+deploy or scale-out finds everything in memory.
+
+Run the app through this module to warm up in a background thread while
+the server starts; arguments are passed on to ``streamlit run``::
+
+    python warmup.py --server.port 8501
+"""
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent / "titanic_streamlit_app.py"
+
+_logger = logging.getLogger("titanic.warmup")
+
+
+def warm_up(plotting=True):
+    """Preload data and caches in this process; returns ``{stage: seconds}``."""
+    from column_profile import column_profile
+    from count_cube import count_cube
+    from feature_matrix import feature_matrix
+    from titanic_cleaning import clean_dataset
+    from titanic_loader import load_dataset
+
+    timings = {}
+
+    def stage(name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings[name] = round(time.perf_counter() - start, 4)
+        return result
+
+    df, info = stage("load dataset", load_dataset)
+    cleaned = stage("cleaning", clean_dataset, df, info["stats"])[0]
+    for label, frame in (("raw", df), ("cleaned", cleaned)):
+        stage(f"count cube ({label})", count_cube, frame)
+        stage(f"column profile ({label})", column_profile, frame)
+        stage(f"feature matrix ({label})", feature_matrix, frame)
+    if plotting:
+        stage("import plotting", _import_plotting)
+    return timings
+
+
+def _import_plotting():
+    import matplotlib.pyplot  # noqa: F401
+    import seaborn  # noqa: F401
+
+
+def _warm_up_in_background():
+    try:
+        for name, seconds in warm_up().items():
+            _logger.info("warm-up %s: %.3f s", name, seconds)
+    except Exception:
+        # The app loads on demand anyway; a failed warm-up only costs the first session time
+        _logger.exception("warm-up failed")
+
+
+def main(argv=None):
+    from streamlit.web import cli
+
+    logging.basicConfig(level=logging.INFO)
+    threading.Thread(target=_warm_up_in_background, name="warm-up", daemon=True).start()
+    sys.argv = ["streamlit", "run", str(APP_PATH), *(sys.argv[1:] if argv is None else argv)]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()